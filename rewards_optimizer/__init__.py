@@ -0,0 +1,22 @@
+import importlib
+
+# Submodules load on first attribute access so `import rewards_optimizer`
+# (and every CLI command) only pays for what it uses
+_EXPORTS = {
+    'FlightDatabase': 'fetch',
+    'AmadeusFlightSearch': 'fetch',
+    'FlightDataViewer': 'viewer',
+    'ValueCalculator': 'calculator',
+    'PriceWatcher': 'price_watch',
+    'SyntheticOfferGenerator': 'synthetic_data',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
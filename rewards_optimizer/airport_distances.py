@@ -0,0 +1,70 @@
+import os
+import csv
+import math
+import numpy as np
+
+DEFAULT_AIRPORTS_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "airports.csv")
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_MILE = 1.609344
+
+
+class AirportIndex:
+    def __init__(self, csv_path=DEFAULT_AIRPORTS_CSV):
+        with open(csv_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+
+        self.codes = np.array([row['iata'] for row in rows])
+        self.position = {row['iata']: i for i, row in enumerate(rows)}
+        self.lat = np.radians(np.array([float(row['latitude']) for row in rows]))
+        self.lon = np.radians(np.array([float(row['longitude']) for row in rows]))
+        self.cos_lat = np.cos(self.lat)
+        self.regions = np.array([row.get('region') or '' for row in rows])
+        # Plain-float copy for single-pair lookups, which are faster without numpy scalars
+        self.coords = {code: (float(lat), float(lon), float(cos_lat))
+                       for code, lat, lon, cos_lat in zip(self.position, self.lat, self.lon, self.cos_lat)}
+
+    def indices(self, codes):
+        # -1 marks airports missing from the dataset
+        return np.array([self.position.get(code.upper(), -1) if code else -1 for code in codes], dtype=np.int64)
+
+    def distances_km(self, origins, destinations):
+        i = self.indices(origins)
+        j = self.indices(destinations)
+        known = (i >= 0) & (j >= 0)
+        i = np.where(known, i, 0)
+        j = np.where(known, j, 0)
+
+        dlat = self.lat[j] - self.lat[i]
+        dlon = self.lon[j] - self.lon[i]
+        a = np.sin(dlat / 2) ** 2 + self.cos_lat[i] * self.cos_lat[j] * np.sin(dlon / 2) ** 2
+        km = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        return np.where(known, km, np.nan)
+
+    def distances_miles(self, origins, destinations):
+        return self.distances_km(origins, destinations) / KM_PER_MILE
+
+    def distance_km(self, origin, destination):
+        start = self.coords.get(origin.upper()) if origin else None
+        end = self.coords.get(destination.upper()) if destination else None
+        if start is None or end is None:
+            return None
+
+        a = (math.sin((end[0] - start[0]) / 2) ** 2
+             + start[2] * end[2] * math.sin((end[1] - start[1]) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+    def distance_miles(self, origin, destination):
+        km = self.distance_km(origin, destination)
+        return None if km is None else km / KM_PER_MILE
+
+
+_airport_index = None
+
+
+def get_airport_index():
+    # Loaded once per process; every lookup after that is pure array math
+    global _airport_index
+    if _airport_index is None:
+        _airport_index = AirportIndex()
+    return _airport_index
@@ -0,0 +1,97 @@
+import os
+import json
+import numpy as np
+from .airport_distances import get_airport_index
+
+DEFAULT_CHARTS_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "award_charts.json")
+
+CABINS = ["economy", "premium_economy", "business", "first"]
+DEFAULT_PROGRAM = "DEFAULT"
+# Routes to airports outside the dataset are priced as a typical domestic hop
+UNKNOWN_DISTANCE_MILES = 1000
+ROUNDING_MILES = 500
+
+
+class AwardChartEngine:
+    def __init__(self, json_path=DEFAULT_CHARTS_JSON):
+        with open(json_path) as f:
+            charts = json.load(f)
+
+        self.airports = get_airport_index()
+        self.region_position = {region: i for i, region in enumerate(sorted(set(self.airports.regions)))}
+        self.airport_region = np.array([self.region_position[r] for r in self.airports.regions], dtype=np.int64)
+
+        default_multipliers = charts.get('cabin_multipliers', {})
+        self.programs = {}
+        for program, chart in charts['programs'].items():
+            multipliers = dict(default_multipliers, **chart.get('cabin_multipliers', {}))
+            compiled = {
+                'type': chart['type'],
+                'cabin_multipliers': np.array([multipliers.get(cabin, 1.0) for cabin in CABINS])
+            }
+            if chart['type'] == 'distance':
+                compiled['edges'] = np.array([edge if edge is not None else np.inf for edge, _ in chart['bands']])
+                compiled['miles'] = np.array([miles for _, miles in chart['bands']], dtype=float)
+            else:
+                n = len(self.region_position)
+                table = np.full((n, n), np.nan)
+                for pair, miles in chart['zones'].items():
+                    a, b = pair.split('-')
+                    if a in self.region_position and b in self.region_position:
+                        table[self.region_position[a], self.region_position[b]] = miles
+                        table[self.region_position[b], self.region_position[a]] = miles
+                compiled['zones'] = table
+            self.programs[program] = compiled
+
+    def _distance_price(self, chart, distances):
+        return chart['miles'][np.searchsorted(chart['edges'], distances, side='left')]
+
+    def price_batch(self, programs, origins, destinations, cabins="economy"):
+        count = len(programs)
+        if isinstance(cabins, str):
+            cabins = [cabins] * count
+
+        programs = np.array([p if p in self.programs else DEFAULT_PROGRAM for p in programs])
+        cabin_idx = np.array([CABINS.index(c) if c in CABINS else 0 for c in cabins], dtype=np.int64)
+
+        distances = self.airports.distances_miles(origins, destinations)
+        distances = np.where(np.isnan(distances), UNKNOWN_DISTANCE_MILES, distances)
+
+        origin_idx = self.airports.indices(origins)
+        destination_idx = self.airports.indices(destinations)
+        known = (origin_idx >= 0) & (destination_idx >= 0)
+        origin_region = self.airport_region[np.maximum(origin_idx, 0)]
+        destination_region = self.airport_region[np.maximum(destination_idx, 0)]
+
+        default_price = self._distance_price(self.programs[DEFAULT_PROGRAM], distances)
+        base = default_price.copy()
+        multipliers = np.ones(count)
+
+        # One vectorized pass per program present in the batch
+        for program in np.unique(programs):
+            mask = programs == program
+            chart = self.programs[program]
+            if chart['type'] == 'distance':
+                base[mask] = self._distance_price(chart, distances[mask])
+            else:
+                zone_price = chart['zones'][origin_region[mask], destination_region[mask]]
+                usable = known[mask] & ~np.isnan(zone_price)
+                base[mask] = np.where(usable, zone_price, default_price[mask])
+            multipliers[mask] = chart['cabin_multipliers'][cabin_idx[mask]]
+
+        # Rounded first so float noise (12500 * 2.2) does not push a price up a step
+        miles = np.ceil(np.round(base * multipliers / ROUNDING_MILES, 6)) * ROUNDING_MILES
+        return miles.astype(np.int64)
+
+    def price(self, program, origin, destination, cabin="economy"):
+        return int(self.price_batch([program], [origin], [destination], cabin)[0])
+
+
+_award_chart_engine = None
+
+
+def get_award_chart_engine():
+    global _award_chart_engine
+    if _award_chart_engine is None:
+        _award_chart_engine = AwardChartEngine()
+    return _award_chart_engine
@@ -0,0 +1,166 @@
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import platform
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+from .fetch import FlightDatabase
+from .calculator import ValueCalculator
+from .viewer import FlightDataViewer
+from .synthetic_data import SyntheticOfferGenerator
+from .structured_log import configure_logging
+
+DEFAULT_SIZES = [10000, 100000]
+BATCH_SIZE = 250
+QUERY_REPEATS = 5
+BASELINE_DIR = "benchmark_baselines"
+# Slowdown beyond this fraction of the baseline counts as a regression
+REGRESSION_THRESHOLD = 0.10
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def summarize(latencies, rows):
+    total = sum(latencies)
+    return {
+        'calls': len(latencies),
+        'rows': rows,
+        'total_seconds': round(total, 4),
+        'rows_per_sec': round(rows / total, 1) if total else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3)
+    }
+
+
+def peak_memory_mb(func):
+    tracemalloc.start()
+    try:
+        with redirect_stdout(io.StringIO()):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 2)
+
+
+def time_calls(func, repeats):
+    latencies = []
+    for _ in range(repeats):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def bench_size(size, workdir, repeats=QUERY_REPEATS):
+    db_path = os.path.join(workdir, f"bench_{size}.db")
+    with redirect_stdout(io.StringIO()):
+        db = FlightDatabase(db_path)
+    offers = SyntheticOfferGenerator(seed=42).offers(size)
+    batches = [offers[i:i + BATCH_SIZE] for i in range(0, len(offers), BATCH_SIZE)]
+
+    results = {}
+
+    ingest_latencies = time_calls_batches(db, batches)
+    results['ingest'] = summarize(ingest_latencies, size)
+    probe = SyntheticOfferGenerator(seed=7).offers(BATCH_SIZE)
+    results['ingest']['peak_memory_mb'] = peak_memory_mb(lambda: db.store_flight_offers(probe, {'search_type': 'bench'}))
+
+    calc = ValueCalculator(db_path)
+    viewer = FlightDataViewer(db_path)
+    export_path = os.path.join(workdir, f"bench_{size}.csv")
+    hot_paths = {
+        'valuation': lambda: calc.get_best_redemptions(limit=10, min_value=0.0),
+        'query': viewer.show_route_analysis,
+        'export': lambda: viewer.export_to_csv(export_path)
+    }
+    for name, func in hot_paths.items():
+        results[name] = summarize(time_calls(func, repeats), size * repeats)
+        results[name]['peak_memory_mb'] = peak_memory_mb(func)
+
+    return results
+
+
+def time_calls_batches(db, batches):
+    latencies = []
+    for batch in batches:
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            db.store_flight_offers(batch, {'search_type': 'bench'})
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD):
+    regressions = []
+    for size, paths in current['results'].items():
+        for name, stats in paths.items():
+            before = baseline.get('results', {}).get(size, {}).get(name)
+            if not before:
+                continue
+            for metric in ('p50_ms', 'p95_ms'):
+                old, new = before[metric], stats[metric]
+                change = (new - old) / old if old else 0.0
+                flag = "REGRESSION" if change > threshold else ""
+                print(f"{size:>8} {name:<10} {metric:<7} {old:>12.3f} -> {new:>12.3f} ({change:+.1%}) {flag}")
+                if flag:
+                    regressions.append((size, name, metric, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ingest, valuation, query and export hot paths")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated offer counts, e.g. 10000,100000,1000000")
+    parser.add_argument("--repeats", type=int, default=QUERY_REPEATS)
+    parser.add_argument("--save", metavar="NAME", help=f"Save results as {BASELINE_DIR}/NAME.json")
+    parser.add_argument("--compare", metavar="FILE", help="Baseline JSON to compare against")
+    args = parser.parse_args(argv)
+    # Ingest logging would otherwise be part of what gets timed
+    configure_logging(level="WARNING")
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'batch_size': BATCH_SIZE,
+        'results': {}
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            print(f"Benchmarking {size:,} offers...")
+            report['results'][str(size)] = bench_size(size, workdir, args.repeats)
+            for name, stats in report['results'][str(size)].items():
+                print(f"  {name:<10} {stats['rows_per_sec'] or 0:>14,.0f} rows/s | "
+                      f"p50 {stats['p50_ms']:.2f} ms | p95 {stats['p95_ms']:.2f} ms | peak {stats['peak_memory_mb']:.1f} MB")
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save}.json")
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nComparison against {args.compare}:")
+        regressions = compare(report, baseline)
+        if regressions:
+            print(f"{len(regressions)} regressions over {REGRESSION_THRESHOLD:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
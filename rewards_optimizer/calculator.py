@@ -0,0 +1,332 @@
+import sys
+import sqlite3
+from datetime import datetime
+from .metrics import get_metrics, timed
+
+
+def get_distance_in_km(origin_name, destination_name):
+    from .airport_distances import get_airport_index
+
+    distance_km = get_airport_index().distance_km(origin_name, destination_name)
+    if distance_km is None:
+        print(f"Unknown airport in {origin_name} → {destination_name}, no distance available")
+    return distance_km
+
+class ValueCalculator:
+    def __init__(self, db_path="flight_offers.db"):
+        self.db_path = db_path
+        self.EXCELLENT_VALUE = 2.0
+        self.GOOD_VALUE = 1.5
+        self.FAIR_VALUE = 1.0
+        self.POOR_VALUE = 0.8
+
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def add_sample_redemption_data(self, origin=None, destination=None):
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        sample_data = [
+            (350, 25000, 50.0), (450, 30000, 75.0), (200, 20000, 40.0),
+            (550, 35000, 100.0), (180, 15000, 30.0), (600, 40000, 125.0)
+        ]
+
+        for price, miles, fees in sample_data:
+            cursor.execute("""
+                INSERT INTO flights1 (origin, destination, departure_date, total_price, currency, miles_used, fees,
+                                      reporting_price, reporting_fees, value_per_mile)
+                VALUES (?, ?, ?, ?, 'USD', ?, ?, ?, ?, ?)
+            """, (origin or "XXX", destination or "YYY", datetime.now().strftime("%Y-%m-%d"), price, miles, fees, price,
+                  fees, (price - fees) * 100 / miles))
+
+        conn.commit()
+        conn.close()
+        print(f"Added {len(sample_data)} sample flights for {origin} → {destination}")
+
+    def add_chart_redemption_data(self, origin, destination):
+        from .award_charts import get_award_chart_engine
+
+        distance_km = get_distance_in_km(origin, destination)
+        if not distance_km:
+            print("Failed to get distance, skipping data addition.")
+            return
+
+        # Simulate price from distance and miles from the default award chart
+        cash_price = round(distance_km * 0.15 + 50, 2)
+        miles_used = get_award_chart_engine().price("DEFAULT", origin, destination)
+        fees = round(cash_price * 0.1, 2)
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO flights1 (origin, destination, departure_date, total_price, currency, miles_used, fees,
+                                  reporting_price, reporting_fees, value_per_mile)
+            VALUES (?, ?, ?, ?, 'USD', ?, ?, ?, ?, ?)
+        """, (origin, destination, datetime.now().strftime("%Y-%m-%d"), cash_price, miles_used, fees, cash_price,
+              fees, (cash_price - fees) * 100 / miles_used))
+
+        conn.commit()
+        conn.close()
+        print(f"Added chart-priced flight: {origin} → {destination} | {distance_km:.0f} km | ${cash_price}")
+
+    @timed("calculator_query_seconds", query="redemption_values")
+    def show_redemption_values(self, origin=None, destination=None):
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        query = "SELECT id, origin, destination, reporting_price, miles_used, reporting_fees, departure_date FROM flights1"
+        params = []
+        if origin and destination:
+            query += " WHERE origin = ? AND destination = ?"
+            params = [origin, destination]
+
+        cursor.execute(query, params)
+        results = cursor.fetchall()
+        conn.close()
+
+        print("\nRedemption Values:")
+        for row in results:
+            print(f"{row[0]}: {row[1]} → {row[2]}, {row[6]}, {_usd(row[3])}, {row[4]} miles, {_usd(row[5])} fees")
+
+    @timed("calculator_query_seconds", query="best_redemptions")
+    def get_best_redemptions(self, limit=10, min_value=1.0):
+        conn = self.connect()
+        cursor = conn.cursor()
+        # Filter, rank and cut in SQL; dicts are only built for the rows returned.
+        # VPM comes from the reporting-currency value stored with each award row,
+        # scaled to this menu's units
+        cursor.execute('''
+            SELECT origin, destination, reporting_price, miles_used, reporting_fees, departure_date, vpm
+            FROM (
+                SELECT origin, destination, reporting_price, miles_used, reporting_fees, departure_date,
+                       ROUND(value_per_mile / 100.0, 4) AS vpm
+                FROM flights1
+                WHERE miles_used != 0 AND value_per_mile IS NOT NULL
+            )
+            WHERE vpm >= ?
+            ORDER BY vpm DESC
+            LIMIT ?
+        ''', (min_value, limit))
+        flights = cursor.fetchall()
+        conn.close()
+
+        return [{'route': f"{origin} → {destination}", 'date': date,
+                 'value': vpm, 'category': self.get_value_category(vpm),
+                 'price': price, 'miles': miles, 'fees': fees}
+                for origin, destination, price, miles, fees, date, vpm in flights]
+
+    def get_value_category(self, value_per_mile):
+        if value_per_mile >= self.EXCELLENT_VALUE:
+            return "EXCELLENT"
+        elif value_per_mile >= self.GOOD_VALUE:
+            return "GOOD"
+        elif value_per_mile >= self.FAIR_VALUE:
+            return "FAIR"
+        elif value_per_mile >= self.POOR_VALUE:
+            return "POOR"
+        else:
+            return "AVOID"
+
+    @timed("calculator_query_seconds", query="cheapest")
+    def get_cheapest_flights(self, origin=None, destination=None, limit=10):
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        query = "SELECT id, origin, destination, reporting_price, miles_used, reporting_fees, departure_date FROM flights1"
+        params = []
+        if origin and destination:
+            query += " WHERE origin = ? AND destination = ?"
+            params.extend([origin, destination])
+        # Fares with no FX rate cannot be ranked, so they sort last
+        query += " ORDER BY reporting_price IS NULL, reporting_price LIMIT ?"
+        params.append(limit)
+
+        cursor.execute(query, params)
+        results = cursor.fetchall()
+        conn.close()
+        return results
+
+class SessionIndex:
+    # Columnar copy of the session's route slice, kept sorted by price and by VPM
+    # so every menu option is answered without going back to SQLite
+    COLUMNS = ('id', 'origin', 'destination', 'reporting_price', 'miles_used', 'reporting_fees', 'departure_date')
+
+    def __init__(self, calculator, origin=None, destination=None):
+        import numpy as np
+
+        self.calculator = calculator
+        self.origin = origin
+        self.destination = destination
+        self.last_id = 0
+        self.last_observation_id = 0
+        self.columns = {name: np.empty(0, dtype=object) for name in self.COLUMNS}
+        self.vpm = np.empty(0)
+        self.by_price = np.empty(0, dtype=np.intp)
+        self.by_vpm = np.empty(0, dtype=np.intp)
+        self.refresh()
+
+    def __len__(self):
+        return len(self.vpm)
+
+    @timed("calculator_query_seconds", query="session_refresh")
+    def refresh(self):
+        import numpy as np
+
+        # Rows added since the last load, plus itineraries a later crawl re-quoted
+        # in place (each re-quote adds an observation), are fetched and merged in
+        conn = self.calculator.connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM sqlite_master WHERE name = 'offer_observations')")
+        if cursor.fetchone()[0]:
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM offer_observations")
+            last_observation_id = cursor.fetchone()[0]
+            changed = " OR id IN (SELECT flight_id FROM offer_observations WHERE id > ?)"
+            params = [self.last_id, self.last_observation_id]
+        else:
+            last_observation_id, changed, params = 0, "", [self.last_id]
+        query = f"SELECT {', '.join(self.COLUMNS)}, value_per_mile FROM flights1 WHERE (id > ?{changed})"
+        if self.origin and self.destination:
+            query += " AND origin = ? AND destination = ?"
+            params.extend([self.origin, self.destination])
+        cursor.execute(query + " ORDER BY id", params)
+        rows = cursor.fetchall()
+        conn.close()
+        self.last_observation_id = last_observation_id
+        if not rows:
+            return 0
+
+        new = dict(zip(self.COLUMNS + ('value_per_mile',), zip(*rows)))
+        self._drop(np.array(new['id'], dtype=np.int64))
+        price = np.array(new['reporting_price'], dtype=float)
+        miles = np.array(new['miles_used'], dtype=float)
+        # Same scaling and rounding as the SQL ranking; NaN marks cash-only rows
+        vpm = np.where(miles != 0, np.round(np.array(new['value_per_mile'], dtype=float) / 100, 4), np.nan)
+
+        start = len(self)
+        for name in self.COLUMNS:
+            values = price if name == 'reporting_price' else np.array(new[name], dtype=object)
+            self.columns[name] = np.concatenate([self.columns[name], values])
+        self.columns['reporting_price'] = self.columns['reporting_price'].astype(float)
+        self.vpm = np.concatenate([self.vpm, vpm])
+        self.last_id = max(self.last_id, int(max(new['id'])))
+
+        # Merge the sorted new rows into the existing orders instead of re-sorting
+        new_ids = np.arange(start, len(self))
+        self.by_price = self._merge(self.by_price, new_ids, self.columns['reporting_price'])
+        award_ids = new_ids[~np.isnan(vpm)]
+        self.by_vpm = self._merge(self.by_vpm, award_ids, -self.vpm)
+        return len(rows)
+
+    def _drop(self, ids):
+        import numpy as np
+
+        # Stale copies of re-quoted rows leave both orders before the fresh ones merge in
+        stale = np.isin(self.columns['id'].astype(np.int64), ids)
+        if not stale.any():
+            return
+        keep = ~stale
+        remap = np.cumsum(keep) - 1
+        for name in self.COLUMNS:
+            self.columns[name] = self.columns[name][keep]
+        self.vpm = self.vpm[keep]
+        self.by_price = remap[self.by_price[keep[self.by_price]]]
+        self.by_vpm = remap[self.by_vpm[keep[self.by_vpm]]]
+
+    @staticmethod
+    def _merge(order, new_ids, keys):
+        import numpy as np
+
+        new_ids = new_ids[np.argsort(keys[new_ids], kind='stable')]
+        positions = np.searchsorted(keys[order], keys[new_ids], side='right')
+        return np.insert(order, positions, new_ids)
+
+    def _row(self, i):
+        return tuple(self.columns[name][i] for name in self.COLUMNS)
+
+    def all_rows(self):
+        return [self._row(i) for i in range(len(self))]
+
+    def cheapest(self, limit=10):
+        return [self._row(i) for i in self.by_price[:limit]]
+
+    def best_redemptions(self, limit=10, min_value=1.0):
+        import numpy as np
+
+        # by_vpm is descending, so the qualifying rows are a prefix of it
+        count = int(np.searchsorted(-self.vpm[self.by_vpm], -min_value, side='right'))
+        return [{'route': f"{self.columns['origin'][i]} → {self.columns['destination'][i]}",
+                 'date': self.columns['departure_date'][i],
+                 'value': float(self.vpm[i]), 'category': self.calculator.get_value_category(self.vpm[i]),
+                 'price': float(self.columns['reporting_price'][i]), 'miles': self.columns['miles_used'][i],
+                 'fees': self.columns['reporting_fees'][i]}
+                for i in self.by_vpm[:min(count, limit)]]
+
+def _usd(value):
+    # NULL/NaN is a fare in a currency with no FX rate
+    return "no rate" if value is None or value != value else f"${value:.2f}"
+
+# ---------------- Main CLI -------------------
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    calc = ValueCalculator()
+    # --chart prices new rows from the award charts instead of the fixed samples
+    if "--chart" in argv:
+        add_data, add_label = calc.add_chart_redemption_data, "Add chart-priced flight data"
+    else:
+        add_data, add_label = calc.add_sample_redemption_data, "Add/Reset sample data"
+    print("\n✈️  Flight Redemption Value Calculator")
+    print("=" * 50)
+
+    origin = input("Enter origin airport IATA code (or press Enter to skip): ").strip().upper() or None
+    destination = input("Enter destination airport IATA code (or press Enter to skip): ").strip().upper() or None
+
+    # Automatically add sample data if no flights exist for the route
+    index = SessionIndex(calc, origin, destination)
+    if not len(index):
+        print(f"No flights found for {origin} → {destination}. Adding data...")
+        add_data(origin, destination)
+        index.refresh()
+
+    while True:
+        print("\nSelect an option:")
+        print("1. Show all flights' cash prices, miles, and VPM")
+        print("2. Show top redemptions (best VPM)")
+        print("3. Show cheapest flights")
+        print(f"4. {add_label}")
+        print("0. Exit")
+        choice = input("Your choice: ")
+
+        if choice == "1":
+            print("\nRedemption Values:")
+            for row in index.all_rows():
+                print(f"{row[0]}: {row[1]} → {row[2]}, {row[6]}, {_usd(row[3])}, {row[4]} miles, {_usd(row[5])} fees")
+
+        elif choice == "2":
+            min_value = input("Minimum value-per-mile threshold (default 1.5): ").strip()
+            min_value = float(min_value) if min_value else 1.5
+            best = index.best_redemptions(limit=10, min_value=min_value)
+            for r in best:
+                print(f"{r['route']} on {r['date']}: {r['value']} cpm ({r['category']}) - {_usd(r['price'])}, {r['miles']} miles, {_usd(r['fees'])} fees")
+
+        elif choice == "3":
+            cheapest = index.cheapest()
+            print("\nCheapest Flights:")
+            for r in cheapest:
+                print(f"{r[1]} → {r[2]}, {r[6]}, {_usd(r[3])}, {r[4]} miles, {_usd(r[5])} fees")
+
+        elif choice == "4":
+            add_data(origin, destination)
+            index.refresh()
+
+        elif choice == "0":
+            print("Exiting.")
+            get_metrics().report()
+            break
+
+        else:
+            print("Invalid choice, try again.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import importlib
+
+COMMANDS = {
+    "fetch": ("fetch", "Crawl Amadeus flight offers into the database"),
+    "view": ("viewer", "Browse stored data: searches, cheapest, route, alerts, calendar, history, export, migrate"),
+    "value": ("calculator", "Interactive redemption value calculator [--chart]"),
+    "serve": (None, "Run the Streamlit website"),
+    "watch": ("price_watch", "Manage and run price watches: add, remove, list, run [--once]"),
+    "generate": ("synthetic_data", "Generate synthetic offers into a database or Parquet"),
+    "fx": ("fx_rates", "Show, load or convert FX rates"),
+    "bench": ("benchmark_suite", "Benchmark ingest, valuation, query and export"),
+}
+
+
+def print_usage():
+    print("Usage: rewards-optimizer COMMAND [ARGS...]\n\nCommands:")
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name:<10} {description}")
+
+
+def serve(args):
+    from streamlit.web import cli as streamlit_cli
+
+    website = os.path.join(os.path.dirname(os.path.abspath(__file__)), "website.py")
+    sys.argv = ["streamlit", "run", website, *args]
+    sys.exit(streamlit_cli.main())
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print_usage()
+        return
+
+    command, args = argv[0].lower(), argv[1:]
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}\n")
+        print_usage()
+        sys.exit(2)
+
+    if command == "serve":
+        serve(args)
+        return
+
+    # Only the chosen command's module (and its dependencies) is imported
+    module = importlib.import_module(f".{COMMANDS[command][0]}", __package__)
+    module.main(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+MIN_CONNECT_MINUTES = 45
+MAX_CONNECT_MINUTES = 12 * 60
+REPRICE_CHUNK = 500
+
+# Cash share of a segment: its offer's price split evenly over the offer's segments
+def _segment_price(segment, flight):
+    return f"(SELECT {flight}.reporting_price * 1.0 / COUNT(*) FROM flight_segments1 s WHERE s.flight_id = {segment}.flight_id)"
+
+
+def _shift(column, minutes):
+    return f"strftime('%Y-%m-%dT%H:%M:%S', {column}, '{int(minutes):+d} minutes')"
+
+
+class HubConnectionIndex:
+    def __init__(self, db_path="flight_offers.db", min_connect_minutes=MIN_CONNECT_MINUTES,
+                 max_connect_minutes=MAX_CONNECT_MINUTES):
+        self.db_path = db_path
+        self.min_connect = min_connect_minutes
+        self.max_connect = max_connect_minutes
+        self.init_tables()
+
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def init_tables(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS connection_index (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                origin TEXT,
+                hub TEXT,
+                destination TEXT,
+                departure_date DATE,
+                first_carrier TEXT,
+                first_number TEXT,
+                first_departure TIMESTAMP,
+                first_arrival TIMESTAMP,
+                first_price REAL,
+                second_carrier TEXT,
+                second_number TEXT,
+                second_departure TIMESTAMP,
+                second_arrival TIMESTAMP,
+                second_price REAL,
+                connect_minutes INTEGER,
+                UNIQUE (first_carrier, first_number, first_departure, second_carrier, second_number, second_departure)
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS connection_index_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                last_segment_id INTEGER
+            )
+        ''')
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_connection_index_od ON connection_index (origin, destination, departure_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_connection_index_first ON connection_index (origin, destination, first_departure)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_segments1_dep_airport ON flight_segments1 (departure_iata, departure_time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_segments1_arr_airport ON flight_segments1 (arrival_iata, arrival_time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_segments1_flight ON flight_segments1 (flight_id)")
+        # Lookups by flight identity, used when a re-crawled itinerary is re-priced
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_segments1_key ON flight_segments1 (carrier_code, flight_number, departure_time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_connection_index_second ON connection_index (second_carrier, second_number, second_departure)")
+
+        # Databases filled before the index existed, or bulk-loaded without it,
+        # get it built once from their stored segments
+        cursor.execute("SELECT COUNT(*) FROM connection_index_state")
+        never_built = cursor.fetchone()[0] == 0
+        cursor.execute("PRAGMA table_info(flights1)")
+        priced = 'reporting_price' in [col[1] for col in cursor.fetchall()]
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM flight_segments1)")
+        if never_built and priced and cursor.fetchone()[0]:
+            self.refresh(cursor)
+
+        conn.commit()
+        conn.close()
+
+    def refresh(self, cursor=None):
+        conn = None
+        if cursor is None:
+            conn = self.connect()
+            cursor = conn.cursor()
+
+        cursor.execute("SELECT last_segment_id FROM connection_index_state WHERE id = 1")
+        row = cursor.fetchone()
+        last_id = row[0] if row else 0
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM flight_segments1")
+        max_id = cursor.fetchone()[0]
+        if max_id <= last_id:
+            if conn is not None:
+                conn.close()
+            return 0
+
+        # New segments as first leg, then as second leg. Each pass drives from the
+        # new segments (an id range) into the other leg through its own
+        # (airport, time) index, so cost scales with new segments, not history
+        first_leg = f'''
+            FROM flight_segments1 a
+            CROSS JOIN flight_segments1 b
+              ON b.departure_iata = a.arrival_iata
+             AND b.departure_time >= {_shift('a.arrival_time', self.min_connect)}
+             AND b.departure_time <= {_shift('a.arrival_time', self.max_connect)}
+            JOIN flights1 f ON f.id = a.flight_id
+            JOIN flights1 g ON g.id = b.flight_id
+            WHERE a.id > ? AND a.id <= ?
+        '''
+        second_leg = f'''
+            FROM flight_segments1 b
+            CROSS JOIN flight_segments1 a
+              ON a.arrival_iata = b.departure_iata
+             AND a.arrival_time >= {_shift('b.departure_time', -self.max_connect)}
+             AND a.arrival_time <= {_shift('b.departure_time', -self.min_connect)}
+            JOIN flights1 f ON f.id = a.flight_id
+            JOIN flights1 g ON g.id = b.flight_id
+            WHERE b.id > ? AND b.id <= ?
+        '''
+        changes = 0
+        for pairs in (first_leg, second_leg):
+            cursor.execute(f'''
+                INSERT INTO connection_index (
+                    origin, hub, destination, departure_date,
+                    first_carrier, first_number, first_departure, first_arrival, first_price,
+                    second_carrier, second_number, second_departure, second_arrival, second_price,
+                    connect_minutes
+                )
+                SELECT a.departure_iata, a.arrival_iata, b.arrival_iata, substr(a.departure_time, 1, 10),
+                       a.carrier_code, a.flight_number, a.departure_time, a.arrival_time, {_segment_price('a', 'f')},
+                       b.carrier_code, b.flight_number, b.departure_time, b.arrival_time, {_segment_price('b', 'g')},
+                       CAST(ROUND((julianday(b.departure_time) - julianday(a.arrival_time)) * 1440) AS INTEGER)
+                {pairs}
+                  AND b.arrival_iata != a.departure_iata
+                  AND f.reporting_price > 0 AND g.reporting_price > 0
+                ON CONFLICT (first_carrier, first_number, first_departure, second_carrier, second_number, second_departure)
+                DO UPDATE SET first_price = MIN(first_price, excluded.first_price),
+                              second_price = MIN(second_price, excluded.second_price)
+            ''', (last_id, max_id))
+            changes += cursor.rowcount
+
+        cursor.execute('''
+            INSERT INTO connection_index_state (id, last_segment_id) VALUES (1, ?)
+            ON CONFLICT (id) DO UPDATE SET last_segment_id = excluded.last_segment_id
+        ''', (max_id,))
+
+        if conn is not None:
+            conn.commit()
+            conn.close()
+        return changes
+
+    def reprice(self, flight_ids, cursor=None):
+        # Re-crawled itineraries are updated in place and never come back through
+        # refresh, so every index leg they fly gets its cheapest current share
+        # recomputed; a leg with no cash quote left keeps its last known price
+        flight_ids = list(flight_ids)
+        if not flight_ids:
+            return 0
+
+        conn = None
+        if cursor is None:
+            conn = self.connect()
+            cursor = conn.cursor()
+
+        changes = 0
+        for start in range(0, len(flight_ids), REPRICE_CHUNK):
+            chunk = flight_ids[start:start + REPRICE_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            for leg in ("first", "second"):
+                cursor.execute(f'''
+                    UPDATE connection_index
+                    SET {leg}_price = COALESCE((
+                        SELECT MIN({_segment_price('x', 'f')})
+                        FROM flight_segments1 x
+                        JOIN flights1 f ON f.id = x.flight_id
+                        WHERE x.carrier_code = connection_index.{leg}_carrier
+                          AND x.flight_number = connection_index.{leg}_number
+                          AND x.departure_time = connection_index.{leg}_departure
+                          AND f.reporting_price > 0
+                    ), {leg}_price)
+                    WHERE ({leg}_carrier, {leg}_number, {leg}_departure) IN (
+                        SELECT carrier_code, flight_number, departure_time
+                        FROM flight_segments1 WHERE flight_id IN ({placeholders})
+                    )
+                ''', chunk)
+                changes += cursor.rowcount
+
+        if conn is not None:
+            conn.commit()
+            conn.close()
+        return changes
+
+    def _airline_filter(self, columns, airlines):
+        if not airlines:
+            return "", []
+        placeholders = ",".join("?" * len(airlines))
+        clause = "".join(f" AND {column} IN ({placeholders})" for column in columns)
+        return clause, list(airlines) * len(columns)
+
+    def one_stop(self, origin, destination, departure_date, max_layover_hours=6, preferred_airlines=None):
+        airline_clause, airline_params = self._airline_filter(["first_carrier", "second_carrier"], preferred_airlines)
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT first_carrier, first_number, origin, hub, first_departure, first_arrival, first_price,
+                   second_carrier, second_number, hub, destination, second_departure, second_arrival, second_price
+            FROM connection_index
+            WHERE origin = ? AND destination = ? AND departure_date = ?
+              AND connect_minutes >= ? AND connect_minutes <= ?{airline_clause}
+        ''', [origin, destination, departure_date, self.min_connect, max_layover_hours * 60] + airline_params)
+        rows = cursor.fetchall()
+        conn.close()
+        return [(row[0:7], row[7:14]) for row in rows]
+
+    def two_stop(self, origin, destination, departure_date, max_layover_hours=6, preferred_airlines=None):
+        airline_clause, airline_params = self._airline_filter(["a.carrier_code", "c.first_carrier", "c.second_carrier"], preferred_airlines)
+        next_day = (datetime.strptime(departure_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT a.carrier_code, a.flight_number, a.departure_iata, a.arrival_iata, a.departure_time, a.arrival_time,
+                   MIN({_segment_price('a', 'f')}),
+                   c.first_carrier, c.first_number, c.origin, c.hub, c.first_departure, c.first_arrival, c.first_price,
+                   c.second_carrier, c.second_number, c.hub, c.destination, c.second_departure, c.second_arrival, c.second_price
+            FROM flight_segments1 a
+            JOIN flights1 f ON f.id = a.flight_id
+            JOIN connection_index c
+              ON c.origin = a.arrival_iata
+             AND c.destination = ?
+             AND c.first_departure >= {_shift('a.arrival_time', self.min_connect)}
+             AND c.first_departure <= {_shift('a.arrival_time', max_layover_hours * 60)}
+            WHERE a.departure_iata = ? AND a.departure_time >= ? AND a.departure_time < ?
+              AND f.reporting_price > 0
+              AND c.hub != a.departure_iata
+              AND c.connect_minutes <= ?{airline_clause}
+            GROUP BY a.carrier_code, a.flight_number, a.departure_time, c.id
+        ''', [destination, origin, departure_date, next_day, max_layover_hours * 60] + airline_params)
+        rows = cursor.fetchall()
+        conn.close()
+        return [(row[0:7], row[7:14], row[14:21]) for row in rows]
@@ -0,0 +1,245 @@
+import sqlite3
+import numpy as np
+from datetime import datetime, timedelta
+from .airport_distances import get_airport_index
+from .award_charts import get_award_chart_engine
+from .connection_index import HubConnectionIndex
+from .records import Segment, Recommendation
+
+MIN_CONNECT_MINUTES = 45
+# Domestic award tickets carry the September 11th security fee per segment
+AWARD_FEE_PER_SEGMENT = 5.60
+# Journeys kept per connecting airport while scanning; cheapest survive
+MAX_LABELS_PER_AIRPORT = 50
+# Award miles are charged on the origin-destination distance, so a journey
+# flying much further than that is priced on fares for a different trip
+MAX_DETOUR_RATIO = 1.5
+
+EXCELLENT_VALUE = 2.0
+GOOD_VALUE = 1.5
+FAIR_VALUE = 1.0
+POOR_VALUE = 0.8
+
+
+def get_value_category(value_per_mile):
+    if value_per_mile >= EXCELLENT_VALUE:
+        return "EXCELLENT"
+    elif value_per_mile >= GOOD_VALUE:
+        return "GOOD"
+    elif value_per_mile >= FAIR_VALUE:
+        return "FAIR"
+    elif value_per_mile >= POOR_VALUE:
+        return "POOR"
+    else:
+        return "AVOID"
+
+
+def format_minutes(minutes):
+    return f"{int(minutes // 60)}h {int(minutes % 60)}m"
+
+
+def make_connection(carrier, number, dep_iata, arr_iata, dep_time, arr_time, price):
+    dep = datetime.fromisoformat(dep_time)
+    arr = datetime.fromisoformat(arr_time)
+    return Segment(carrier, f"{carrier}{number}", dep_iata, arr_iata, dep, arr,
+                   dep.timestamp() / 60, arr.timestamp() / 60, price)
+
+
+class ConnectionSearch:
+    def __init__(self, db_path="flight_offers.db"):
+        self.db_path = db_path
+        self.init_indexes()
+        self.index = HubConnectionIndex(db_path)
+
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def init_indexes(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_segments1_departure ON flight_segments1 (departure_time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_segments1_flight ON flight_segments1 (flight_id)")
+        conn.commit()
+        conn.close()
+
+    def load_connections(self, departure_date, window_days=2):
+        start = datetime.strptime(departure_date, "%Y-%m-%d")
+        end = start + timedelta(days=window_days)
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        # Segment price is the offer price split evenly over its segments;
+        # identical flights seen in several offers keep their cheapest share
+        cursor.execute('''
+            SELECT fs.carrier_code, fs.flight_number, fs.departure_iata, fs.arrival_iata,
+                   fs.departure_time, fs.arrival_time,
+                   MIN(f.reporting_price / (SELECT COUNT(*) FROM flight_segments1 s WHERE s.flight_id = f.id))
+            FROM flight_segments1 fs
+            JOIN flights1 f ON f.id = fs.flight_id
+            WHERE fs.departure_time >= ? AND fs.departure_time < ?
+              AND f.reporting_price > 0
+            GROUP BY fs.carrier_code, fs.flight_number, fs.departure_time
+            ORDER BY fs.departure_time
+        ''', (start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")))
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [make_connection(*row) for row in rows]
+
+    def load_direct(self, origin, destination, departure_date):
+        next_day = (datetime.strptime(departure_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT fs.carrier_code, fs.flight_number, fs.departure_iata, fs.arrival_iata,
+                   fs.departure_time, fs.arrival_time,
+                   MIN(f.reporting_price / (SELECT COUNT(*) FROM flight_segments1 s WHERE s.flight_id = f.id))
+            FROM flight_segments1 fs
+            JOIN flights1 f ON f.id = fs.flight_id
+            WHERE fs.departure_iata = ? AND fs.arrival_iata = ?
+              AND fs.departure_time >= ? AND fs.departure_time < ?
+              AND f.reporting_price > 0
+            GROUP BY fs.carrier_code, fs.flight_number, fs.departure_time
+        ''', (origin, destination, departure_date, next_day))
+        rows = cursor.fetchall()
+        conn.close()
+        return [make_connection(*row) for row in rows]
+
+    def lookup(self, origin, destination, departure_date, max_stops=2, max_layover_hours=6, preferred_airlines=None):
+        airlines = set(preferred_airlines or [])
+        journeys = [[c] for c in self.load_direct(origin, destination, departure_date)
+                    if not airlines or c.carrier in airlines]
+        if max_stops >= 1:
+            for legs in self.index.one_stop(origin, destination, departure_date, max_layover_hours, preferred_airlines):
+                journeys.append([make_connection(*leg) for leg in legs])
+        if max_stops >= 2:
+            for legs in self.index.two_stop(origin, destination, departure_date, max_layover_hours, preferred_airlines):
+                journeys.append([make_connection(*leg) for leg in legs])
+        return journeys
+
+    def scan(self, connections, origin, destination, departure_date, max_stops=2,
+             max_layover_hours=6, preferred_airlines=None, min_connect_minutes=MIN_CONNECT_MINUTES):
+        # Connection Scan over departure-sorted segments; each label is a partial
+        # journey (segments, arrival minute, price) waiting at an airport
+        max_layover = max_layover_hours * 60
+        airlines = set(preferred_airlines or [])
+        waiting = {}
+        journeys = []
+
+        for c in connections:
+            if airlines and c.carrier not in airlines:
+                continue
+
+            extended = []
+            if c.origin == origin and c.departure.strftime("%Y-%m-%d") == departure_date:
+                extended.append(([c], c.price))
+
+            labels = waiting.get(c.origin)
+            if labels:
+                labels[:] = [l for l in labels if c.dep_minute - l[1] <= max_layover]
+                for segments, arrival, price in labels:
+                    gap = c.dep_minute - arrival
+                    if gap < min_connect_minutes:
+                        continue
+                    if any(s.origin == c.destination for s in segments):
+                        continue
+                    extended.append((segments + [c], price + c.price))
+
+            for segments, price in extended:
+                if c.destination == destination:
+                    journeys.append(segments)
+                elif len(segments) <= max_stops and c.destination != origin:
+                    bucket = waiting.setdefault(c.destination, [])
+                    bucket.append((segments, c.arr_minute, price))
+                    if len(bucket) > MAX_LABELS_PER_AIRPORT:
+                        bucket.sort(key=lambda l: l[2])
+                        del bucket[MAX_LABELS_PER_AIRPORT:]
+
+        return journeys
+
+    def search(self, origin, destination, departure_date, max_miles=30000, max_fees=20, min_value=1.0, cabin="economy",
+               include_layovers=True, max_layover_hours=6, preferred_airlines=None, max_stops=2, use_index=True):
+        max_stops = max_stops if include_layovers else 0
+        if use_index:
+            # Ingest keeps connection_index current; the read path only looks it up
+            journeys = self.lookup(origin, destination, departure_date, max_stops, max_layover_hours, preferred_airlines)
+        else:
+            journeys = self.scan(self.load_connections(departure_date), origin, destination, departure_date,
+                                 max_stops=max_stops,
+                                 max_layover_hours=max_layover_hours,
+                                 preferred_airlines=preferred_airlines)
+        journeys = drop_detours(journeys, origin, destination)
+        if not journeys:
+            return []
+
+        award_miles = get_award_chart_engine().price_batch(
+            [j[0].carrier for j in journeys],
+            [origin] * len(journeys),
+            [destination] * len(journeys),
+            cabin
+        )
+
+        recommendations = []
+        for segments, miles in zip(journeys, award_miles):
+            rec = build_recommendation(origin, destination, segments, int(miles))
+            if rec.miles_used > max_miles or rec.fees > max_fees or rec.value_per_mile < min_value:
+                continue
+            recommendations.append(rec)
+
+        recommendations.sort(key=lambda x: x.value_per_mile, reverse=True)
+        return recommendations
+
+
+def drop_detours(journeys, origin, destination, max_ratio=MAX_DETOUR_RATIO):
+    airports = get_airport_index()
+    direct = airports.distance_miles(origin, destination)
+    if not direct or not journeys:
+        return journeys
+
+    segments = [s for journey in journeys for s in journey]
+    starts = np.cumsum([0] + [len(journey) for journey in journeys[:-1]])
+    flown = np.add.reduceat(airports.distances_miles([s.origin for s in segments],
+                                                     [s.destination for s in segments]), starts)
+    # Journeys through airports missing from the dataset have no distance and are kept
+    return [journey for journey, miles in zip(journeys, flown.tolist()) if not miles > direct * max_ratio]
+
+
+def build_recommendation(origin, destination, segments, miles_used):
+    stops = len(segments) - 1
+    cash_price = round(sum(s.price for s in segments), 2)
+    fees = round(AWARD_FEE_PER_SEGMENT * len(segments), 2)
+    value_per_mile = round((cash_price - fees) * 100 / miles_used, 3) if miles_used else 0.0
+    duration = segments[-1].arr_minute - segments[0].dep_minute
+    layovers = [b.dep_minute - a.arr_minute for a, b in zip(segments, segments[1:])]
+    savings = round(cash_price - fees, 2)
+
+    complexity = 3 + 2 * stops + (1 if any(l > 180 for l in layovers) else 0)
+    if stops == 0:
+        reason = f"Direct flight at {value_per_mile:.2f} cpm"
+    else:
+        reason = f"{stops}-stop connection via {', '.join(s.destination for s in segments[:-1])} at {value_per_mile:.2f} cpm"
+
+    return Recommendation(
+        origin=origin,
+        destination=destination,
+        type='direct' if stops == 0 else 'layover',
+        cash_price=cash_price,
+        miles_used=miles_used,
+        fees=fees,
+        value_per_mile=value_per_mile,
+        category=get_value_category(value_per_mile),
+        airline=segments[0].carrier,
+        flight_number=' / '.join(s.flight_number for s in segments),
+        departure_time=segments[0].departure.strftime('%H:%M'),
+        arrival_time=segments[-1].arrival.strftime('%H:%M'),
+        duration=format_minutes(duration),
+        layover=', '.join(s.destination for s in segments[:-1]) or None,
+        layover_duration=', '.join(format_minutes(l) for l in layovers) or None,
+        route_display=' → '.join([origin] + [s.destination for s in segments]),
+        savings=savings,
+        savings_percentage=round(savings * 100 / cash_price, 1) if cash_price else 0.0,
+        cash_equivalent=round(miles_used / 100, 2),
+        complexity_score=complexity,
+        recommendation_reason=reason
+    )
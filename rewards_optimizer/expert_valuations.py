@@ -0,0 +1,124 @@
+import logging
+import os
+import csv
+import sqlite3
+import numpy as np
+from .structured_log import get_logger, log_event
+
+logger = get_logger("expert_valuations")
+
+DEFAULT_VALUATIONS_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "expert_valuations.csv")
+
+# Loaded tables keyed by db path, so repeated comparisons never go back to disk
+_valuation_cache = {}
+
+
+class ExpertValuations:
+    def __init__(self, db_path="flight_offers.db", csv_path=DEFAULT_VALUATIONS_CSV):
+        self.db_path = db_path
+        self.csv_path = csv_path
+        self.init_table()
+
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def init_table(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS expert_valuations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                program TEXT,
+                source TEXT,
+                cpm REAL,
+                effective_date DATE,
+                UNIQUE (program, source, effective_date)
+            )
+        ''')
+
+        cursor.execute("SELECT COUNT(*) FROM expert_valuations")
+        is_empty = cursor.fetchone()[0] == 0
+
+        conn.commit()
+        conn.close()
+
+        if is_empty and self.csv_path and os.path.exists(self.csv_path):
+            self.load_from_csv(self.csv_path)
+
+    def load_from_csv(self, csv_path):
+        with open(csv_path, newline='') as f:
+            rows = [
+                (row['program'].strip().upper(), row['source'].strip(), float(row['cpm']), row['effective_date'].strip())
+                for row in csv.DictReader(f)
+            ]
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT OR REPLACE INTO expert_valuations (program, source, cpm, effective_date)
+            VALUES (?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+        conn.close()
+
+        invalidate_cache(self.db_path)
+        log_event(logger, logging.INFO, "expert_valuations_loaded", count=len(rows), csv_path=csv_path)
+        return len(rows)
+
+    def load(self):
+        cached = _valuation_cache.get(self.db_path)
+        if cached is not None:
+            return cached
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        # Latest valuation per (program, source); older effective dates are kept for history only
+        cursor.execute('''
+            SELECT v.program, v.source, v.cpm, v.effective_date
+            FROM expert_valuations v
+            JOIN (
+                SELECT program, source, MAX(effective_date) AS effective_date
+                FROM expert_valuations
+                GROUP BY program, source
+            ) latest
+              ON v.program = latest.program
+             AND v.source = latest.source
+             AND v.effective_date = latest.effective_date
+            ORDER BY v.program, v.source
+        ''')
+        rows = cursor.fetchall()
+        conn.close()
+
+        by_program = {}
+        for program, source, cpm, effective_date in rows:
+            by_program.setdefault(program, {})[source] = cpm
+
+        all_values = [cpm for _, _, cpm, _ in rows]
+        table = {
+            'by_program': by_program,
+            'averages': {program: sum(values.values()) / len(values) for program, values in by_program.items()},
+            'overall_average': sum(all_values) / len(all_values) if all_values else 0.0,
+        }
+        _valuation_cache[self.db_path] = table
+        return table
+
+    def compare_batch(self, programs, values_per_mile, tolerance=0.05):
+        table = self.load()
+        averages = table['averages']
+        overall = table['overall_average']
+
+        expert = np.array([averages.get(p, overall) for p in programs], dtype=float)
+        vpm = np.asarray(values_per_mile, dtype=float)
+        band = expert * tolerance
+
+        status = np.where(vpm > expert + band, "ABOVE_AVERAGE",
+                          np.where(vpm < expert - band, "BELOW_AVERAGE", "AT_AVERAGE"))
+        return status, expert
+
+
+def invalidate_cache(db_path=None):
+    if db_path is None:
+        _valuation_cache.clear()
+    else:
+        _valuation_cache.pop(db_path, None)
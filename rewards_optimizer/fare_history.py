@@ -0,0 +1,288 @@
+import logging
+import sqlite3
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .structured_log import get_logger, log_event
+
+logger = get_logger("fare_history")
+
+SERIES_COLUMNS = ('departure_date', 'observed_at', 'days_before', 'min_price', 'median_price', 'best_vpm', 'offer_count')
+
+
+def group_quantile(groups, values, num_groups, q):
+    # Quantile of values within each group id in one sort; NaN for empty groups
+    keep = ~np.isnan(values)
+    groups, values = groups[keep], values[keep]
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+
+    counts = np.bincount(groups, minlength=num_groups)
+    starts = np.cumsum(counts) - counts
+    result = np.full(num_groups, np.nan)
+    filled = counts > 0
+    position = starts[filled] + q * (counts[filled] - 1)
+    lo = np.floor(position).astype(np.intp)
+    hi = np.ceil(position).astype(np.intp)
+    result[filled] = values[lo] + (values[hi] - values[lo]) * (position - lo)
+    return result
+
+
+def rolling(values, groups, window, stat=np.nanmean):
+    # Trailing window over each row and the window-1 rows before it, restarting
+    # at every group boundary; built as one (rows x window) gather, no Python loop
+    values = np.asarray(values, dtype=float)
+    groups = np.asarray(groups)
+    idx = np.arange(len(values))[:, None] - np.arange(window)[None, :]
+    valid = idx >= 0
+    idx = np.maximum(idx, 0)
+    valid &= groups[idx] == groups[:, None]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return stat(np.where(valid, values[idx], np.nan), axis=1)
+
+
+def group_rows(*columns):
+    # Group id of each row over the distinct combinations of its columns, and the
+    # first row of every group; columns are coded to integers, so no per-row key is built
+    code = np.zeros(len(columns[0]), dtype=np.int64)
+    for column in columns:
+        values, inverse = np.unique(np.asarray(column), return_inverse=True)
+        code = code * len(values) + inverse.ravel()
+    _, first, groups = np.unique(code, return_index=True, return_inverse=True)
+    return first, groups.ravel()
+
+
+def _snapshot_rows(keys, days_before, cash, vpm, groups):
+    # One fare_history row per group from its (origin, destination, date,
+    # observed_at) key columns; cash is each offer's fare (NaN or 0 for none),
+    # vpm NaN for cash-only offers
+    count = len(days_before)
+    best_vpm = np.full(count, -np.inf)
+    np.maximum.at(best_vpm, groups, np.nan_to_num(vpm, nan=-np.inf))
+    cash = np.where(cash > 0, cash, np.nan)
+    min_price = group_quantile(groups, cash, count, 0.0)
+    median_price = group_quantile(groups, cash, count, 0.5)
+    counts = np.bincount(groups, minlength=count)
+    return list(zip(*keys, days_before.tolist(), _nullable_column(min_price), _nullable_column(median_price),
+                    _nullable_column(best_vpm), counts.tolist()))
+
+
+def _days_before(departure_dates, observed_at):
+    departure = np.array(departure_dates, dtype='datetime64[D]')
+    observed = np.array([value[:10] for value in observed_at], dtype='datetime64[D]')
+    return (departure - observed).astype(int)
+
+
+class FareHistory:
+    def __init__(self, db_path="flight_offers.db"):
+        self.db_path = db_path
+        self.pending = {}
+        self.init_table()
+
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def init_table(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+        # One row per crawl snapshot of a route/date; the primary key prefix
+        # serves both single-date series and whole-route booking curves
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS fare_history (
+                origin TEXT,
+                destination TEXT,
+                departure_date DATE,
+                observed_at TIMESTAMP,
+                days_before INTEGER,
+                min_price REAL,
+                median_price REAL,
+                best_vpm REAL,
+                offer_count INTEGER,
+                PRIMARY KEY (origin, destination, departure_date, observed_at)
+            )
+        ''')
+        cursor.execute("SELECT COUNT(*) FROM fare_history")
+        is_empty = cursor.fetchone()[0] == 0
+        cursor.execute("PRAGMA table_info(offer_observations)")
+        has_vpm = 'value_per_mile' in [col[1] for col in cursor.fetchall()]
+        conn.commit()
+        conn.close()
+
+        # Databases crawled before the history existed already hold every snapshot
+        if is_empty and has_vpm:
+            self.rebuild()
+
+    def observe(self, origin, destination, departure_date, cash_price=None, vpm=None):
+        cell = self.pending.setdefault((origin, destination, departure_date), [[], None, 0])
+        if cash_price is not None and cash_price > 0:
+            cell[0].append(cash_price)
+        if vpm is not None:
+            cell[1] = vpm if cell[1] is None else max(cell[1], vpm)
+        cell[2] += 1
+
+    def save(self, cursor=None, observed_at=None):
+        cells = self.pending
+        self.pending = {}
+        if not cells:
+            return 0
+
+        # Same clock as flights1.created_at, so rebuilt and live snapshots line up
+        observed_at = observed_at or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        keys = list(cells)
+        groups = np.repeat(np.arange(len(keys)), [len(cells[key][0]) for key in keys])
+        prices = np.array([price for key in keys for price in cells[key][0]], dtype=float)
+        min_price = group_quantile(groups, prices, len(keys), 0.0)
+        median_price = group_quantile(groups, prices, len(keys), 0.5)
+        days_before = _days_before([key[2] for key in keys], [observed_at] * len(keys))
+
+        rows = [
+            (*key, observed_at, int(days), _nullable(low), _nullable(median), cells[key][1], cells[key][2])
+            for key, days, low, median in zip(keys, days_before.tolist(), min_price.tolist(), median_price.tolist())
+        ]
+        self._write(rows, cursor)
+        return len(rows)
+
+    def observe_batch(self, origins, destinations, dates, cash_prices, vpms, cursor=None, observed_at=None):
+        # Bulk loads aggregate a whole batch per route/date in numpy and write it
+        # as one snapshot, instead of going through observe row by row
+        observed_at = observed_at or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        first, groups = group_rows(origins, destinations, dates)
+        dates = np.asarray(dates)[first]
+        days_before = (dates.astype('datetime64[D]') - np.datetime64(observed_at[:10], 'D')).astype(int)
+        keys = [np.asarray(origins)[first].tolist(), np.asarray(destinations)[first].tolist(), dates.tolist(),
+                [observed_at] * len(first)]
+        rows = _snapshot_rows(keys, days_before, np.asarray(cash_prices, dtype=float),
+                              np.asarray(vpms, dtype=float), groups)
+        self._write(rows, cursor)
+        return len(rows)
+
+    def _write(self, rows, cursor=None):
+        conn = None
+        if cursor is None:
+            conn = self.connect()
+            cursor = conn.cursor()
+
+        # A second batch for the same snapshot keeps the larger sample's median
+        cursor.executemany('''
+            INSERT INTO fare_history (origin, destination, departure_date, observed_at, days_before,
+                                      min_price, median_price, best_vpm, offer_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (origin, destination, departure_date, observed_at) DO UPDATE SET
+                min_price = CASE WHEN min_price IS NULL THEN excluded.min_price
+                                 WHEN excluded.min_price IS NULL THEN min_price
+                                 ELSE MIN(min_price, excluded.min_price) END,
+                median_price = CASE WHEN excluded.offer_count > offer_count THEN excluded.median_price
+                                    ELSE median_price END,
+                best_vpm = CASE WHEN best_vpm IS NULL THEN excluded.best_vpm
+                                WHEN excluded.best_vpm IS NULL THEN best_vpm
+                                ELSE MAX(best_vpm, excluded.best_vpm) END,
+                offer_count = offer_count + excluded.offer_count
+        ''', rows)
+
+        if conn is not None:
+            conn.commit()
+            conn.close()
+
+    def rebuild(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+        # Each crawl's quote lives in offer_observations; the itinerary row holds the route
+        cursor.execute('''
+            SELECT f.origin, f.destination, f.departure_date, o.observed_at, o.reporting_price, o.miles_used, o.value_per_mile
+            FROM offer_observations o
+            JOIN flights1 f ON f.id = o.flight_id
+            WHERE f.origin IS NOT NULL AND f.destination IS NOT NULL AND o.observed_at IS NOT NULL
+        ''')
+        flights = cursor.fetchall()
+        conn.close()
+        if not flights:
+            return 0
+
+        origin, destination, dates, observed, price, miles, vpm = zip(*flights)
+        snapshot = np.array([f"{o}|{d}|{date}|{at}" for o, d, date, at in zip(origin, destination, dates, observed)])
+        _, first, groups = np.unique(snapshot, return_index=True, return_inverse=True)
+
+        # VPM is stored at ingest; award rows also observe the fare they replaced,
+        # which that VPM was computed from as 90% of it per mile
+        vpm = np.array(vpm, dtype=float)
+        price = np.array(price, dtype=float)
+        miles = np.array(miles, dtype=float)
+        cash = np.where(price > 0, price, np.round(vpm * miles / 90.0, 2))
+        keys = [[column[i] for i in first.tolist()] for column in (origin, destination, dates, observed)]
+        rows = _snapshot_rows(keys, _days_before(keys[2], keys[3]), cash, vpm, groups.ravel())
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM fare_history")
+        self._write(rows, cursor)
+        conn.commit()
+        conn.close()
+        log_event(logger, logging.INFO, "fare_history_rebuilt", snapshots=len(rows))
+        return len(rows)
+
+    def series(self, origin, destination, departure_date=None):
+        conn = self.connect()
+        cursor = conn.cursor()
+        query = f"SELECT {', '.join(SERIES_COLUMNS)} FROM fare_history WHERE origin = ? AND destination = ?"
+        params = [origin, destination]
+        if departure_date:
+            query += " AND departure_date = ?"
+            params.append(departure_date)
+        cursor.execute(query + " ORDER BY departure_date, observed_at", params)
+        rows = cursor.fetchall()
+        conn.close()
+
+        columns = list(zip(*rows)) if rows else [()] * len(SERIES_COLUMNS)
+        result = {}
+        for name, values in zip(SERIES_COLUMNS, columns):
+            if name in ('departure_date', 'observed_at'):
+                result[name] = np.array(values, dtype=str)
+            elif name in ('days_before', 'offer_count'):
+                result[name] = np.array(values, dtype=int)
+            else:
+                result[name] = np.array(values, dtype=float)
+        return result
+
+    def rolling_series(self, origin, destination, departure_date=None, window=7):
+        # Rolling stats run per departure date, across its successive snapshots
+        result = self.series(origin, destination, departure_date)
+        result['rolling_min'] = rolling(result['min_price'], result['departure_date'], window, np.nanmin)
+        result['rolling_median'] = rolling(result['median_price'], result['departure_date'], window, np.nanmedian)
+        result['rolling_vpm'] = rolling(result['best_vpm'], result['departure_date'], window, np.nanmax)
+        return result
+
+    def booking_curve(self, origin, destination, max_days=None):
+        # Lowest fare by days before departure, pooled over every departure date
+        series = self.series(origin, destination)
+        days = series['days_before']
+        # Snapshots taken after departure are not part of the curve
+        keep = days >= 0
+        if max_days is not None:
+            keep &= days <= max_days
+        days = days[keep]
+
+        days_before, groups = np.unique(days, return_inverse=True)
+        prices = series['min_price'][keep]
+        count = len(days_before)
+        curve = {
+            'days_before': days_before,
+            'p25': group_quantile(groups, prices, count, 0.25),
+            'median': group_quantile(groups, prices, count, 0.5),
+            'p75': group_quantile(groups, prices, count, 0.75),
+            'min': group_quantile(groups, prices, count, 0.0),
+            'observations': np.bincount(groups, minlength=count)
+        }
+        # Far-out first, the order a booking curve is read in
+        return {name: values[::-1] for name, values in curve.items()}
+
+
+def _nullable(value):
+    return None if value != value else value
+
+
+def _nullable_column(values):
+    # NaN and the +-inf fill of empty groups become NULL
+    return np.where(np.isfinite(values), values, None).tolist()
@@ -0,0 +1,413 @@
+from dotenv import load_dotenv
+import os
+import requests
+import json
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from .airport_distances import get_airport_index
+from .award_charts import get_award_chart_engine
+from .vpm_sketch import VPMSketchStore
+from .sweet_spot_detector import SweetSpotDetector, default_alerts_path
+from .connection_index import HubConnectionIndex
+from .price_calendar import PriceCalendar
+from .fare_history import FareHistory
+from .itineraries import ensure_itineraries
+from .metrics import get_metrics, timed
+from .structured_log import get_logger, log_event
+from .records import Offer
+from .fx_rates import FXRates, ensure_reporting_prices
+
+load_dotenv()
+
+logger = get_logger("fetch")
+# Error bodies are logged at DEBUG and cut to this many characters
+MAX_LOGGED_BODY = 2000
+
+# Great-circle flight distance from the bundled airport dataset
+def estimate_miles(origin, destination):
+    miles = get_airport_index().distance_miles(origin, destination)
+    return round(miles) if miles is not None else 1000
+
+def record_response(endpoint, response):
+    # Transport failures never produce a status code
+    status = response.status_code if response is not None else "error"
+    get_metrics().inc("amadeus_http_responses_total", endpoint=endpoint, status=status)
+
+class FlightDatabase:
+    def __init__(self, db_path="flight_offers.db", alerts_path=None):
+        self.db_path = db_path
+        self.init_database()
+        self.sketches = VPMSketchStore(db_path)
+        self.detector = SweetSpotDetector(db_path, jsonl_path=alerts_path or default_alerts_path(db_path))
+        self.connections = HubConnectionIndex(db_path)
+        self.calendar = PriceCalendar(db_path)
+        self.fx = FXRates(db_path)
+        self.history = FareHistory(db_path)
+
+    def init_database(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS flights1 (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                search_id TEXT,
+                offer_id TEXT,
+                origin TEXT,
+                destination TEXT,
+                departure_date DATE,
+                total_price REAL,
+                currency TEXT,
+                miles_used INTEGER,
+                fees REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                reporting_price REAL,
+                reporting_fees REAL,
+                value_per_mile REAL,
+                fingerprint TEXT,
+                times_seen INTEGER DEFAULT 1,
+                last_seen_at TIMESTAMP
+            )
+        ''')
+        ensure_reporting_prices(cursor, self.db_path)
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS flight_segments1 (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                flight_id INTEGER,
+                carrier_code TEXT,
+                flight_number TEXT,
+                departure_iata TEXT,
+                arrival_iata TEXT,
+                departure_time TIMESTAMP,
+                arrival_time TIMESTAMP,
+                segment_order INTEGER,
+                FOREIGN KEY (flight_id) REFERENCES flights1 (id)
+            )
+        ''')
+        ensure_itineraries(cursor)
+
+        conn.commit()
+        conn.close()
+        log_event(logger, logging.INFO, "database_initialized", db_path=self.db_path)
+
+    @timed("store_offers_seconds")
+    def store_flight_offers(self, offers, search_params):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        search_id = f"{search_params['search_type']}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        stored_count = 0
+        new_itineraries = 0
+        seen_again = []
+        vpm_observations = []
+
+        parsed = [Offer.from_api(o) for o in offers]
+        priced = [o for o in parsed if o is not None]
+
+        # Price every offer's award cost in one batch, keyed by the first marketing carrier
+        award_miles = get_award_chart_engine().price_batch(
+            [o.carrier for o in priced],
+            [o.origin for o in priced],
+            [o.destination for o in priced]
+        )
+        award_iter = iter(award_miles.tolist())
+        # Normalize quotes to the reporting currency in one pass; NaN marks unknown currencies
+        reporting_prices = self.fx.convert_batch([o.price for o in priced], [o.currency for o in priced]).tolist()
+        reporting_iter = iter(reporting_prices)
+        fingerprints = [o.fingerprint for o in priced]
+        fingerprint_iter = iter(fingerprints)
+
+        # Fare families of one itinerary in the same response (cabins, fare
+        # bases) are one sighting at the cheapest quote, so each crawl counts once
+        cheapest = {}
+        for position, (fingerprint, reporting) in enumerate(zip(fingerprints, reporting_prices)):
+            best = cheapest.get(fingerprint)
+            if best is None or reporting < reporting_prices[best]:
+                cheapest[fingerprint] = position
+
+        position = -1
+        for i, offer in enumerate(parsed):
+            if offer is None:
+                continue
+            miles = next(award_iter)
+            reporting = next(reporting_iter)
+            fingerprint = next(fingerprint_iter)
+            position += 1
+            if cheapest[fingerprint] != position:
+                continue
+            reporting = None if reporting != reporting else round(reporting, 2)
+
+            origin = offer.origin
+            destination = offer.destination
+            total_price = offer.price
+            departure_date = offer.departure_date
+            vpm = None
+
+            # Simulate redemptions for every 3rd flight
+            if i % 3 == 0:
+                miles_used = miles
+                fees = round(total_price * 0.1, 2)  # 10% of original cash price
+                # fees stays in the quote currency beside total_price; readers use reporting_fees
+                reporting_fees = round(reporting * 0.1, 2) if reporting is not None else None
+                if reporting is not None:
+                    vpm = reporting * 0.9 * 100 / miles_used
+                    vpm_observations.append((origin, destination, vpm))
+                total_price = 0.0
+                reporting_price = 0.0
+            else:
+                reporting_price = reporting
+                miles_used = 0
+                fees = 0.0
+                reporting_fees = 0.0
+
+            self.detector.observe(search_id, offer.offer_id, origin, destination, departure_date, reporting, vpm)
+            self.calendar.observe(origin, destination, departure_date, reporting, vpm)
+            self.history.observe(origin, destination, departure_date, reporting, vpm)
+            log_event(logger, logging.DEBUG, "offer_stored", sample=True, search_id=search_id,
+                      offer_id=offer.offer_id, origin=origin, destination=destination,
+                      departure_date=departure_date, miles_used=miles_used)
+
+            # Itineraries seen in an earlier crawl are updated in place with the latest quote
+            cursor.execute('''
+                INSERT INTO flights1 (search_id, offer_id, origin, destination, departure_date, total_price, currency,
+                                      miles_used, fees, reporting_price, reporting_fees, value_per_mile, fingerprint,
+                                      last_seen_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (fingerprint) DO UPDATE SET
+                    search_id = excluded.search_id,
+                    offer_id = excluded.offer_id,
+                    total_price = excluded.total_price,
+                    currency = excluded.currency,
+                    miles_used = excluded.miles_used,
+                    fees = excluded.fees,
+                    reporting_price = excluded.reporting_price,
+                    reporting_fees = excluded.reporting_fees,
+                    value_per_mile = excluded.value_per_mile,
+                    last_seen_at = excluded.last_seen_at,
+                    times_seen = times_seen + 1
+                RETURNING id, times_seen
+            ''', (
+                search_id,
+                offer.offer_id,
+                origin,
+                destination,
+                departure_date,
+                total_price,
+                offer.currency,
+                miles_used,
+                fees,
+                reporting_price,
+                reporting_fees,
+                vpm,
+                fingerprint
+            ))
+            flight_id, times_seen = cursor.fetchone()
+
+            cursor.execute('''
+                INSERT INTO offer_observations (flight_id, search_id, offer_id, total_price, currency,
+                                                reporting_price, miles_used, fees, reporting_fees, value_per_mile)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (flight_id, search_id, offer.offer_id, total_price, offer.currency, reporting_price, miles_used, fees,
+                  reporting_fees, vpm))
+
+            stored_count += 1
+            if times_seen > 1:
+                seen_again.append(flight_id)
+                continue
+            new_itineraries += 1
+
+            cursor.executemany('''
+                INSERT INTO flight_segments1 (
+                    flight_id, carrier_code, flight_number, departure_iata,
+                    arrival_iata, departure_time, arrival_time, segment_order
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (flight_id, s.carrier, s.number, s.origin, s.destination, s.departure_time, s.arrival_time, order)
+                for itinerary in offer.itineraries
+                for order, s in enumerate(itinerary, 1)
+            ])
+
+        self.sketches.update(vpm_observations, cursor)
+        self.detector.save(cursor)
+        self.connections.refresh(cursor)
+        # Updated quotes on known itineraries never reach refresh, which only sees new segments
+        self.connections.reprice(seen_again, cursor)
+        self.calendar.save(cursor)
+        self.history.save(cursor)
+
+        conn.commit()
+        conn.close()
+        get_metrics().inc("offers_stored_total", stored_count)
+        get_metrics().inc("itineraries_new_total", new_itineraries)
+        log_event(logger, logging.INFO, "offers_stored", search_id=search_id, count=stored_count,
+                  new_itineraries=new_itineraries)
+        return stored_count
+
+class AmadeusFlightSearch:
+    def __init__(self, db_path="flight_offers.db"):
+        self.client_id = os.getenv("AMADEUS_CLIENT_ID")
+        self.client_secret = os.getenv("AMADEUS_CLIENT_SECRET")
+        self.base_url = "https://test.api.amadeus.com"
+        self.access_token = None
+        self.db = FlightDatabase(db_path)
+
+    def get_access_token(self):
+        auth_url = f"{self.base_url}/v1/security/oauth2/token"
+        auth_data = {
+            "grant_type": "client_credentials",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret
+        }
+
+        try:
+            with get_metrics().timer("amadeus_request_seconds", endpoint="token"):
+                response = requests.post(auth_url, data=auth_data)
+            record_response("token", response)
+            response.raise_for_status()
+            self.access_token = response.json()["access_token"]
+            log_event(logger, logging.INFO, "auth_succeeded")
+            return True
+        except requests.exceptions.RequestException as e:
+            if e.response is None:
+                record_response("token", None)
+            log_event(logger, logging.ERROR, "auth_failed", error=str(e))
+            return False
+
+    def search_flights(self, origin, destination, departure_date, adults=1):
+        if not self.access_token and not self.get_access_token():
+            return None
+
+        url = f"{self.base_url}/v2/shopping/flight-offers"
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json"
+        }
+        params = {
+            "originLocationCode": origin,
+            "destinationLocationCode": destination,
+            "departureDate": departure_date,
+            "adults": adults,
+            "max": 5
+        }
+
+        try:
+            log_event(logger, logging.DEBUG, "search_started", search_type="direct",
+                      origin=origin, destination=destination, departure_date=departure_date)
+            with get_metrics().timer("amadeus_request_seconds", endpoint="flight-offers"):
+                response = requests.get(url, headers=headers, params=params)
+            record_response("flight-offers", response)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            if e.response is None:
+                record_response("flight-offers", None)
+            log_event(logger, logging.ERROR, "search_failed", search_type="direct",
+                      origin=origin, destination=destination, departure_date=departure_date, error=str(e))
+            return None
+
+    def search_multi_city(self, segments, adults=1):
+        if not self.access_token and not self.get_access_token():
+            return None
+
+        url = f"{self.base_url}/v2/shopping/flight-offers"
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json"
+        }
+
+        formatted_segments = [
+            {
+                "id": seg["id"],
+                "originLocationCode": seg["originLocationCode"],
+                "destinationLocationCode": seg["destinationLocationCode"],
+                "departureDateTimeRange": {
+                    "date": seg["departureDate"]
+                }
+            }
+            for seg in segments
+        ]
+
+        body = {
+            "currencyCode": "USD",
+            "originDestinations": formatted_segments,
+            "travelers": [{"id": "1", "travelerType": "ADULT"}],
+            "sources": ["GDS"]
+        }
+
+        try:
+            log_event(logger, logging.DEBUG, "search_started", search_type="multi-city", legs=len(segments))
+            with get_metrics().timer("amadeus_request_seconds", endpoint="multi-city"):
+                response = requests.post(url, headers=headers, json=body)
+            record_response("multi-city", response)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            if e.response is None:
+                record_response("multi-city", None)
+            log_event(logger, logging.ERROR, "search_failed", search_type="multi-city", legs=len(segments), error=str(e))
+            if e.response is not None:
+                log_event(logger, logging.DEBUG, "search_error_body", body=e.response.text[:MAX_LOGGED_BODY])
+            return None
+
+    def search_and_store_multi_city(self, segments):
+        results = self.search_multi_city(segments)
+        if not results or 'data' not in results:
+            log_event(logger, logging.WARNING, "no_offers", search_type="multi-city")
+            return None, 0
+
+        search_params = {
+            'search_type': 'multi-city'
+        }
+
+        stored_count = self.db.store_flight_offers(results['data'], search_params)
+        return results, stored_count
+
+    def search_and_store_flights(self, origin, destination, departure_date, adults=1):
+        results = self.search_flights(origin, destination, departure_date, adults)
+        if not results or 'data' not in results:
+            log_event(logger, logging.WARNING, "no_offers", search_type="direct",
+                      origin=origin, destination=destination, departure_date=departure_date)
+            return None, 0
+
+        search_params = {
+            'origin': origin,
+            'destination': destination,
+            'departure_date': departure_date,
+            'adults': adults,
+            'search_type': 'direct'
+        }
+
+        stored_count = self.db.store_flight_offers(results['data'], search_params)
+        return results, stored_count
+
+def generate_dates(start_date, end_date):
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    return [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((end - start).days + 1)]
+
+def main(argv=None):
+    searcher = AmadeusFlightSearch()
+
+    routes = [("BOS", "SFO"), ("JFK", "LAX"), ("ORD", "SEA")]
+    dates = generate_dates("2025-08-01", "2025-08-03")
+
+    stored = 0
+    for origin, destination in routes:
+        for date in dates:
+            _, count = searcher.search_and_store_flights(origin, destination, date)
+            stored += count
+
+    segments = [
+        {"id": "1", "originLocationCode": "BOS", "destinationLocationCode": "LAX", "departureDate": "2025-08-01"},
+        {"id": "2", "originLocationCode": "LAX", "destinationLocationCode": "SEA", "departureDate": "2025-08-05"}
+    ]
+
+    _, count = searcher.search_and_store_multi_city(segments)
+    stored += count
+    log_event(logger, logging.INFO, "crawl_finished", searches=len(routes) * len(dates) + 1, offers_stored=stored)
+    get_metrics().report()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import logging
+import os
+import sys
+import csv
+import sqlite3
+from datetime import datetime
+from .structured_log import get_logger, log_event
+
+logger = get_logger("fx_rates")
+
+DEFAULT_FX_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "fx_rates.csv")
+# Every aggregate, VPM and comparison is computed in this currency
+REPORTING_CURRENCY = "USD"
+
+# Loaded rate tables keyed by db path, so conversions never go back to disk
+_fx_cache = {}
+
+
+def ensure_reporting_prices(cursor, db_path):
+    # One-time migration: add the reporting-currency columns and convert existing
+    # rows. New rows are converted at ingest, so this is a cheap PRAGMA afterwards.
+    cursor.execute("PRAGMA table_info(flights1)")
+    columns = [col[1] for col in cursor.fetchall()]
+    cursor.execute("PRAGMA table_info(offer_observations)")
+    observation_columns = [col[1] for col in cursor.fetchall()]
+    missing = [name for name in ('reporting_price', 'reporting_fees', 'value_per_mile') if name not in columns]
+    observations_missing = bool(observation_columns) and 'reporting_fees' not in observation_columns
+    if not columns or not (missing or observations_missing):
+        return 0
+
+    # Seed the rate table on its own connection before this one starts writing
+    rates = FXRates(db_path)
+    converted = 0
+    if 'reporting_price' in missing:
+        cursor.execute("ALTER TABLE flights1 ADD COLUMN reporting_price REAL")
+        converted += _convert_rows(cursor, rates, "flights1", "reporting_price", '''
+            SELECT id, total_price, currency, created_at FROM flights1 WHERE total_price IS NOT NULL
+        ''')
+
+    if 'reporting_fees' in missing:
+        cursor.execute("ALTER TABLE flights1 ADD COLUMN reporting_fees REAL")
+        converted += _convert_rows(cursor, rates, "flights1", "reporting_fees", '''
+            SELECT id, COALESCE(fees, 0), currency, created_at FROM flights1
+        ''')
+
+    if 'value_per_mile' in missing:
+        cursor.execute("ALTER TABLE flights1 ADD COLUMN value_per_mile REAL")
+        # Ingest zeroes the cash column of a simulated award and keeps 10% of the
+        # fare it replaced as fees, so that fare is recovered from the fees
+        converted += _convert_rows(cursor, rates, "flights1", "value_per_mile", '''
+            SELECT id,
+                   (CASE WHEN total_price != 0 THEN total_price ELSE COALESCE(fees, 0) * 10 END
+                    - COALESCE(fees, 0)) * 100.0 / miles_used,
+                   currency, created_at
+            FROM flights1 WHERE miles_used > 0
+        ''', digits=None)
+
+    if observations_missing:
+        cursor.execute("ALTER TABLE offer_observations ADD COLUMN reporting_fees REAL")
+        converted += _convert_rows(cursor, rates, "offer_observations", "reporting_fees", '''
+            SELECT id, COALESCE(fees, 0), currency, observed_at FROM offer_observations
+        ''')
+    return converted
+
+
+def _convert_rows(cursor, rates, table, column, query, digits=2):
+    # query selects (id, amount, currency, date); amounts are written back in the
+    # reporting currency, rounded as ingest rounds them, NULL where no rate exists
+    cursor.execute(query)
+    rows = cursor.fetchall()
+    if not rows:
+        return 0
+    values = rates.convert_batch(
+        [amount for _, amount, _, _ in rows],
+        [currency or REPORTING_CURRENCY for _, _, currency, _ in rows],
+        [(date or datetime.now().strftime("%Y-%m-%d"))[:10] for _, _, _, date in rows]
+    )
+    cursor.executemany(f"UPDATE {table} SET {column} = ? WHERE id = ?", [
+        (None if value != value else value if digits is None else round(value, digits), row[0])
+        for row, value in zip(rows, values.tolist())
+    ])
+    return len(rows)
+
+
+class FXRates:
+    def __init__(self, db_path="flight_offers.db", csv_path=DEFAULT_FX_CSV):
+        self.db_path = db_path
+        self.csv_path = csv_path
+        self.init_table()
+
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def init_table(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS fx_rates (
+                currency TEXT,
+                rate_date DATE,
+                usd_per_unit REAL,
+                PRIMARY KEY (currency, rate_date)
+            )
+        ''')
+
+        cursor.execute("SELECT COUNT(*) FROM fx_rates")
+        is_empty = cursor.fetchone()[0] == 0
+
+        conn.commit()
+        conn.close()
+
+        if is_empty and self.csv_path and os.path.exists(self.csv_path):
+            self.load_from_csv(self.csv_path)
+
+    def load_from_csv(self, csv_path):
+        with open(csv_path, newline='') as f:
+            rows = [
+                (row['currency'].strip().upper(), row['rate_date'].strip(), float(row['usd_per_unit']))
+                for row in csv.DictReader(f)
+            ]
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT OR REPLACE INTO fx_rates (currency, rate_date, usd_per_unit)
+            VALUES (?, ?, ?)
+        ''', rows)
+        conn.commit()
+        conn.close()
+
+        invalidate_cache(self.db_path)
+        log_event(logger, logging.INFO, "fx_rates_loaded", count=len(rows), csv_path=csv_path)
+        return len(rows)
+
+    def load(self):
+        cached = _fx_cache.get(self.db_path)
+        if cached is not None:
+            return cached
+
+        # Imported here so the viewer's migration check does not pay for numpy
+        import numpy as np
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT currency, rate_date, usd_per_unit FROM fx_rates ORDER BY currency, rate_date")
+        rows = cursor.fetchall()
+        conn.close()
+
+        grouped = {}
+        for currency, rate_date, usd_per_unit in rows:
+            grouped.setdefault(currency, ([], []))
+            grouped[currency][0].append(rate_date)
+            grouped[currency][1].append(usd_per_unit)
+
+        table = {
+            currency: (np.array(dates, dtype='datetime64[D]'), np.array(rates, dtype=float))
+            for currency, (dates, rates) in grouped.items()
+        }
+        _fx_cache[self.db_path] = table
+        return table
+
+    def usd_per_unit(self, currencies, dates):
+        import numpy as np
+
+        table = self.load()
+        currencies = np.asarray(currencies)
+        dates = np.broadcast_to(np.asarray(dates, dtype='datetime64[D]'), currencies.shape)
+        rates = np.full(currencies.shape, np.nan)
+
+        # One as-of lookup per currency present: latest rate on or before each
+        # date, falling back to the earliest rate for dates before the table
+        for currency in np.unique(currencies):
+            entry = table.get(currency)
+            if entry is None:
+                continue
+            rate_dates, values = entry
+            mask = currencies == currency
+            idx = np.searchsorted(rate_dates, dates[mask], side='right') - 1
+            rates[mask] = values[np.maximum(idx, 0)]
+        return rates
+
+    def convert_batch(self, amounts, currencies, dates=None, target=REPORTING_CURRENCY):
+        import numpy as np
+
+        amounts = np.asarray(amounts, dtype=float)
+        if dates is None:
+            dates = datetime.now().strftime("%Y-%m-%d")
+        # Unknown currencies come back as NaN rather than silently unconverted
+        usd = amounts * self.usd_per_unit(np.broadcast_to(np.asarray(currencies), amounts.shape), dates)
+        if target == "USD":
+            return usd
+        return usd / self.usd_per_unit(np.full(amounts.shape, target), dates)
+
+    def convert(self, amount, currency, date=None, target=REPORTING_CURRENCY):
+        value = float(self.convert_batch([amount], [currency], date, target)[0])
+        return None if value != value else value
+
+
+def invalidate_cache(db_path=None):
+    if db_path is None:
+        _fx_cache.clear()
+    else:
+        _fx_cache.pop(db_path, None)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    rates = FXRates()
+    command = argv[0].lower() if argv else "show"
+
+    if command == "load":
+        if len(argv) < 2:
+            print("Usage: load FILE.csv  (columns: rate_date, currency, usd_per_unit)")
+            return
+        print(f"Loaded {rates.load_from_csv(argv[1])} FX rates from {argv[1]}")
+    elif command == "show":
+        print(f"\nFX Rates (USD per unit, reporting in {REPORTING_CURRENCY}):")
+        print("=" * 50)
+        for currency, (dates, values) in sorted(rates.load().items()):
+            print(f"{currency}: {values[-1]:.6g} as of {dates[-1]} ({len(dates)} dates)")
+    elif command == "convert":
+        if len(argv) < 3:
+            print("Usage: convert AMOUNT CURRENCY [YYYY-MM-DD] [TARGET]")
+            return
+        date = argv[3] if len(argv) > 3 else None
+        target = argv[4].upper() if len(argv) > 4 else REPORTING_CURRENCY
+        value = rates.convert(float(argv[1]), argv[2].upper(), date, target)
+        print(f"{argv[1]} {argv[2].upper()} = {value:.2f} {target}" if value is not None else "No rate available")
+    else:
+        print("Unknown command. Available: show, load, convert")
+
+if __name__ == "__main__":
+    main()
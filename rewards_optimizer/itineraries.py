@@ -0,0 +1,107 @@
+import hashlib
+from itertools import groupby
+
+
+def itinerary_fingerprint(segments):
+    # Identity of an itinerary: its legs in flown order, each given as
+    # (carrier, number, origin, destination, departure, arrival)
+    key = ";".join("|".join(str(part) for part in segment) for segment in segments)
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def ensure_itineraries(cursor):
+    # flights1 holds one row per distinct itinerary; every crawl that sees it
+    # again adds a row here instead of another copy of its segments
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS offer_observations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            flight_id INTEGER,
+            search_id TEXT,
+            offer_id TEXT,
+            total_price REAL,
+            currency TEXT,
+            reporting_price REAL,
+            miles_used INTEGER,
+            fees REAL,
+            reporting_fees REAL,
+            value_per_mile REAL,
+            observed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (flight_id) REFERENCES flights1 (id)
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_offer_observations_flight ON offer_observations (flight_id)")
+    cursor.execute("PRAGMA table_info(offer_observations)")
+    if 'value_per_mile' not in [col[1] for col in cursor.fetchall()]:
+        # Observations recorded before VPM was stored take their itinerary's value
+        cursor.execute("ALTER TABLE offer_observations ADD COLUMN value_per_mile REAL")
+        cursor.execute('''
+            UPDATE offer_observations
+            SET value_per_mile = (SELECT f.value_per_mile FROM flights1 f WHERE f.id = offer_observations.flight_id)
+            WHERE miles_used > 0
+        ''')
+
+    cursor.execute("PRAGMA table_info(flights1)")
+    columns = [col[1] for col in cursor.fetchall()]
+    if not columns:
+        return 0
+
+    merged = 0
+    if 'fingerprint' not in columns:
+        merged = _merge_duplicate_itineraries(cursor, columns)
+    # Rows without segments (calculator samples) keep a NULL fingerprint, which never conflicts
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_flights1_fingerprint ON flights1 (fingerprint)")
+    return merged
+
+
+def _merge_duplicate_itineraries(cursor, columns):
+    # One-time migration for databases that stored every crawl's offers separately
+    for column, definition in (("fingerprint", "TEXT"), ("times_seen", "INTEGER DEFAULT 1"), ("last_seen_at", "TIMESTAMP")):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE flights1 ADD COLUMN {column} {definition}")
+    cursor.execute('''
+        INSERT INTO offer_observations (flight_id, search_id, offer_id, total_price, currency,
+                                        reporting_price, miles_used, fees, reporting_fees, value_per_mile, observed_at)
+        SELECT id, search_id, offer_id, total_price, currency, reporting_price, miles_used, fees, reporting_fees,
+               value_per_mile, created_at
+        FROM flights1
+    ''')
+
+    cursor.execute('''
+        SELECT flight_id, carrier_code, flight_number, departure_iata, arrival_iata, departure_time, arrival_time
+        FROM flight_segments1
+        ORDER BY flight_id, id
+    ''')
+    canonical = {}
+    fingerprints = []
+    duplicates = []
+    for flight_id, segments in groupby(cursor.fetchall(), key=lambda row: row[0]):
+        fingerprint = itinerary_fingerprint(segment[1:] for segment in segments)
+        # The first time an itinerary was stored becomes its surviving row
+        if fingerprint in canonical:
+            duplicates.append((canonical[fingerprint], flight_id))
+        else:
+            canonical[fingerprint] = flight_id
+            fingerprints.append((fingerprint, flight_id))
+
+    cursor.executemany("UPDATE flights1 SET fingerprint = ? WHERE id = ?", fingerprints)
+    cursor.executemany("UPDATE offer_observations SET flight_id = ? WHERE flight_id = ?", duplicates)
+    cursor.executemany("DELETE FROM flight_segments1 WHERE flight_id = ?", [(dup,) for _, dup in duplicates])
+    cursor.executemany("DELETE FROM flights1 WHERE id = ?", [(dup,) for _, dup in duplicates])
+
+    # Surviving rows carry their latest observation, like rows upserted at ingest
+    cursor.execute('''
+        UPDATE flights1
+        SET search_id = o.search_id, offer_id = o.offer_id, total_price = o.total_price,
+            currency = o.currency, reporting_price = o.reporting_price, miles_used = o.miles_used,
+            fees = o.fees, reporting_fees = o.reporting_fees, value_per_mile = o.value_per_mile,
+            times_seen = o.times_seen, last_seen_at = o.observed_at
+        FROM (
+            SELECT latest.*, counts.times_seen
+            FROM offer_observations latest
+            JOIN (SELECT flight_id, COUNT(DISTINCT search_id) AS times_seen, MAX(id) AS last_id
+                  FROM offer_observations GROUP BY flight_id) counts
+              ON counts.last_id = latest.id
+        ) o
+        WHERE o.flight_id = flights1.id
+    ''')
+    return len(duplicates)
@@ -0,0 +1,179 @@
+import os
+import time
+import bisect
+import threading
+import functools
+from contextlib import contextmanager
+
+# Seconds; Prometheus client defaults, which cover both API calls and local queries
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_FILE_ENV = "METRICS_FILE"
+METRIC_PREFIX = "flight_"
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # Last slot is the +Inf bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+def _label_text(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in items) + "}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter_total(self, name):
+        with self._lock:
+            return sum(value for (n, _), value in self.counters.items() if n == name)
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            for name in sorted({n for n, _ in self.counters}):
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} counter")
+                for (n, labels), value in sorted(self.counters.items()):
+                    if n == name:
+                        lines.append(f"{METRIC_PREFIX}{name}{_label_text(labels)} {value}")
+
+            for name in sorted({n for n, _ in self.histograms}):
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} histogram")
+                for (n, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                    if n != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                        cumulative += count
+                        lines.append(f"{METRIC_PREFIX}{name}_bucket{_label_text(labels, ('le', bound))} {cumulative}")
+                    lines.append(f"{METRIC_PREFIX}{name}_sum{_label_text(labels)} {histogram.sum:.6f}")
+                    lines.append(f"{METRIC_PREFIX}{name}_count{_label_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path=None):
+        path = path or os.getenv(METRICS_FILE_ENV)
+        if not path:
+            return None
+        # Write-then-rename so a node_exporter textfile scrape never sees half a file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+        return path
+
+    def print_summary(self):
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+        if not histograms and not counters:
+            return
+
+        print(f"\nRun Summary ({time.time() - self.started_at:.1f}s):")
+        print("=" * 80)
+        for (name, labels), histogram in histograms:
+            p50, p95 = histogram.quantile(0.5), histogram.quantile(0.95)
+            print(f"{name}{_label_text(labels)}: {histogram.count} calls | total {histogram.sum:.3f}s | "
+                  f"avg {histogram.sum / histogram.count * 1000:.1f} ms | p50 <= {p50}s | p95 <= {p95}s")
+        for (name, labels), value in counters:
+            print(f"{name}{_label_text(labels)}: {value}")
+
+        stored = self.counter_total("offers_stored_total")
+        store_seconds = sum(h.sum for (n, _), h in histograms if n == "store_offers_seconds")
+        if stored and store_seconds:
+            print(f"Ingest rate: {stored / store_seconds:,.0f} offers/sec")
+
+    def report(self):
+        self.print_summary()
+        path = self.write_prometheus()
+        if path:
+            print(f"Metrics written to {path}")
+
+    def start_http_server(self, port=9108):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("", port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+        print(f"Serving metrics on :{port}/metrics")
+        return server
+
+
+_metrics = None
+
+
+def get_metrics():
+    global _metrics
+    if _metrics is None:
+        _metrics = MetricsRegistry()
+    return _metrics
+
+
+def timed(name, **labels):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_metrics().timer(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,109 @@
+import sqlite3
+import numpy as np
+
+# Award charts price in 500-mile steps, so the DP works in those units
+MILES_GRANULARITY = 500
+
+
+def load_trip_options(trips, db_path="flight_offers.db"):
+    # trips: list of (origin, destination, departure_date)
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    trip_options = []
+    for origin, destination, departure_date in trips:
+        cursor.execute('''
+            SELECT MIN(reporting_price) FROM flights1
+            WHERE origin = ? AND destination = ? AND departure_date = ?
+              AND (miles_used IS NULL OR miles_used = 0) AND reporting_price > 0
+        ''', (origin, destination, departure_date))
+        cash_price = cursor.fetchone()[0]
+
+        # Fees in the reporting currency, like the cash fare they are netted against;
+        # awards quoted in a currency with no rate cannot be compared
+        cursor.execute('''
+            SELECT id, miles_used, reporting_fees FROM flights1
+            WHERE origin = ? AND destination = ? AND departure_date = ?
+              AND miles_used > 0 AND reporting_fees IS NOT NULL
+        ''', (origin, destination, departure_date))
+        awards = cursor.fetchall()
+
+        trip_options.append({
+            'trip': (origin, destination, departure_date),
+            'cash_price': cash_price or 0.0,
+            'options': [{'flight_id': flight_id, 'miles': miles, 'fees': fees or 0.0} for flight_id, miles, fees in awards]
+        })
+
+    conn.close()
+    return trip_options
+
+
+def _pareto_options(options, cash_price, max_fees, granularity):
+    # Keep only options that buy more savings than every cheaper-in-miles option
+    candidates = []
+    for idx, option in enumerate(options):
+        if max_fees is not None and option['fees'] > max_fees:
+            continue
+        value = cash_price - option['fees']
+        if value <= 0:
+            continue
+        weight = max(1, -(-int(option['miles']) // granularity))
+        candidates.append((weight, -value, idx))
+
+    candidates.sort()
+    frontier = []
+    best_value = 0.0
+    for weight, neg_value, idx in candidates:
+        if -neg_value > best_value:
+            frontier.append((weight, -neg_value, idx))
+            best_value = -neg_value
+    return frontier
+
+
+def optimize_portfolio(trip_options, miles_budget, max_fees=None, granularity=MILES_GRANULARITY):
+    # A negative budget buys nothing, like an empty one
+    miles_budget = max(int(miles_budget), 0)
+    capacity = miles_budget // granularity
+    best = np.zeros(capacity + 1)
+    choices = []
+
+    for trip in trip_options:
+        frontier = _pareto_options(trip['options'], trip['cash_price'], max_fees, granularity)
+        updated = best.copy()
+        choice = np.full(capacity + 1, -1, dtype=np.int64)
+
+        for position, (weight, value, _) in enumerate(frontier):
+            if weight > capacity:
+                break
+            candidate = best[:capacity + 1 - weight] + value
+            improved = candidate > updated[weight:]
+            updated[weight:] = np.where(improved, candidate, updated[weight:])
+            choice[weight:][improved] = position
+
+        choices.append((frontier, choice))
+        best = updated
+
+    plan = []
+    remaining = capacity
+    for trip, (frontier, choice) in zip(reversed(trip_options), reversed(choices)):
+        position = int(choice[remaining])
+        if position < 0:
+            plan.append({'trip': trip['trip'], 'pay_with': 'cash', 'cash_price': trip['cash_price'],
+                         'miles': 0, 'fees': 0.0, 'savings': 0.0, 'flight_id': None})
+            continue
+        weight, value, idx = frontier[position]
+        option = trip['options'][idx]
+        remaining -= weight
+        plan.append({'trip': trip['trip'], 'pay_with': 'miles', 'cash_price': trip['cash_price'],
+                     'miles': option['miles'], 'fees': option['fees'], 'savings': round(value, 2),
+                     'flight_id': option['flight_id']})
+    plan.reverse()
+
+    miles_spent = sum(p['miles'] for p in plan)
+    return {
+        'plan': plan,
+        'total_savings': round(float(best[capacity]), 2),
+        'miles_spent': miles_spent,
+        'miles_left': miles_budget - miles_spent,
+        'cash_spent': round(sum(p['cash_price'] if p['pay_with'] == 'cash' else p['fees'] for p in plan), 2)
+    }
@@ -0,0 +1,147 @@
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+
+from .structured_log import get_logger, log_event
+
+logger = get_logger("calendar")
+
+
+class PriceCalendar:
+    def __init__(self, db_path="flight_offers.db"):
+        self.db_path = db_path
+        self.pending = {}
+        self.init_table()
+
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def init_table(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+        # Primary key doubles as the (route, date) index a month read scans
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS price_calendar (
+                origin TEXT,
+                destination TEXT,
+                departure_date DATE,
+                min_cash REAL,
+                best_vpm REAL,
+                offer_count INTEGER,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (origin, destination, departure_date)
+            )
+        ''')
+        cursor.execute("SELECT COUNT(*) FROM price_calendar")
+        is_empty = cursor.fetchone()[0] == 0
+        cursor.execute("PRAGMA table_info(offer_observations)")
+        has_vpm = 'value_per_mile' in [col[1] for col in cursor.fetchall()]
+        conn.commit()
+        conn.close()
+
+        # Databases crawled before the calendar existed already hold every quote
+        if is_empty and has_vpm:
+            self.rebuild()
+
+    def observe(self, origin, destination, departure_date, cash_price=None, vpm=None):
+        cell = self.pending.setdefault((origin, destination, departure_date), [None, None, 0])
+        if cash_price is not None and cash_price > 0:
+            cell[0] = cash_price if cell[0] is None else min(cell[0], cash_price)
+        if vpm is not None:
+            cell[1] = vpm if cell[1] is None else max(cell[1], vpm)
+        cell[2] += 1
+
+    def save(self, cursor=None):
+        rows = [(o, d, date, cash, vpm, count) for (o, d, date), (cash, vpm, count) in self.pending.items()]
+        self.pending = {}
+        if not rows:
+            return 0
+        self._write(rows, cursor)
+        return len(rows)
+
+    def observe_batch(self, origins, destinations, dates, cash_prices, vpms, cursor=None):
+        # Bulk loads aggregate a whole batch per route/date in numpy and upsert
+        # it at once, instead of going through observe row by row
+        import numpy as np
+        from .fare_history import group_rows
+
+        first, groups = group_rows(origins, destinations, dates)
+        count = len(first)
+        cash = np.asarray(cash_prices, dtype=float)
+        min_cash = np.full(count, np.inf)
+        np.minimum.at(min_cash, groups, np.where(cash > 0, cash, np.inf))
+        best_vpm = np.full(count, -np.inf)
+        np.maximum.at(best_vpm, groups, np.nan_to_num(np.asarray(vpms, dtype=float), nan=-np.inf))
+        counts = np.bincount(groups, minlength=count)
+
+        rows = list(zip(*(np.asarray(column)[first].tolist() for column in (origins, destinations, dates)),
+                        *(np.where(np.isinf(values), None, values).tolist() for values in (min_cash, best_vpm)),
+                        counts.tolist()))
+        self._write(rows, cursor)
+        return len(rows)
+
+    def _write(self, rows, cursor=None):
+        conn = None
+        if cursor is None:
+            conn = self.connect()
+            cursor = conn.cursor()
+
+        cursor.executemany('''
+            INSERT INTO price_calendar (origin, destination, departure_date, min_cash, best_vpm, offer_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (origin, destination, departure_date) DO UPDATE SET
+                min_cash = CASE WHEN min_cash IS NULL THEN excluded.min_cash
+                                WHEN excluded.min_cash IS NULL THEN min_cash
+                                ELSE MIN(min_cash, excluded.min_cash) END,
+                best_vpm = CASE WHEN best_vpm IS NULL THEN excluded.best_vpm
+                                WHEN excluded.best_vpm IS NULL THEN best_vpm
+                                ELSE MAX(best_vpm, excluded.best_vpm) END,
+                offer_count = offer_count + excluded.offer_count,
+                updated_at = CURRENT_TIMESTAMP
+        ''', rows)
+
+        if conn is not None:
+            conn.commit()
+            conn.close()
+
+    def rebuild(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM price_calendar")
+        # Like ingest, award rows count the fare they replaced, which their
+        # stored VPM was computed from as 90% of it per mile
+        cursor.execute('''
+            INSERT INTO price_calendar (origin, destination, departure_date, min_cash, best_vpm, offer_count)
+            SELECT f.origin, f.destination, f.departure_date,
+                   MIN(CASE WHEN o.reporting_price > 0 THEN o.reporting_price
+                            ELSE ROUND(o.value_per_mile * o.miles_used / 90.0, 2) END),
+                   MAX(o.value_per_mile),
+                   COUNT(*)
+            FROM offer_observations o
+            JOIN flights1 f ON f.id = o.flight_id
+            WHERE f.origin IS NOT NULL AND f.destination IS NOT NULL
+            GROUP BY f.origin, f.destination, f.departure_date
+        ''')
+        count = cursor.rowcount
+        conn.commit()
+        conn.close()
+        if count:
+            log_event(logger, logging.INFO, "calendar_rebuilt", cells=count)
+        return count
+
+    def month(self, origin, destination, month):
+        start = datetime.strptime(month, "%Y-%m")
+        end = (start + timedelta(days=32)).replace(day=1)
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT departure_date, min_cash, best_vpm, offer_count
+            FROM price_calendar
+            WHERE origin = ? AND destination = ?
+              AND departure_date >= ? AND departure_date < ?
+            ORDER BY departure_date
+        ''', (origin, destination, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")))
+        rows = cursor.fetchall()
+        conn.close()
+        return rows
@@ -0,0 +1,313 @@
+import os
+import sys
+import json
+import time
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from .fetch import AmadeusFlightSearch, generate_dates
+from .award_charts import get_award_chart_engine
+from .connection_search import AWARD_FEE_PER_SEGMENT
+from .fx_rates import FXRates
+from .metrics import get_metrics
+from .structured_log import get_logger, log_event
+from .records import Offer
+
+logger = get_logger("watch")
+
+# Refresh interval by days to departure: fares move fastest close in
+REFRESH_HOURS = [(7, 2), (21, 6), (60, 12), (None, 24)]
+MIN_REFRESH_HOURS = 1
+VOLATILITY_ALPHA = 0.3
+# Interval shrinks as observed relative price movement grows
+VOLATILITY_WEIGHT = 10
+
+
+def refresh_interval_hours(days_to_departure, volatility):
+    for max_days, hours in REFRESH_HOURS:
+        if max_days is None or days_to_departure <= max_days:
+            base = hours
+            break
+    return max(MIN_REFRESH_HOURS, base / (1 + VOLATILITY_WEIGHT * volatility))
+
+
+class PriceWatcher:
+    def __init__(self, db_path="flight_offers.db", outbox_path="watch_outbox.jsonl", searcher=None):
+        self.db_path = db_path
+        self.outbox_path = outbox_path
+        self.searcher = searcher
+        self.init_tables()
+        self.fx = FXRates(db_path)
+
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def init_tables(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS watch_rules (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                origin TEXT,
+                destination TEXT,
+                start_date DATE,
+                end_date DATE,
+                max_price REAL,
+                min_vpm REAL,
+                active INTEGER DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS watch_cells (
+                origin TEXT,
+                destination TEXT,
+                departure_date DATE,
+                last_checked TIMESTAMP,
+                next_check TIMESTAMP,
+                last_min_price REAL,
+                volatility REAL DEFAULT 0,
+                PRIMARY KEY (origin, destination, departure_date)
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS watch_notifications (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                rule_id INTEGER,
+                origin TEXT,
+                destination TEXT,
+                departure_date DATE,
+                kind TEXT,
+                value REAL,
+                threshold REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (rule_id) REFERENCES watch_rules (id)
+            )
+        ''')
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_watch_cells_next ON watch_cells (next_check)")
+        conn.commit()
+        conn.close()
+
+    def add_rule(self, origin, destination, start_date, end_date, max_price=None, min_vpm=None):
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO watch_rules (origin, destination, start_date, end_date, max_price, min_vpm)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (origin, destination, start_date, end_date, max_price, min_vpm))
+        rule_id = cursor.lastrowid
+
+        # Only the cells this rule covers are ever scheduled for refresh
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        cursor.executemany('''
+            INSERT OR IGNORE INTO watch_cells (origin, destination, departure_date, next_check)
+            VALUES (?, ?, ?, ?)
+        ''', [(origin, destination, date, now) for date in generate_dates(start_date, end_date)])
+
+        conn.commit()
+        conn.close()
+        print(f"Added watch #{rule_id}: {origin} → {destination} {start_date}..{end_date}")
+        return rule_id
+
+    def remove_rule(self, rule_id):
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute("UPDATE watch_rules SET active = 0 WHERE id = ?", (rule_id,))
+        # Drop cells no other active rule still covers
+        cursor.execute('''
+            DELETE FROM watch_cells
+            WHERE NOT EXISTS (
+                SELECT 1 FROM watch_rules r
+                WHERE r.active = 1 AND r.origin = watch_cells.origin AND r.destination = watch_cells.destination
+                  AND watch_cells.departure_date BETWEEN r.start_date AND r.end_date
+            )
+        ''')
+        conn.commit()
+        conn.close()
+        print(f"Removed watch #{rule_id}")
+
+    def list_rules(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT id, origin, destination, start_date, end_date, max_price, min_vpm
+            FROM watch_rules WHERE active = 1 ORDER BY id
+        ''')
+        rules = cursor.fetchall()
+        conn.close()
+        return rules
+
+    def due_cells(self, limit):
+        today = datetime.now().strftime("%Y-%m-%d")
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT origin, destination, departure_date, last_min_price, volatility
+            FROM watch_cells
+            WHERE next_check <= ? AND departure_date >= ?
+            ORDER BY next_check
+            LIMIT ?
+        ''', (now, today, limit))
+        cells = cursor.fetchall()
+        conn.close()
+        return cells
+
+    def summarize_offers(self, offers):
+        priced = [o for o in map(Offer.from_api, offers) if o is not None]
+        if not priced:
+            return None, None
+
+        miles = get_award_chart_engine().price_batch(
+            [o.carrier for o in priced],
+            [o.origin for o in priced],
+            [o.destination for o in priced]
+        )
+
+        # Rules are set in the reporting currency, so quotes are converted as at ingest;
+        # offers in a currency with no rate are left out
+        reporting = self.fx.convert_batch([o.price for o in priced], [o.currency for o in priced]).tolist()
+        prices = [price for price in reporting if price == price]
+        vpms = [
+            (price - AWARD_FEE_PER_SEGMENT * len(o.segments)) * 100 / m
+            for o, price, m in zip(priced, reporting, miles) if m and price == price
+        ]
+        return min(prices) if prices else None, max(vpms) if vpms else None
+
+    def evaluate(self, cursor, origin, destination, departure_date, min_price, best_vpm):
+        cursor.execute('''
+            SELECT id, max_price, min_vpm FROM watch_rules
+            WHERE active = 1 AND origin = ? AND destination = ? AND ? BETWEEN start_date AND end_date
+        ''', (origin, destination, departure_date))
+
+        notifications = []
+        for rule_id, max_price, min_vpm in cursor.fetchall():
+            checks = [('price_below', min_price, max_price, lambda v, t: v < t),
+                      ('vpm_above', best_vpm, min_vpm, lambda v, t: v > t)]
+            for kind, value, threshold, triggered in checks:
+                if value is None or threshold is None or not triggered(value, threshold):
+                    continue
+
+                # Re-notify only when the value improves on the last alert
+                cursor.execute('''
+                    SELECT value FROM watch_notifications
+                    WHERE rule_id = ? AND departure_date = ? AND kind = ?
+                    ORDER BY id DESC LIMIT 1
+                ''', (rule_id, departure_date, kind))
+                previous = cursor.fetchone()
+                if previous and not triggered(value, previous[0]):
+                    continue
+
+                notification = {
+                    'rule_id': rule_id, 'origin': origin, 'destination': destination,
+                    'departure_date': departure_date, 'kind': kind,
+                    'value': round(value, 2), 'threshold': threshold
+                }
+                cursor.execute('''
+                    INSERT INTO watch_notifications (rule_id, origin, destination, departure_date, kind, value, threshold)
+                    VALUES (:rule_id, :origin, :destination, :departure_date, :kind, :value, :threshold)
+                ''', notification)
+                notifications.append(notification)
+        return notifications
+
+    def refresh_cell(self, origin, destination, departure_date, last_min_price, volatility):
+        results, _ = self.searcher.search_and_store_flights(origin, destination, departure_date)
+        min_price, best_vpm = self.summarize_offers(results['data'] if results else [])
+
+        if min_price is not None and last_min_price:
+            change = abs(min_price - last_min_price) / last_min_price
+            volatility = VOLATILITY_ALPHA * change + (1 - VOLATILITY_ALPHA) * (volatility or 0)
+
+        now = datetime.now()
+        days_out = (datetime.strptime(departure_date, "%Y-%m-%d") - now).days
+        next_check = now + timedelta(hours=refresh_interval_hours(days_out, volatility or 0))
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE watch_cells
+            SET last_checked = ?, next_check = ?, last_min_price = COALESCE(?, last_min_price), volatility = ?
+            WHERE origin = ? AND destination = ? AND departure_date = ?
+        ''', (now.strftime("%Y-%m-%d %H:%M:%S"), next_check.strftime("%Y-%m-%d %H:%M:%S"),
+              min_price, volatility or 0, origin, destination, departure_date))
+        notifications = []
+        if min_price is not None:
+            notifications = self.evaluate(cursor, origin, destination, departure_date, min_price, best_vpm)
+        conn.commit()
+        conn.close()
+
+        get_metrics().inc("watch_cells_refreshed_total")
+        if notifications:
+            get_metrics().inc("watch_notifications_total", len(notifications))
+            with open(self.outbox_path, 'a') as f:
+                for notification in notifications:
+                    f.write(json.dumps(dict(notification, created_at=now.isoformat())) + '\n')
+            log_event(logger, logging.INFO, "watch_notifications", origin=origin, destination=destination,
+                      departure_date=departure_date, count=len(notifications))
+        return notifications
+
+    def run(self, poll_seconds=60, max_requests_per_tick=10, once=False):
+        if self.searcher is None:
+            self.searcher = AmadeusFlightSearch(self.db_path)
+
+        log_event(logger, logging.INFO, "watcher_started", active_watches=len(self.list_rules()))
+        while True:
+            cells = self.due_cells(max_requests_per_tick)
+            for cell in cells:
+                self.refresh_cell(*cell)
+            get_metrics().write_prometheus()
+            if once:
+                return
+            time.sleep(poll_seconds)
+
+
+def print_rules(watcher):
+    rules = watcher.list_rules()
+    if not rules:
+        print("No active watches")
+        return
+
+    print(f"\nActive Watches ({len(rules)}):")
+    print("=" * 60)
+    for rule_id, origin, destination, start, end, max_price, min_vpm in rules:
+        conditions = []
+        if max_price is not None:
+            conditions.append(f"price < {max_price:.2f}")
+        if min_vpm is not None:
+            conditions.append(f"VPM > {min_vpm:.2f}")
+        print(f"#{rule_id} {origin} → {destination} | {start} to {end} | {' or '.join(conditions)}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    watcher = PriceWatcher()
+    command = argv[0].lower() if argv else "run"
+    args = argv[1:]
+
+    if command == "add":
+        if len(args) < 5:
+            print("Usage: add ORIGIN DESTINATION START_DATE END_DATE MAX_PRICE [MIN_VPM]  (use - to skip a threshold)")
+            return
+        max_price = float(args[4]) if args[4] != "-" else None
+        min_vpm = float(args[5]) if len(args) > 5 and args[5] != "-" else None
+        watcher.add_rule(args[0].upper(), args[1].upper(), args[2], args[3], max_price, min_vpm)
+    elif command == "remove":
+        if not args or not args[0].isdigit():
+            print("Usage: remove RULE_ID  (see list for ids)")
+            return
+        watcher.remove_rule(int(args[0]))
+    elif command == "list":
+        print_rules(watcher)
+    elif command == "run":
+        if os.getenv("METRICS_PORT"):
+            get_metrics().start_http_server(int(os.getenv("METRICS_PORT")))
+        watcher.run(once="--once" in args)
+    else:
+        print("Unknown command. Available: add, remove, list, run [--once]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+from datetime import datetime
+from dataclasses import dataclass
+from .itineraries import itinerary_fingerprint
+
+
+@dataclass(slots=True)
+class OfferSegment:
+    carrier: str
+    number: str
+    origin: str
+    destination: str
+    departure_time: str
+    arrival_time: str
+
+
+@dataclass(slots=True)
+class Offer:
+    offer_id: str
+    price: float
+    currency: str
+    itineraries: tuple
+
+    @classmethod
+    def from_api(cls, offer):
+        # Parsed once at the API boundary; None for offers without an itinerary
+        if not offer.get('itineraries'):
+            return None
+        itineraries = tuple(
+            tuple(OfferSegment(s['carrierCode'], s['number'], s['departure']['iataCode'], s['arrival']['iataCode'],
+                               s['departure']['at'], s['arrival']['at'])
+                  for s in itinerary['segments'])
+            for itinerary in offer['itineraries']
+        )
+        return cls(offer['id'], float(offer['price']['total']), offer['price']['currency'], itineraries)
+
+    @property
+    def segments(self):
+        # The first itinerary is the one that is priced and routed
+        return self.itineraries[0]
+
+    @property
+    def origin(self):
+        return self.segments[0].origin
+
+    @property
+    def destination(self):
+        return self.segments[-1].destination
+
+    @property
+    def carrier(self):
+        return self.segments[0].carrier
+
+    @property
+    def departure_date(self):
+        return self.segments[0].departure_time[:10]
+
+    @property
+    def fingerprint(self):
+        # Covers every itinerary, in the order the segments are stored
+        return itinerary_fingerprint(
+            (s.carrier, s.number, s.origin, s.destination, s.departure_time, s.arrival_time)
+            for itinerary in self.itineraries for s in itinerary
+        )
+
+
+@dataclass(slots=True)
+class Segment:
+    carrier: str
+    flight_number: str
+    origin: str
+    destination: str
+    departure: datetime
+    arrival: datetime
+    dep_minute: float
+    arr_minute: float
+    price: float
+
+
+@dataclass(slots=True)
+class Recommendation:
+    origin: str
+    destination: str
+    type: str
+    cash_price: float
+    miles_used: int
+    fees: float
+    value_per_mile: float
+    category: str
+    airline: str
+    flight_number: str
+    departure_time: str
+    arrival_time: str
+    duration: str
+    layover: str = None
+    layover_duration: str = None
+    route_display: str = None
+    savings: float = 0.0
+    savings_percentage: float = 0.0
+    cash_equivalent: float = 0.0
+    complexity_score: int = 0
+    recommendation_reason: str = None
+    expert_status: str = None
+    expert_average: float = None
+    top_percent: float = None
+    transfer_currency: str = None
+    transfer_points: int = None
+    outbound: "Recommendation" = None
+    inbound: "Recommendation" = None
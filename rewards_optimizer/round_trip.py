@@ -0,0 +1,89 @@
+import heapq
+from .connection_search import get_value_category
+from .records import Recommendation
+
+# Bound on pairs examined when caps reject the best-scoring combinations
+MAX_POPS_PER_RESULT = 50
+
+
+def _score(option, rank_by):
+    # Heap pops the smallest score first: cheapest price, or largest savings
+    if rank_by == 'price':
+        return option.cash_price
+    return -(option.cash_price - option.fees)
+
+
+def _combined_value(out_leg, in_leg):
+    # Value of the trip as combine_round_trip reports it, from the rounded totals
+    cash_price = round(out_leg.cash_price + in_leg.cash_price, 2)
+    miles_used = out_leg.miles_used + in_leg.miles_used
+    fees = round(out_leg.fees + in_leg.fees, 2)
+    return round((cash_price - fees) * 100 / miles_used, 3) if miles_used else 0.0
+
+
+def top_k_round_trips(outbound, inbound, k=10, rank_by='value', max_miles=None, max_fees=None, min_value=None):
+    def within_caps(miles_used, fees):
+        return ((max_miles is None or miles_used <= max_miles)
+                and (max_fees is None or fees <= max_fees))
+
+    outbound = sorted((o for o in outbound if within_caps(o.miles_used, o.fees)), key=lambda o: _score(o, rank_by))
+    inbound = sorted((o for o in inbound if within_caps(o.miles_used, o.fees)), key=lambda o: _score(o, rank_by))
+    if not outbound or not inbound:
+        return []
+
+    # Sorted-merge frontier: (i, j) is only pushed once (i-1, j) or (i, j-1) is popped
+    frontier = [(_score(outbound[0], rank_by) + _score(inbound[0], rank_by), 0, 0)]
+    seen = {(0, 0)}
+    pairs = []
+    pops = 0
+
+    while frontier and len(pairs) < k and pops < k * MAX_POPS_PER_RESULT:
+        _, i, j = heapq.heappop(frontier)
+        pops += 1
+        out_leg, in_leg = outbound[i], inbound[j]
+        # The value floor is a pair property, so it is checked here rather than on
+        # the top k, where it would leave fewer than k trips
+        if (within_caps(out_leg.miles_used + in_leg.miles_used, out_leg.fees + in_leg.fees)
+                and (min_value is None or _combined_value(out_leg, in_leg) >= min_value)):
+            pairs.append((out_leg, in_leg))
+
+        for ni, nj in ((i + 1, j), (i, j + 1)):
+            if ni < len(outbound) and nj < len(inbound) and (ni, nj) not in seen:
+                seen.add((ni, nj))
+                heapq.heappush(frontier, (_score(outbound[ni], rank_by) + _score(inbound[nj], rank_by), ni, nj))
+
+    return pairs
+
+
+def combine_round_trip(out_leg, in_leg):
+    cash_price = round(out_leg.cash_price + in_leg.cash_price, 2)
+    miles_used = out_leg.miles_used + in_leg.miles_used
+    fees = round(out_leg.fees + in_leg.fees, 2)
+    value_per_mile = _combined_value(out_leg, in_leg)
+    savings = round(cash_price - fees, 2)
+
+    return Recommendation(
+        origin=out_leg.origin,
+        destination=out_leg.destination,
+        type='round trip',
+        cash_price=cash_price,
+        miles_used=miles_used,
+        fees=fees,
+        value_per_mile=value_per_mile,
+        category=get_value_category(value_per_mile),
+        airline=out_leg.airline,
+        flight_number=f"{out_leg.flight_number} | {in_leg.flight_number}",
+        departure_time=out_leg.departure_time,
+        arrival_time=in_leg.arrival_time,
+        duration=f"{out_leg.duration} + {in_leg.duration}",
+        layover=', '.join(l for l in (out_leg.layover, in_leg.layover) if l) or None,
+        layover_duration=', '.join(l for l in (out_leg.layover_duration, in_leg.layover_duration) if l) or None,
+        route_display=f"{out_leg.route_display} | {in_leg.route_display}",
+        savings=savings,
+        savings_percentage=round(savings * 100 / cash_price, 1) if cash_price else 0.0,
+        cash_equivalent=round(miles_used / 100, 2),
+        complexity_score=out_leg.complexity_score + in_leg.complexity_score,
+        recommendation_reason=f"Out: {out_leg.recommendation_reason}; back: {in_leg.recommendation_reason}",
+        outbound=out_leg,
+        inbound=in_leg
+    )
@@ -0,0 +1,71 @@
+import uuid
+import logging
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from .structured_log import get_logger, log_event
+
+logger = get_logger("search_jobs")
+
+
+class SearchJob:
+    def __init__(self, stages):
+        self.job_id = uuid.uuid4().hex[:8]
+        self.stage_names = [name for name, _ in stages]
+        self.completed_stages = []
+        self.status = "queued"
+        self.error = None
+        self.results = []
+        self.started_at = datetime.now()
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def run(self, stages):
+        self.status = "running"
+        name = None
+        try:
+            # Each stage returns the full result set at its depth, so later
+            # stages refine what earlier ones already published
+            for name, stage in stages:
+                results = stage()
+                with self._lock:
+                    self.results = results
+                    self.completed_stages.append(name)
+            self.status = "done"
+        except Exception as e:
+            self.error = str(e)
+            self.status = "failed"
+            log_event(logger, logging.ERROR, "search_job_failed", job_id=self.job_id, stage=name, error=str(e))
+        finally:
+            self.finished_at = datetime.now()
+
+    def snapshot(self):
+        with self._lock:
+            return self.results, list(self.completed_stages)
+
+    @property
+    def running(self):
+        return self.status in ("queued", "running")
+
+
+class SearchJobRunner:
+    def __init__(self, max_workers=4, max_jobs=50):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search-job")
+        self.max_jobs = max_jobs
+        self.jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, stages):
+        job = SearchJob(stages)
+        with self._lock:
+            self.jobs[job.job_id] = job
+            # Forget the oldest finished jobs so long-lived servers stay bounded
+            finished = [j for j in self.jobs.values() if not j.running]
+            for old in sorted(finished, key=lambda j: j.started_at)[:max(0, len(self.jobs) - self.max_jobs)]:
+                del self.jobs[old.job_id]
+        self.executor.submit(job.run, stages)
+        return job.job_id
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
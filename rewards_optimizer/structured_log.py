@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+
+ROOT_LOGGER = "flights"
+# LOG_LEVEL=WARNING is the quiet production mode; per-offer events are DEBUG
+LOG_LEVEL_ENV = "LOG_LEVEL"
+LOG_FORMAT_ENV = "LOG_FORMAT"
+LOG_FILE_ENV = "LOG_FILE"
+LOG_SAMPLE_RATE_ENV = "LOG_SAMPLE_RATE"
+DEFAULT_SAMPLE_RATE = 0.01
+
+_listener = None
+_sample_rate = DEFAULT_SAMPLE_RATE
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'event': record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    # Same-process queue: hand the record over untouched and let the
+    # listener thread do all formatting, including tracebacks
+    def prepare(self, record):
+        return record
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        fields = " ".join(f"{k}={v}" for k, v in getattr(record, 'fields', {}).items())
+        line = f"{datetime.fromtimestamp(record.created).strftime('%H:%M:%S')} {record.levelname:<7} {record.getMessage()}"
+        return f"{line} {fields}" if fields else line
+
+
+def configure_logging(level=None, fmt=None, log_file=None, sample_rate=None):
+    global _listener, _sample_rate
+    if _listener is not None:
+        _listener.stop()
+
+    level = (level or os.getenv(LOG_LEVEL_ENV, "INFO")).upper()
+    fmt = fmt or os.getenv(LOG_FORMAT_ENV, "json")
+    log_file = log_file or os.getenv(LOG_FILE_ENV)
+    _sample_rate = float(sample_rate if sample_rate is not None else os.getenv(LOG_SAMPLE_RATE_ENV, DEFAULT_SAMPLE_RATE))
+
+    formatter = JsonFormatter() if fmt == "json" else TextFormatter()
+    handlers = [logging.StreamHandler(sys.stderr)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # Callers only enqueue; formatting and I/O happen on the listener thread
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger(ROOT_LOGGER)
+    root.handlers = [DeferredQueueHandler(log_queue)]
+    root.setLevel(level)
+    root.propagate = False
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return root
+
+
+def shutdown_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def get_logger(name):
+    if _listener is None:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def log_event(logger, level, event, sample=False, **fields):
+    # Level and sampling are checked before a record is built, so disabled
+    # and sampled-out events cost one comparison
+    if not logger.isEnabledFor(level):
+        return
+    if sample and random.random() >= _sample_rate:
+        return
+    logger.log(level, event, extra={'fields': fields})
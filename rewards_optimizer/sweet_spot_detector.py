@@ -0,0 +1,193 @@
+import os
+import json
+import math
+import logging
+import sqlite3
+from .structured_log import get_logger, log_event
+
+logger = get_logger("sweet_spots")
+ALERTS_FILENAME = "sweet_spot_alerts.jsonl"
+
+
+def default_alerts_path(db_path):
+    # Alongside the database, so every process writing to it shares one file
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), ALERTS_FILENAME)
+
+
+class EWMAStat:
+    def __init__(self, mean=0.0, var=0.0, count=0):
+        self.mean = mean
+        self.var = var
+        self.count = count
+
+    def sigmas(self, value):
+        std = math.sqrt(self.var)
+        if std == 0:
+            return 0.0
+        return (value - self.mean) / std
+
+    def update(self, value, alpha):
+        if self.count == 0:
+            self.mean = value
+            self.var = 0.0
+        else:
+            diff = value - self.mean
+            increment = alpha * diff
+            self.mean += increment
+            self.var = (1 - alpha) * (self.var + diff * increment)
+        self.count += 1
+
+
+class SweetSpotDetector:
+    # Higher VPM is better; lower cash price is better
+    DIRECTIONS = {'vpm': 1, 'cash_price': -1}
+
+    def __init__(self, db_path="flight_offers.db", alpha=0.1, threshold=2.5, min_observations=10, jsonl_path=None):
+        self.db_path = db_path
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_observations = min_observations
+        self.jsonl_path = jsonl_path
+        self.stats = {}
+        self.pending_values = {}
+        self.pending_alerts = []
+        self.init_tables()
+        self.load()
+
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def init_tables(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS route_ewma_stats (
+                route TEXT,
+                metric TEXT,
+                mean REAL,
+                var REAL,
+                count INTEGER,
+                PRIMARY KEY (route, metric)
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sweet_spot_alerts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                search_id TEXT,
+                offer_id TEXT,
+                route TEXT,
+                departure_date DATE,
+                metric TEXT,
+                value REAL,
+                route_mean REAL,
+                route_std REAL,
+                sigmas REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def load(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT route, metric, mean, var, count FROM route_ewma_stats")
+        self.stats = {(route, metric): EWMAStat(mean, var, count) for route, metric, mean, var, count in cursor.fetchall()}
+        conn.close()
+
+    def observe(self, search_id, offer_id, origin, destination, departure_date, cash_price, vpm=None):
+        route = f"{origin}-{destination}"
+        alerts = []
+        for metric, value in (('cash_price', cash_price), ('vpm', vpm)):
+            if value is None:
+                continue
+            stat = self.stats.get((route, metric))
+            if stat is None:
+                stat = self.stats[(route, metric)] = EWMAStat()
+
+            # Score against the state before this offer so it cannot mask itself
+            if stat.count >= self.min_observations:
+                sigmas = stat.sigmas(value) * self.DIRECTIONS[metric]
+                if sigmas >= self.threshold:
+                    alerts.append({
+                        'search_id': search_id,
+                        'offer_id': offer_id,
+                        'route': route,
+                        'departure_date': departure_date,
+                        'metric': metric,
+                        'value': round(value, 4),
+                        'route_mean': round(stat.mean, 4),
+                        'route_std': round(math.sqrt(stat.var), 4),
+                        'sigmas': round(sigmas, 2)
+                    })
+            stat.update(value, self.alpha)
+            self.pending_values.setdefault((route, metric), []).append(value)
+
+        self.pending_alerts.extend(alerts)
+        return alerts
+
+    def save(self, cursor=None):
+        conn = None
+        if cursor is None:
+            conn = self.connect()
+            cursor = conn.cursor()
+            # Take the write lock before reading, so no other writer lands in between
+            cursor.execute("BEGIN IMMEDIATE")
+
+        # Other processes update the same routes, so this batch's values are
+        # replayed onto each touched route's stored state rather than
+        # overwriting it with this process's copy
+        updates = self.pending_values
+        self.pending_values = {}
+        rows = []
+        for (route, metric), values in updates.items():
+            cursor.execute("SELECT mean, var, count FROM route_ewma_stats WHERE route = ? AND metric = ?", (route, metric))
+            stored = cursor.fetchone()
+            stat = EWMAStat(*stored) if stored else EWMAStat()
+            for value in values:
+                stat.update(value, self.alpha)
+            self.stats[(route, metric)] = stat
+            rows.append((route, metric, stat.mean, stat.var, stat.count))
+
+        cursor.executemany('''
+            INSERT INTO route_ewma_stats (route, metric, mean, var, count)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (route, metric) DO UPDATE SET
+                mean = excluded.mean, var = excluded.var, count = excluded.count
+        ''', rows)
+
+        alerts = self.pending_alerts
+        self.pending_alerts = []
+        cursor.executemany('''
+            INSERT INTO sweet_spot_alerts (search_id, offer_id, route, departure_date, metric, value, route_mean, route_std, sigmas)
+            VALUES (:search_id, :offer_id, :route, :departure_date, :metric, :value, :route_mean, :route_std, :sigmas)
+        ''', alerts)
+
+        if conn is not None:
+            conn.commit()
+            conn.close()
+
+        if alerts and self.jsonl_path:
+            with open(self.jsonl_path, 'a') as f:
+                for alert in alerts:
+                    f.write(json.dumps(alert) + '\n')
+
+        if alerts:
+            log_event(logger, logging.INFO, "sweet_spots_flagged", count=len(alerts))
+        return alerts
+
+    def recent_alerts(self, limit=20):
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT created_at, route, departure_date, metric, value, route_mean, sigmas
+            FROM sweet_spot_alerts
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (limit,))
+        alerts = cursor.fetchall()
+        conn.close()
+        return alerts
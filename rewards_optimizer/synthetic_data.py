@@ -0,0 +1,293 @@
+import os
+import time
+import sqlite3
+import argparse
+import numpy as np
+from datetime import datetime, timezone
+from .airport_distances import get_airport_index
+from .award_charts import get_award_chart_engine
+
+CARRIERS = ["AA", "UA", "DL", "AS", "B6", "BA"]
+CARRIER_WEIGHTS = [0.26, 0.24, 0.26, 0.1, 0.08, 0.06]
+HUBS = ["ATL", "ORD", "DFW", "DEN", "LAX", "JFK", "SFO", "SEA", "IAH", "CLT", "EWR", "MIA", "LHR"]
+# Hubs see the most traffic, then the rest of the US, then everything else
+HUB_WEIGHT = 4.0
+US_WEIGHT = 2.0
+STOP_WEIGHTS = [0.6, 0.32, 0.08]
+MAX_SEGMENTS = len(STOP_WEIGHTS)
+AWARD_SHARE = 1 / 3
+# flights1 columns copied into offer_observations, in insert order
+OBSERVATION_COLUMNS = ('id', 'search_id', 'offer_id', 'total_price', 'currency', 'reporting_price', 'miles_used', 'fees',
+                       'reporting_fees', 'value_per_mile')
+
+CRUISE_MPH = 480
+TAXI_MINUTES = 35
+MIN_CONNECT_MINUTES = 45
+MAX_CONNECT_MINUTES = 240
+# Cash fare ~ base + per-mile rate, discounted per stop, with lognormal spread
+BASE_FARE = 45.0
+FARE_PER_MILE = 0.12
+STOP_DISCOUNT = 0.88
+FARE_SIGMA = 0.35
+BATCH_ROWS = 100000
+
+
+class SyntheticOfferGenerator:
+    def __init__(self, seed=42, start_date="2025-08-01", days=90, carriers=CARRIERS,
+                 carrier_weights=CARRIER_WEIGHTS, award_share=AWARD_SHARE):
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.start = np.datetime64(start_date, 'm')
+        self.days = days
+        self.carriers = np.array(carriers)
+        self.carrier_weights = np.array(carrier_weights) / np.sum(carrier_weights)
+        self.award_share = award_share
+
+        airports = get_airport_index()
+        self.codes = airports.codes
+        weights = np.where(np.isin(self.codes, HUBS), HUB_WEIGHT, np.where(airports.regions == "US", US_WEIGHT, 1.0))
+        self.airport_weights = weights / weights.sum()
+        self.hubs = np.flatnonzero(np.isin(self.codes, HUBS))
+
+        # Every pair is looked up millions of times, so precompute the whole matrix
+        n = len(self.codes)
+        origins, destinations = np.meshgrid(self.codes, self.codes, indexing='ij')
+        self.distances = airports.distances_miles(origins.ravel(), destinations.ravel()).reshape(n, n)
+        self.offers_generated = 0
+
+    def batch(self, count):
+        rng = self.rng
+        n_airports = len(self.codes)
+
+        origin = rng.choice(n_airports, count, p=self.airport_weights)
+        destination = rng.choice(n_airports, count, p=self.airport_weights)
+        clash = destination == origin
+        destination[clash] = (destination[clash] + rng.integers(1, n_airports, clash.sum())) % n_airports
+
+        # Connecting hubs must not repeat an airport already on the path
+        stops = rng.choice(MAX_SEGMENTS, count, p=STOP_WEIGHTS)
+        hub1 = rng.choice(self.hubs, count)
+        hub2 = rng.choice(self.hubs, count)
+        stops[(stops >= 1) & ((hub1 == origin) | (hub1 == destination))] = 0
+        stops[(stops == 2) & ((hub2 == origin) | (hub2 == destination) | (hub2 == hub1))] = 1
+
+        path = np.full((count, MAX_SEGMENTS + 1), -1)
+        path[:, 0] = origin
+        path[:, 1] = np.where(stops >= 1, hub1, destination)
+        path[:, 2] = np.where(stops == 2, hub2, np.where(stops == 1, destination, -1))
+        path[:, 3] = np.where(stops == 2, destination, -1)
+        present = np.arange(MAX_SEGMENTS) <= stops[:, None]
+
+        legs_from = path[:, :-1]
+        legs_to = path[:, 1:]
+        leg_miles = np.where(present, self.distances[np.maximum(legs_from, 0), np.maximum(legs_to, 0)], 0.0)
+        block = np.round((TAXI_MINUTES + leg_miles / CRUISE_MPH * 60) / 5) * 5
+        connect = rng.integers(MIN_CONNECT_MINUTES // 5, MAX_CONNECT_MINUTES // 5 + 1, (count, MAX_SEGMENTS)) * 5
+
+        first_departure = rng.integers(0, self.days, count) * 1440 + rng.integers(5 * 12, 22 * 12, count) * 5
+        departure = np.zeros((count, MAX_SEGMENTS), dtype=np.int64)
+        arrival = np.zeros((count, MAX_SEGMENTS), dtype=np.int64)
+        departure[:, 0] = first_departure
+        arrival[:, 0] = first_departure + block[:, 0]
+        for k in range(1, MAX_SEGMENTS):
+            departure[:, k] = arrival[:, k - 1] + connect[:, k]
+            arrival[:, k] = departure[:, k] + block[:, k]
+
+        carrier = rng.choice(self.carriers, count, p=self.carrier_weights)
+        direct_miles = self.distances[origin, destination]
+        cash = ((BASE_FARE + FARE_PER_MILE * direct_miles) * STOP_DISCOUNT ** stops
+                * rng.lognormal(0.0, FARE_SIGMA, count))
+        cash = np.round(cash, 2)
+
+        # Award rows follow the ingest convention: miles from the carrier's
+        # chart, 10% of the cash fare as fees, the cash column zeroed, and VPM
+        # from the 90% of the fare the fees leave
+        award = rng.random(count) < self.award_share
+        chart_miles = get_award_chart_engine().price_batch(carrier, self.codes[origin], self.codes[destination])
+
+        first_id = self.offers_generated + 1
+        self.offers_generated += count
+        return {
+            'offer_id': np.arange(first_id, first_id + count).astype(str),
+            'origin': self.codes[origin],
+            'destination': self.codes[destination],
+            'cash_price': cash,
+            'total_price': np.where(award, 0.0, cash),
+            'miles_used': np.where(award, chart_miles, 0),
+            'fees': np.where(award, np.round(cash * 0.1, 2), 0.0),
+            'value_per_mile': np.where(award, cash * 0.9 * 100 / np.maximum(chart_miles, 1), np.nan),
+            'award': award,
+            'carrier': carrier,
+            'segment_count': stops + 1,
+            'segment_present': present,
+            'segment_from': self.codes[np.maximum(legs_from, 0)],
+            'segment_to': self.codes[np.maximum(legs_to, 0)],
+            'flight_number': rng.integers(100, 10000, (count, MAX_SEGMENTS)).astype(str),
+            'departure_time': (self.start + departure.astype('timedelta64[m]')).astype('datetime64[s]').astype(str),
+            'arrival_time': (self.start + arrival.astype('timedelta64[m]')).astype('datetime64[s]').astype(str)
+        }
+
+    def to_offers(self, batch):
+        # Amadeus-shaped offers for code paths that only accept API responses
+        offers = []
+        for i in range(len(batch['offer_id'])):
+            segments = [{
+                "carrierCode": batch['carrier'][i],
+                "number": batch['flight_number'][i, k],
+                "departure": {"iataCode": batch['segment_from'][i, k], "at": batch['departure_time'][i, k]},
+                "arrival": {"iataCode": batch['segment_to'][i, k], "at": batch['arrival_time'][i, k]}
+            } for k in range(batch['segment_count'][i])]
+            offers.append({
+                "id": batch['offer_id'][i],
+                "itineraries": [{"segments": segments}],
+                "price": {"total": f"{batch['cash_price'][i]:.2f}", "currency": "USD"}
+            })
+        return offers
+
+    def offers(self, count):
+        return self.to_offers(self.batch(count))
+
+
+def batch_tables(batch, first_flight_id, search_id):
+    count = len(batch['offer_id'])
+    flight_ids = np.arange(first_flight_id, first_flight_id + count)
+    flights = {
+        'id': flight_ids,
+        'search_id': np.full(count, search_id),
+        'offer_id': batch['offer_id'],
+        'origin': batch['origin'],
+        'destination': batch['destination'],
+        'departure_date': np.char.ljust(batch['departure_time'][:, 0], 10).astype('U10'),
+        'total_price': batch['total_price'],
+        'currency': np.full(count, "USD"),
+        'miles_used': batch['miles_used'],
+        'fees': batch['fees'],
+        # Synthetic fares are quoted in USD, so they are already in the reporting currency
+        'reporting_price': batch['total_price'],
+        'reporting_fees': batch['fees'],
+        # NaN binds as NULL, like the cash rows written at ingest
+        'value_per_mile': batch['value_per_mile']
+    }
+
+    # Row-major flattening keeps segments grouped by flight, in order
+    present = batch['segment_present'].ravel()
+    segments = {
+        'flight_id': np.repeat(flight_ids, MAX_SEGMENTS)[present],
+        'carrier_code': np.repeat(batch['carrier'], MAX_SEGMENTS)[present],
+        'flight_number': batch['flight_number'].ravel()[present],
+        'departure_iata': batch['segment_from'].ravel()[present],
+        'arrival_iata': batch['segment_to'].ravel()[present],
+        'departure_time': batch['departure_time'].ravel()[present],
+        'arrival_time': batch['arrival_time'].ravel()[present],
+        'segment_order': np.tile(np.arange(1, MAX_SEGMENTS + 1), count)[present]
+    }
+    return flights, segments
+
+
+def _rows(columns):
+    return zip(*(values.tolist() for values in columns.values()))
+
+
+def write_sqlite(generator, rows, db_path="flight_offers.db", batch_rows=BATCH_ROWS, connections=False):
+    from .fetch import FlightDatabase
+
+    db = FlightDatabase(db_path)
+    conn = sqlite3.connect(db_path)
+    # Bulk load: one transaction per batch, no fsync between them
+    conn.execute("PRAGMA synchronous = OFF")
+    cursor = conn.cursor()
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM flights1")
+    next_id = cursor.fetchone()[0] + 1
+    search_id = f"synthetic-{generator.seed}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+    written = 0
+    while written < rows:
+        batch = generator.batch(min(batch_rows, rows - written))
+        flights, segments = batch_tables(batch, next_id, search_id)
+        # One timestamp per batch, so its observations and history snapshot line up
+        # even when the insert runs past a second boundary
+        observed_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        cursor.executemany(f'''
+            INSERT INTO flights1 ({", ".join(flights)}) VALUES ({", ".join("?" * len(flights))})
+        ''', _rows(flights))
+        cursor.executemany(f'''
+            INSERT INTO flight_segments1 ({", ".join(segments)}) VALUES ({", ".join("?" * len(segments))})
+        ''', _rows(segments))
+        # Generated offers are independent draws, so they skip fingerprinting and
+        # stay one itinerary each; their quotes are still recorded as observations
+        cursor.executemany('''
+            INSERT INTO offer_observations (flight_id, search_id, offer_id, total_price, currency,
+                                            reporting_price, miles_used, fees, reporting_fees, value_per_mile,
+                                            observed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', _rows(dict({name: flights[name] for name in OBSERVATION_COLUMNS},
+                        observed_at=np.full(len(batch['offer_id']), observed_at))))
+
+        # Keep the aggregates the ingest path maintains in step with the bulk load
+        award = batch['award']
+        vpm = batch['value_per_mile']
+        db.sketches.update(zip(batch['origin'][award].tolist(), batch['destination'][award].tolist(),
+                               vpm[award].tolist()), cursor)
+        award_vpm = np.where(award, vpm, np.nan)
+        route = (flights['origin'], flights['destination'], flights['departure_date'])
+        db.calendar.observe_batch(*route, batch['cash_price'], award_vpm, cursor)
+        db.history.observe_batch(*route, batch['cash_price'], award_vpm, cursor, observed_at)
+        if connections:
+            db.connections.refresh(cursor)
+
+        conn.commit()
+        next_id += len(batch['offer_id'])
+        written += len(batch['offer_id'])
+        print(f"Wrote {written:,}/{rows:,} offers")
+
+    conn.close()
+    return written
+
+
+def write_parquet(generator, rows, out_dir, batch_rows=BATCH_ROWS):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("Parquet output needs pyarrow: pip install pyarrow")
+        return 0
+
+    os.makedirs(out_dir, exist_ok=True)
+    search_id = f"synthetic-{generator.seed}"
+    written = 0
+    part = 0
+    while written < rows:
+        batch = generator.batch(min(batch_rows, rows - written))
+        flights, segments = batch_tables(batch, written + 1, search_id)
+        pq.write_table(pa.table(flights), os.path.join(out_dir, f"flights-{part:05d}.parquet"))
+        pq.write_table(pa.table(segments), os.path.join(out_dir, f"segments-{part:05d}.parquet"))
+        written += len(batch['offer_id'])
+        part += 1
+        print(f"Wrote {written:,}/{rows:,} offers")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic flight offers")
+    parser.add_argument("target", choices=["db", "parquet"])
+    parser.add_argument("path", help="SQLite database file or Parquet output directory")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start-date", default="2025-08-01")
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS)
+    parser.add_argument("--connections", action="store_true", help="Also refresh the hub connection index (slow)")
+    args = parser.parse_args(argv)
+
+    generator = SyntheticOfferGenerator(args.seed, args.start_date, args.days)
+    start = time.perf_counter()
+    if args.target == "db":
+        written = write_sqlite(generator, args.rows, args.path, args.batch_rows, args.connections)
+    else:
+        written = write_parquet(generator, args.rows, args.path, args.batch_rows)
+    elapsed = time.perf_counter() - start
+    if written:
+        print(f"Generated {written:,} offers in {elapsed:.1f}s ({written / elapsed * 60:,.0f} offers/min)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import logging
+import os
+import csv
+import sqlite3
+import numpy as np
+from .structured_log import get_logger, log_event
+
+logger = get_logger("transfer_partners")
+
+DEFAULT_PARTNERS_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "transfer_partners.csv")
+
+# Precomputed all-pairs best paths keyed by db path
+_graph_cache = {}
+
+
+class TransferPartnerGraph:
+    def __init__(self, db_path="flight_offers.db", csv_path=DEFAULT_PARTNERS_CSV):
+        self.db_path = db_path
+        self.csv_path = csv_path
+        self.init_table()
+        self.best_paths = self.load()
+        self._source_cache = {}
+
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def init_table(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS transfer_partners (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                from_currency TEXT,
+                to_program TEXT,
+                ratio REAL,
+                minimum_transfer INTEGER,
+                UNIQUE (from_currency, to_program)
+            )
+        ''')
+
+        cursor.execute("SELECT COUNT(*) FROM transfer_partners")
+        is_empty = cursor.fetchone()[0] == 0
+
+        conn.commit()
+        conn.close()
+
+        if is_empty and self.csv_path and os.path.exists(self.csv_path):
+            self.load_from_csv(self.csv_path)
+
+    def load_from_csv(self, csv_path):
+        with open(csv_path, newline='') as f:
+            rows = [
+                (row['from_currency'].strip().upper(), row['to_program'].strip().upper(),
+                 float(row['ratio']), int(row['minimum_transfer']))
+                for row in csv.DictReader(f)
+            ]
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT OR REPLACE INTO transfer_partners (from_currency, to_program, ratio, minimum_transfer)
+            VALUES (?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+        conn.close()
+
+        _graph_cache.pop(self.db_path, None)
+        log_event(logger, logging.INFO, "transfer_partners_loaded", count=len(rows), csv_path=csv_path)
+        return len(rows)
+
+    def load(self):
+        cached = _graph_cache.get(self.db_path)
+        if cached is not None:
+            return cached
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT from_currency, to_program, ratio, minimum_transfer FROM transfer_partners")
+        edges = cursor.fetchall()
+        conn.close()
+
+        best_paths = compute_best_paths(edges)
+        _graph_cache[self.db_path] = best_paths
+        return best_paths
+
+    def best_sources(self, holdings):
+        # program -> cheapest (currency, cost, minimum, path) for this set of holdings
+        key = frozenset(holdings)
+        if key in self._source_cache:
+            return self._source_cache[key]
+
+        sources = {}
+        for (currency, program), route in self.best_paths.items():
+            if currency not in key:
+                continue
+            current = sources.get(program)
+            if current is None or route['cost'] < current['cost']:
+                sources[program] = dict(route, currency=currency)
+        self._source_cache[key] = sources
+        return sources
+
+    def price_redemptions(self, programs, miles, cash_prices, fees, holdings):
+        sources = self.best_sources(holdings)
+        matches = [sources.get(program) for program in programs]
+
+        cost = np.array([m['cost'] if m else np.nan for m in matches], dtype=float)
+        minimum = np.array([m['minimum'] if m else 0 for m in matches], dtype=float)
+        miles = np.asarray(miles, dtype=float)
+        # A transfer below the partner's minimum still spends the minimum
+        source_points = np.maximum(np.ceil(miles * cost), minimum)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            value = (np.asarray(cash_prices, dtype=float) - np.asarray(fees, dtype=float)) * 100 / source_points
+
+        results = []
+        for match, points, vpm in zip(matches, source_points, value):
+            if match is None:
+                results.append({'currency': None, 'source_points': None, 'source_value_per_mile': None,
+                                'minimum_transfer': None, 'path': None})
+                continue
+            results.append({
+                'currency': match['currency'],
+                'source_points': int(points),
+                'source_value_per_mile': round(float(vpm), 3),
+                'minimum_transfer': match['minimum'],
+                'path': match['path']
+            })
+        return results
+
+
+def compute_best_paths(edges):
+    # Floyd-Warshall over cost = source points spent per program mile received
+    best = {}
+    nodes = set()
+    for from_currency, to_program, ratio, minimum in edges:
+        if ratio <= 0:
+            continue
+        nodes.update((from_currency, to_program))
+        route = {'cost': 1.0 / ratio, 'minimum': minimum, 'path': [from_currency, to_program]}
+        current = best.get((from_currency, to_program))
+        if current is None or route['cost'] < current['cost']:
+            best[(from_currency, to_program)] = route
+
+    for node in nodes:
+        best[(node, node)] = {'cost': 1.0, 'minimum': 0, 'path': [node]}
+
+    for via in nodes:
+        for start in nodes:
+            first = best.get((start, via))
+            if first is None or start == via:
+                continue
+            for end in nodes:
+                second = best.get((via, end))
+                if second is None or via == end:
+                    continue
+                cost = first['cost'] * second['cost']
+                current = best.get((start, end))
+                if current is None or cost < current['cost'] - 1e-9:
+                    best[(start, end)] = {
+                        'cost': cost,
+                        'minimum': max(first['minimum'], int(np.ceil(second['minimum'] * first['cost']))),
+                        'path': first['path'] + second['path'][1:]
+                    }
+    return best
@@ -0,0 +1,342 @@
+import sqlite3
+import sys
+from datetime import datetime
+from .price_calendar import PriceCalendar
+from .connection_index import HubConnectionIndex
+from .fx_rates import REPORTING_CURRENCY, ensure_reporting_prices
+from .itineraries import ensure_itineraries
+from .metrics import get_metrics, timed
+
+class FlightDataViewer:
+    def __init__(self, db_path="flight_offers.db"):
+        self.db_path = db_path
+
+    def check_database_exists(self):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT COUNT(*) FROM flights1")
+            flight_count = cursor.fetchone()[0]
+
+            cursor.execute("SELECT COUNT(*) FROM flight_segments1")
+            segment_count = cursor.fetchone()[0]
+
+            conn.close()
+
+            print(f"Database: {self.db_path}")
+            print(f"Flights: {flight_count}")
+            print(f"Segments: {segment_count}")
+            return flight_count > 0
+
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+
+    def needs_migration(self):
+        # Databases written before prices were normalized or itineraries were
+        # deduplicated; the viewer only reads, so upgrading is an explicit step
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA table_info(flights1)")
+        columns = [col[1] for col in cursor.fetchall()]
+        cursor.execute("PRAGMA table_info(offer_observations)")
+        observation_columns = [col[1] for col in cursor.fetchall()]
+        conn.close()
+        required = ('reporting_price', 'reporting_fees', 'value_per_mile', 'fingerprint')
+        return bool(columns) and not (all(name in columns for name in required)
+                                      and all(name in observation_columns for name in ('reporting_fees', 'value_per_mile')))
+
+    def migrate(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        converted = ensure_reporting_prices(cursor, self.db_path)
+        merged = ensure_itineraries(cursor)
+        conn.commit()
+        conn.close()
+        # Builds the hub connection index once the fares it splits are in USD
+        HubConnectionIndex(self.db_path)
+        print(f"Migrated {self.db_path}: {converted} prices converted to {REPORTING_CURRENCY}, "
+              f"{merged} duplicate itineraries merged")
+
+    @timed("viewer_query_seconds", query="searches")
+    def show_all_searches(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT o.search_id, f.departure_date, COUNT(*) as offer_count,
+                   MIN(o.reporting_price) as min_price, MAX(o.reporting_price) as max_price,
+                   MIN(o.observed_at) as created_at
+            FROM offer_observations o
+            JOIN flights1 f ON f.id = o.flight_id
+            GROUP BY o.search_id
+            ORDER BY created_at DESC
+        ''')
+
+        searches = cursor.fetchall()
+        conn.close()
+
+        if not searches:
+            print("No flight searches found in database")
+            return
+
+        print(f"\nAll Flight Searches ({len(searches)} total):")
+        print("=" * 80)
+
+        for search in searches:
+            search_id, dep_date, count, min_price, max_price, created = search
+            print(f"{created} | Search ID: {search_id} | {dep_date}")
+            print(f"{count} offers | Price: {min_price}-{max_price} {REPORTING_CURRENCY}")
+            print("-" * 50)
+
+    @timed("viewer_query_seconds", query="cheapest")
+    def show_cheapest_flights(self, limit=10):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT f.departure_date, f.reporting_price, f.total_price, f.currency,
+                   GROUP_CONCAT(fs.carrier_code || fs.flight_number || ':' || fs.departure_iata || '→' || fs.arrival_iata) as flights,
+                   f.created_at
+            FROM flights1 f
+            JOIN flight_segments1 fs ON f.id = fs.flight_id
+            WHERE f.reporting_price IS NOT NULL
+            GROUP BY f.id
+            ORDER BY f.reporting_price ASC
+            LIMIT ?
+        ''', (limit,))
+
+        flights = cursor.fetchall()
+        conn.close()
+
+        if not flights:
+            print("No flights found in database")
+            return
+
+        print(f"\nCheapest Flights (Top {len(flights)}):")
+        print("=" * 60)
+
+        for flight in flights:
+            dep_date, price, quoted, currency, flight_nums, created = flight
+            quote = f" ({quoted} {currency})" if currency and currency != REPORTING_CURRENCY else ""
+            print(f"{dep_date} | Price: {price:.2f} {REPORTING_CURRENCY}{quote}")
+            print(f"Flights: {flight_nums}")
+            print(f"Found: {created}")
+            print("-" * 40)
+
+    @timed("viewer_query_seconds", query="route")
+    def show_route_analysis(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT f.departure_date, COUNT(*) as offer_count,
+                   MIN(o.reporting_price) as min_price, MAX(o.reporting_price) as max_price,
+                   AVG(o.reporting_price) as avg_price
+            FROM offer_observations o
+            JOIN flights1 f ON f.id = o.flight_id
+            WHERE o.reporting_price IS NOT NULL
+            GROUP BY f.departure_date
+            ORDER BY f.departure_date
+        ''')
+
+        results = cursor.fetchall()
+        conn.close()
+
+        if not results:
+            print("No route data found")
+            return
+
+        print("\nRoute Analysis:")
+        print("=" * 70)
+
+        for result in results:
+            dep_date, count, min_p, max_p, avg_p = result
+            print(f"{dep_date}: {count} offers")
+            print(f"Price range: {min_p:.2f} - {max_p:.2f} {REPORTING_CURRENCY}")
+            print(f"Average: {avg_p:.2f} {REPORTING_CURRENCY}")
+            print("-" * 40)
+
+    @timed("viewer_query_seconds", query="alerts")
+    def show_sweet_spots(self, limit=20):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+                SELECT created_at, route, departure_date, metric, value, route_mean, sigmas
+                FROM sweet_spot_alerts
+                ORDER BY id DESC
+                LIMIT ?
+            ''', (limit,))
+            alerts = cursor.fetchall()
+        except sqlite3.OperationalError:
+            alerts = []
+        conn.close()
+
+        if not alerts:
+            print("No sweet-spot alerts found")
+            return
+
+        print(f"\nSweet-Spot Alerts (Latest {len(alerts)}):")
+        print("=" * 60)
+
+        for alert in alerts:
+            created, route, dep_date, metric, value, mean, sigmas = alert
+            print(f"{created} | {route} | {dep_date}")
+            print(f"{metric}: {value:.2f} vs route avg {mean:.2f} ({sigmas:.1f} sigma better)")
+            print("-" * 40)
+
+    @timed("viewer_query_seconds", query="calendar")
+    def show_price_calendar(self, origin, destination, month):
+        days = PriceCalendar(self.db_path).month(origin, destination, month)
+
+        if not days:
+            print(f"No calendar data for {origin} → {destination} in {month}")
+            return
+
+        cheapest = min((d for d in days if d[1] is not None), key=lambda d: d[1], default=None)
+        best_value = max((d for d in days if d[2] is not None), key=lambda d: d[2], default=None)
+
+        print(f"\nPrice Calendar {origin} → {destination} ({month}):")
+        print("=" * 60)
+
+        for dep_date, min_cash, best_vpm, count in days:
+            cash = f"{min_cash:.2f}" if min_cash is not None else "-"
+            vpm = f"{best_vpm:.2f} cpm" if best_vpm is not None else "-"
+            marks = []
+            if cheapest and dep_date == cheapest[0]:
+                marks.append("cheapest")
+            if best_value and dep_date == best_value[0]:
+                marks.append("best value")
+            suffix = f"  <- {', '.join(marks)}" if marks else ""
+            print(f"{dep_date} | Min: {cash} | Best VPM: {vpm} | {count} offers{suffix}")
+
+    @timed("viewer_query_seconds", query="history")
+    def show_fare_history(self, origin, destination, departure_date=None, window=7):
+        from .fare_history import FareHistory
+
+        history = FareHistory(self.db_path)
+        if departure_date:
+            series = history.rolling_series(origin, destination, departure_date, window)
+            if not len(series['observed_at']):
+                print(f"No fare history for {origin} → {destination} on {departure_date}")
+                return
+
+            print(f"\nFare History {origin} → {destination} departing {departure_date} (rolling {window}):")
+            print("=" * 70)
+            for observed, days, low, rolling_low, rolling_median, vpm, rolling_vpm, count in zip(
+                    series['observed_at'], series['days_before'], series['min_price'], series['rolling_min'],
+                    series['rolling_median'], series['best_vpm'], series['rolling_vpm'], series['offer_count']):
+                low, rolling_low, rolling_median = (f"{value:.2f}" if value == value else "-"
+                                                    for value in (low, rolling_low, rolling_median))
+                vpm, rolling_vpm = (f"{value:.2f} cpm" if value == value else "-" for value in (vpm, rolling_vpm))
+                print(f"{observed} | {days:>3}d out | Min: {low} | Rolling min/median: {rolling_low}/{rolling_median} "
+                      f"| Best VPM: {vpm} (rolling {rolling_vpm}) | {count} offers")
+            return
+
+        curve = history.booking_curve(origin, destination)
+        if not len(curve['days_before']):
+            print(f"No fare history for {origin} → {destination}")
+            return
+
+        print(f"\nBooking Curve {origin} → {destination} (lowest fare by days before departure, {REPORTING_CURRENCY}):")
+        print("=" * 70)
+        for days, p25, median, p75, count in zip(curve['days_before'], curve['p25'], curve['median'],
+                                                 curve['p75'], curve['observations']):
+            if median == median:
+                print(f"{days:>3}d out | Median: {median:.2f} | IQR: {p25:.2f}-{p75:.2f} | {count} snapshots")
+
+    @timed("viewer_query_seconds", query="export")
+    def export_to_csv(self, filename=None):
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"flight_data_export_{timestamp}.csv"
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT o.search_id, o.offer_id, f.departure_date,
+                   o.total_price, o.currency, o.observed_at,
+                   fs.carrier_code, fs.flight_number, fs.departure_iata, fs.arrival_iata,
+                   fs.departure_time, fs.arrival_time, fs.segment_order
+            FROM offer_observations o
+            JOIN flights1 f ON f.id = o.flight_id
+            JOIN flight_segments1 fs ON f.id = fs.flight_id
+            ORDER BY o.observed_at DESC, o.id, fs.id
+        ''')
+
+        data = cursor.fetchall()
+        conn.close()
+
+        if not data:
+            print("No data to export")
+            return
+
+        with open(filename, 'w') as f:
+            f.write("search_id,offer_id,departure_date,total_price,currency,created_at,")
+            f.write("carrier_code,flight_number,departure_iata,arrival_iata,departure_time,arrival_time,segment_order\n")
+
+            for row in data:
+                f.write(','.join(str(col) for col in row) + '\n')
+
+        print(f"Exported {len(data)} records to {filename}")
+
+def handle_command(viewer, command, args):
+    if command == "searches":
+        viewer.show_all_searches()
+    elif command == "cheapest":
+        limit = int(args[0]) if args else 10
+        viewer.show_cheapest_flights(limit)
+    elif command == "route":
+        viewer.show_route_analysis()
+    elif command == "alerts":
+        limit = int(args[0]) if args else 20
+        viewer.show_sweet_spots(limit)
+    elif command == "calendar":
+        if len(args) < 3:
+            print("Usage: calendar ORIGIN DESTINATION YYYY-MM")
+            return
+        viewer.show_price_calendar(args[0].upper(), args[1].upper(), args[2])
+    elif command == "history":
+        if len(args) < 2:
+            print("Usage: history ORIGIN DESTINATION [YYYY-MM-DD]")
+            return
+        viewer.show_fare_history(args[0].upper(), args[1].upper(), args[2] if len(args) > 2 else None)
+    elif command == "export":
+        filename = args[0] if args else None
+        viewer.export_to_csv(filename)
+    else:
+        print("Unknown command. Available: searches, cheapest, route, alerts, calendar, history, export, migrate")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    viewer = FlightDataViewer()
+
+    if argv and argv[0].lower() == "migrate":
+        viewer.migrate()
+        return
+
+    if not viewer.check_database_exists():
+        print("No flight data found. Run `rewards-optimizer fetch` first to collect data.")
+        return
+
+    if viewer.needs_migration():
+        print("This database predates currency normalization and itinerary deduplication.")
+        print("Run `rewards-optimizer view migrate` (or any fetch) to upgrade it.")
+        return
+
+    if argv:
+        command = argv[0].lower()
+        args = argv[1:]
+        handle_command(viewer, command, args)
+    else:
+        viewer.show_all_searches()
+        print()
+        viewer.show_cheapest_flights(5)
+    get_metrics().write_prometheus()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import json
+import logging
+import sqlite3
+from bisect import bisect_left
+from itertools import accumulate
+
+from .structured_log import get_logger, log_event
+
+logger = get_logger("vpm_sketch")
+
+GLOBAL_ROUTE = "*"
+
+# Fixed-width buckets over cents-per-mile. Ranks are exact to one bucket width,
+# which is far finer than the 0.5 cpm steps between value categories.
+BUCKET_WIDTH = 0.05
+MAX_VPM = 10.0
+
+
+def route_key(origin, destination):
+    return f"{origin}-{destination}"
+
+
+class QuantileSketch:
+    def __init__(self, counts=None, bucket_width=BUCKET_WIDTH, max_value=MAX_VPM):
+        self.bucket_width = bucket_width
+        self.num_buckets = int(round(max_value / bucket_width))
+        self.counts = list(counts) if counts else [0] * self.num_buckets
+        self.total = sum(self.counts)
+        self._cumulative = None
+
+    def _bucket(self, value):
+        if value <= 0:
+            return 0
+        return min(int(value / self.bucket_width), self.num_buckets - 1)
+
+    def add(self, value):
+        self.counts[self._bucket(value)] += 1
+        self.total += 1
+        self._cumulative = None
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self._cumulative = None
+
+    def cumulative(self):
+        # Rebuilt once after a batch of updates, then every lookup is O(1)
+        if self._cumulative is None:
+            self._cumulative = [0] + list(accumulate(self.counts))
+        return self._cumulative
+
+    def percentile(self, value):
+        if self.total == 0:
+            return None
+        cumulative = self.cumulative()
+        idx = self._bucket(value)
+        fraction = (value - idx * self.bucket_width) / self.bucket_width
+        fraction = min(max(fraction, 0.0), 1.0)
+        below = cumulative[idx] + self.counts[idx] * fraction
+        return round(100.0 * below / self.total, 2)
+
+    def quantile(self, q):
+        if self.total == 0:
+            return None
+        cumulative = self.cumulative()
+        target = q * self.total
+        idx = max(bisect_left(cumulative, target) - 1, 0)
+        idx = min(idx, self.num_buckets - 1)
+        in_bucket = self.counts[idx]
+        fraction = (target - cumulative[idx]) / in_bucket if in_bucket else 0.0
+        return round((idx + fraction) * self.bucket_width, 4)
+
+    def to_json(self):
+        return json.dumps(self.counts)
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(json.loads(data))
+
+
+class VPMSketchStore:
+    def __init__(self, db_path="flight_offers.db"):
+        self.db_path = db_path
+        self.sketches = {}
+        self.init_table()
+        self.load()
+
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def init_table(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS vpm_sketches (
+                route TEXT PRIMARY KEY,
+                total INTEGER,
+                counts TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute("SELECT COUNT(*) FROM vpm_sketches")
+        is_empty = cursor.fetchone()[0] == 0
+        cursor.execute("PRAGMA table_info(offer_observations)")
+        has_vpm = 'value_per_mile' in [col[1] for col in cursor.fetchall()]
+        conn.commit()
+        conn.close()
+
+        # Databases crawled before the sketches existed already hold every award VPM
+        if is_empty and has_vpm:
+            self.rebuild()
+
+    def load(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT route, counts FROM vpm_sketches")
+        self.sketches = {route: QuantileSketch.from_json(counts) for route, counts in cursor.fetchall()}
+        conn.close()
+
+    def update(self, observations, cursor=None):
+        # observations: iterable of (origin, destination, vpm in cents per mile)
+        deltas = {}
+        for origin, destination, vpm in observations:
+            for key in (route_key(origin, destination), GLOBAL_ROUTE):
+                deltas.setdefault(key, QuantileSketch()).add(vpm)
+
+        if deltas:
+            self.save(deltas, cursor)
+        return len(deltas)
+
+    def save(self, deltas, cursor=None):
+        conn = None
+        if cursor is None:
+            conn = self.connect()
+            cursor = conn.cursor()
+            # Take the write lock before reading, so no other writer lands in between
+            cursor.execute("BEGIN IMMEDIATE")
+
+        # Counts are added to the stored sketch, not replaced by this process's
+        # copy, so concurrent crawlers never drop each other's observations
+        rows = []
+        for route, delta in deltas.items():
+            cursor.execute("SELECT counts FROM vpm_sketches WHERE route = ?", (route,))
+            stored = cursor.fetchone()
+            sketch = QuantileSketch.from_json(stored[0]) if stored else QuantileSketch()
+            sketch.merge(delta)
+            self.sketches[route] = sketch
+            rows.append((route, sketch.total, sketch.to_json()))
+        self._write(rows, cursor)
+
+        if conn is not None:
+            conn.commit()
+            conn.close()
+
+    def _write(self, rows, cursor):
+        cursor.executemany('''
+            INSERT INTO vpm_sketches (route, total, counts, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(route) DO UPDATE SET
+                total = excluded.total,
+                counts = excluded.counts,
+                updated_at = excluded.updated_at
+        ''', rows)
+
+    def rebuild(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+        # One count per sighting, as ingest adds them
+        cursor.execute('''
+            SELECT f.origin, f.destination, o.value_per_mile
+            FROM offer_observations o
+            JOIN flights1 f ON f.id = o.flight_id
+            WHERE o.value_per_mile IS NOT NULL AND f.origin IS NOT NULL AND f.destination IS NOT NULL
+        ''')
+        sketches = {}
+        for origin, destination, vpm in cursor.fetchall():
+            for key in (route_key(origin, destination), GLOBAL_ROUTE):
+                sketches.setdefault(key, QuantileSketch()).add(vpm)
+
+        cursor.execute("DELETE FROM vpm_sketches")
+        self._write([(route, sketch.total, sketch.to_json()) for route, sketch in sketches.items()], cursor)
+        conn.commit()
+        conn.close()
+        self.sketches = sketches
+        if sketches:
+            log_event(logger, logging.INFO, "vpm_sketches_rebuilt", routes=len(sketches))
+        return len(sketches)
+
+    def percentile(self, vpm, origin=None, destination=None):
+        key = route_key(origin, destination) if origin and destination else GLOBAL_ROUTE
+        sketch = self.sketches.get(key)
+        if sketch is None:
+            return None
+        return sketch.percentile(vpm)
+
+    def top_percent(self, vpm, origin=None, destination=None):
+        percentile = self.percentile(vpm, origin, destination)
+        if percentile is None:
+            return None
+        return round(100.0 - percentile, 2)
+
+    def quantile(self, q, origin=None, destination=None):
+        key = route_key(origin, destination) if origin and destination else GLOBAL_ROUTE
+        sketch = self.sketches.get(key)
+        if sketch is None:
+            return None
+        return sketch.quantile(q)
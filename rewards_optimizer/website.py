@@ -0,0 +1,713 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from rewards_optimizer.expert_valuations import ExpertValuations
+from rewards_optimizer.vpm_sketch import VPMSketchStore
+from rewards_optimizer.portfolio_optimizer import load_trip_options, optimize_portfolio
+from rewards_optimizer.transfer_partners import TransferPartnerGraph
+from rewards_optimizer.connection_search import ConnectionSearch
+from rewards_optimizer.round_trip import top_k_round_trips, combine_round_trip
+from rewards_optimizer.search_jobs import SearchJobRunner
+from rewards_optimizer.price_calendar import PriceCalendar
+from rewards_optimizer.fare_history import FareHistory
+
+
+st.set_page_config(
+    page_title="Flight Redemption Optimizer",
+    page_icon="✈️",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+
+st.markdown("""
+<style>
+    .main-header {
+        font-size: 3rem;
+        font-weight: bold;
+        color: #1f77b4;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .sub-header {
+        font-size: 1.5rem;
+        color: #666;
+        text-align: center;
+        margin-bottom: 1rem;
+    }
+    .metric-card {
+        background-color: #f0f2f6;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        border-left: 4px solid #1f77b4;
+    }
+    .recommendation-card {
+        background-color: white;
+        padding: 1.5rem;
+        border-radius: 0.5rem;
+        border: 1px solid #e0e0e0;
+        margin-bottom: 1rem;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    }
+    .excellent { border-left: 4px solid #28a745; }
+    .good { border-left: 4px solid #17a2b8; }
+    .fair { border-left: 4px solid #ffc107; }
+    .poor { border-left: 4px solid #dc3545; }
+</style>
+""", unsafe_allow_html=True)
+
+
+DB_PATH = "flight_offers.db"
+CACHE_TTL_SECONDS = 600
+ROUND_TRIP_RESULTS = 50
+JOB_POLL_SECONDS = 1.0
+
+
+@st.cache_resource
+def get_db_connection():
+    return sqlite3.connect(DB_PATH, check_same_thread=False)
+
+
+def get_data_version():
+    # Every crawl adds observations even when its itineraries are already stored,
+    # so the highest observation id invalidates cached loaders
+    try:
+        return get_db_connection().execute("SELECT COALESCE(MAX(id), 0) FROM offer_observations").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+
+
+@st.cache_resource
+def get_expert_valuations():
+    return ExpertValuations(DB_PATH)
+
+
+@st.cache_resource
+def get_transfer_graph():
+    return TransferPartnerGraph(DB_PATH)
+
+
+@st.cache_resource
+def get_connection_search():
+    return ConnectionSearch(DB_PATH)
+
+
+@st.cache_resource
+def get_job_runner():
+    return SearchJobRunner()
+
+
+@st.cache_resource(max_entries=2)
+def get_vpm_sketches(data_version):
+    return VPMSketchStore(DB_PATH)
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_recommendations(data_version, **search):
+    return find_routes(**search)
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_calendar_month(data_version, origin, destination, month):
+    return PriceCalendar(DB_PATH).month(origin, destination, month)
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_booking_curve(data_version, origin, destination):
+    return pd.DataFrame(FareHistory(DB_PATH).booking_curve(origin, destination))
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_fare_history(data_version, origin, destination, departure_date):
+    return pd.DataFrame(FareHistory(DB_PATH).rolling_series(origin, destination, departure_date))
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_cached_trip_options(data_version, trips):
+    return load_trip_options(trips, DB_PATH)
+
+
+def main():
+    st.sidebar.title("✈️ Flight Redemption Optimizer")
+    page = st.sidebar.selectbox(
+        "Choose a page:",
+        ["🏠 Home", "🔍 Search Flights", "📊 Results", "📅 Price Calendar", "📚 About"]
+    )
+    if page == "🏠 Home":
+        show_home_page()
+    elif page == "🔍 Search Flights":
+        show_search_page()
+    elif page == "📊 Results":
+        show_results_page()
+    elif page == "📅 Price Calendar":
+        show_calendar_page()
+    elif page == "📚 About":
+        show_about_page()
+
+
+def show_home_page():
+    st.markdown('<h1 class="main-header">Flight Redemption Optimizer</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="sub-header">Find the best value for your miles with expert-backed recommendations</p>', unsafe_allow_html=True)
+   
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.image("https://images.unsplash.com/photo-1436491865332-7a61a109cc05?w=800",
+                caption="Maximize your travel rewards", use_container_width=True)
+   
+    st.markdown("---")
+    st.markdown("## 🎯 Why Use Flight Redemption Optimizer?")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown("""
+        ### 💰 Maximize Value
+        Compare your redemptions to expert valuations from Upgraded Points, The Points Guy, and more.
+        """)
+    with col2:
+        st.markdown("""
+        ### 🛣️ Find Best Routes
+        Discover direct and layover options you might have missed, ranked by value.
+        """)
+    with col3:
+        st.markdown("""
+        ### 📊 Expert Analysis
+        Get detailed breakdowns of savings, complexity, and why each option is recommended.
+        """)
+    st.markdown("---")
+    st.markdown("## 📈 Understanding Value Categories")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.markdown("""
+        ### 🟢 EXCELLENT
+        **2.0+ cpm**
+        - Rare and highly sought after
+        - Significantly above average
+        - Top 10% of redemptions
+        """)
+    with col2:
+        st.markdown("""
+        ### 🔵 GOOD
+        **1.5-2.0 cpm**
+        - Solid value redemptions
+        - Above expert average
+        - Top 25% of redemptions
+        """)
+    with col3:
+        st.markdown("""
+        ### 🟡 FAIR
+        **1.0-1.5 cpm**
+        - Acceptable but not outstanding
+        - Near expert average
+        - Standard redemptions
+        """)
+    with col4:
+        st.markdown("""
+        ### 🔴 POOR
+        **<1.0 cpm**
+        - Consider paying cash instead
+        - Below expert average
+        - Better to earn miles
+        """)
+
+
+def show_search_page():
+    st.markdown("## 🔍 Search for Flight Redemptions")
+    st.markdown("Enter your travel details to find the best redemption options.")
+    with st.expander("💡 Quick Examples", expanded=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Popular Domestic Routes:**")
+            st.markdown("""
+            - **BOS → SFO** (Boston to San Francisco)
+            - **JFK → LAX** (New York to Los Angeles)  
+            - **ORD → MIA** (Chicago to Miami)
+            - **DFW → SEA** (Dallas to Seattle)
+            """)
+        with col2:
+            st.markdown("**Recommended Settings:**")
+            st.markdown("""
+            - **Max Miles:** 25,000-35,000
+            - **Max Fees:** $15-25
+            - **Min Value:** 1.0-1.5 cpm
+            - **Cabin:** Economy (best value)
+            """)
+    with st.form("search_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            origin = st.text_input("Origin Airport", placeholder="BOS", help="Enter 3-letter airport code")
+            destination = st.text_input("Destination Airport", placeholder="SFO", help="Enter 3-letter airport code")
+            departure_date = st.date_input("Departure Date", value=datetime.now() + timedelta(days=30), help="When you want to leave")
+            return_date = st.date_input("Return Date", value=None, help="When you want to return (optional)")
+        with col2:
+            max_miles = st.number_input("Maximum Miles", min_value=0, value=30000, step=5000, help="Your miles budget")
+            max_fees = st.number_input("Maximum Fees ($)", value=20, step=5, help="Maximum taxes/fees you'll pay")
+            min_value = st.slider("Minimum Value (cpm)", 0.5, 3.0, 1.0, 0.1, help="Minimum cents per mile value")
+            cabin_class = st.selectbox("Cabin Class", ["Economy", "Business", "First"])
+        if origin and destination:
+            if return_date and return_date > departure_date:
+                trip_type = "Round Trip"
+                st.info(f"🔁 {trip_type}: {departure_date.strftime('%b %d')} → {return_date.strftime('%b %d')} ({return_date - departure_date} days)")
+            else:
+                trip_type = "One Way"
+                st.info(f"➡️ {trip_type}: {departure_date.strftime('%b %d')}")
+        else:
+            trip_type = "One Way"
+        with st.expander("Advanced Options"):
+            col1, col2 = st.columns(2)
+            with col1:
+                include_layovers = st.checkbox("Include Layover Routes", value=True, help="Find routes with connections")
+                preferred_airlines = st.multiselect("Preferred Airlines", ["AA", "UA", "DL", "AS", "B6"])
+                point_currencies = st.multiselect("Points You Hold", ["AMEX_MR", "CHASE_UR", "CITI_TY", "CAP1", "BILT", "MARRIOTT", "AA", "UA", "DL", "AS", "B6"], help="Transferable points and airline miles in your wallet")
+            with col2:
+                max_layover_hours = st.slider("Max Layover Time (hours)", 1, 12, 6, help="Maximum connection time")
+                adults = st.number_input("Number of Passengers", 1, 8, 1)
+        submitted = st.form_submit_button("🔍 Search for Redemptions", type="primary")
+        if submitted:
+            if origin and destination:
+                if return_date and return_date <= departure_date:
+                    st.error("Return date must be after departure date!")
+                    return
+                st.session_state.search_params = {
+                    'origin': origin.upper(),
+                    'destination': destination.upper(),
+                    'departure_date': departure_date.strftime('%Y-%m-%d'),
+                    'return_date': return_date.strftime('%Y-%m-%d') if return_date and return_date > departure_date else None,
+                    'trip_type': trip_type,
+                    'max_miles': max_miles,
+                    'max_fees': max_fees,
+                    'min_value': min_value,
+                    'cabin_class': cabin_class.lower(),
+                    'include_layovers': include_layovers,
+                    'preferred_airlines': preferred_airlines,
+                    'point_currencies': point_currencies,
+                    'max_layover_hours': max_layover_hours,
+                    'adults': adults
+                }
+                search = dict(
+                    origin=origin.upper(),
+                    destination=destination.upper(),
+                    departure_date=departure_date.strftime('%Y-%m-%d'),
+                    return_date=return_date.strftime('%Y-%m-%d') if return_date and return_date > departure_date else None,
+                    max_miles=max_miles,
+                    max_fees=max_fees,
+                    min_value=min_value,
+                    cabin=cabin_class.lower(),
+                    include_layovers=include_layovers,
+                    max_layover_hours=max_layover_hours,
+                    preferred_airlines=preferred_airlines,
+                    point_currencies=point_currencies
+                )
+                # Stages run on a worker thread with no Streamlit context, so they call
+                # the uncached search with services resolved here. Round trips are
+                # paired once, in the last stage; with layovers the direct stage
+                # previews the outbound legs
+                services = route_services()
+                stages = [("direct", lambda: find_routes(**dict(search, include_layovers=False),
+                                                         pair_round_trips=not include_layovers, services=services))]
+                if include_layovers:
+                    stages.append(("layover", lambda: find_routes(**search, services=services)))
+                st.session_state.search_job_id = get_job_runner().submit(stages)
+                st.session_state.recommendations = []
+                st.session_state.search_completed = True
+                st.success("Search started! Direct options appear on the Results tab first, with layover routes added as they are found.")
+            else:
+                st.error("Please enter both origin and destination airports.")
+
+
+def route_services():
+    return {
+        'searcher': get_connection_search(),
+        'valuations': get_expert_valuations(),
+        'sketches': get_vpm_sketches(get_data_version()),
+        'transfers': get_transfer_graph()
+    }
+
+
+def find_routes(origin, destination, departure_date, return_date=None,
+                max_miles=30000, max_fees=20, min_value=1.0, cabin="economy",
+                include_layovers=True, max_layover_hours=6, preferred_airlines=None, point_currencies=None,
+                pair_round_trips=True, services=None):
+    services = services or route_services()
+    searcher = services['searcher']
+    search = dict(max_miles=max_miles, max_fees=max_fees, cabin=cabin, include_layovers=include_layovers,
+                  max_layover_hours=max_layover_hours, preferred_airlines=preferred_airlines)
+    if return_date and pair_round_trips:
+        # Legs are searched without the value floor; it applies to the combined trip
+        outbound = searcher.search(origin, destination, departure_date, min_value=0, **search)
+        inbound = searcher.search(destination, origin, return_date, min_value=0, **search)
+        pairs = top_k_round_trips(outbound, inbound, k=ROUND_TRIP_RESULTS, max_miles=max_miles, max_fees=max_fees,
+                                  min_value=min_value)
+        recommendations = [combine_round_trip(out_leg, in_leg) for out_leg, in_leg in pairs]
+    else:
+        recommendations = searcher.search(origin, destination, departure_date, min_value=min_value, **search)
+    if not recommendations:
+        return []
+
+    statuses, expert_averages = services['valuations'].compare_batch(
+        [r.airline for r in recommendations],
+        [r.value_per_mile for r in recommendations]
+    )
+    sketches = services['sketches']
+    for rec, status, expert_average in zip(recommendations, statuses.tolist(), expert_averages.tolist()):
+        rec.expert_status = status
+        rec.expert_average = round(expert_average, 3)
+        rec.top_percent = sketches.top_percent(rec.value_per_mile, origin, destination)
+
+    if point_currencies:
+        sources = services['transfers'].price_redemptions(
+            [r.airline for r in recommendations],
+            [r.miles_used for r in recommendations],
+            [r.cash_price for r in recommendations],
+            [r.fees for r in recommendations],
+            point_currencies
+        )
+        for rec, source in zip(recommendations, sources):
+            rec.transfer_currency = source['currency']
+            rec.transfer_points = source['source_points']
+
+    return recommendations
+
+
+RESULTS_COLUMNS = {
+    'type': 'Type',
+    'route_display': 'Route',
+    'cash_price': 'Cash Price',
+    'miles_used': 'Miles',
+    'fees': 'Fees',
+    'value_per_mile': 'Value (cpm)',
+    'category': 'Category',
+    'top_percent': 'Route Rank',
+    'expert_average': 'Expert Avg (cpm)',
+    'expert_status': 'Expert Status',
+    'transfer_currency': 'Best Source',
+    'transfer_points': 'Source Points',
+    'savings_percentage': 'Savings %',
+    'savings': 'Savings',
+    'complexity_score': 'Complexity'
+}
+
+SORTABLE_COLUMNS = ['Value (cpm)', 'Cash Price', 'Miles', 'Fees', 'Savings %', 'Route Rank', 'Complexity', 'Route']
+
+RESULTS_COLUMN_CONFIG = {
+    'Cash Price': st.column_config.NumberColumn(format="$%.0f"),
+    'Miles': st.column_config.NumberColumn(format="%d"),
+    'Fees': st.column_config.NumberColumn(format="$%.2f"),
+    'Value (cpm)': st.column_config.NumberColumn(format="%.3f"),
+    'Route Rank': st.column_config.NumberColumn(format="Top %.0f%%"),
+    'Expert Avg (cpm)': st.column_config.NumberColumn(format="%.2f"),
+    'Source Points': st.column_config.NumberColumn(format="%d"),
+    'Savings %': st.column_config.NumberColumn(format="%.0f%%")
+}
+
+
+def get_results_frame(recommendations):
+    # Built once per result set and kept in session state across reruns
+    if st.session_state.get('results_frame_source') is recommendations:
+        return st.session_state.results_frame
+
+    if recommendations:
+        # Column-wise straight off the slotted records; no per-row dicts
+        df = pd.DataFrame({label: [getattr(r, field) for r in recommendations]
+                           for field, label in RESULTS_COLUMNS.items()})
+        df['Type'] = df['Type'].str.title()
+        df[['Route Rank', 'Source Points']] = df[['Route Rank', 'Source Points']].astype(float)
+    else:
+        df = pd.DataFrame(columns=list(RESULTS_COLUMNS.values()))
+
+    st.session_state.results_frame = df
+    st.session_state.results_frame_source = recommendations
+    return df
+
+
+def sync_search_job():
+    job_id = st.session_state.get('search_job_id')
+    job = get_job_runner().get(job_id) if job_id else None
+    if job is not None:
+        st.session_state.recommendations, _ = job.snapshot()
+    return job
+
+
+def show_results_page():
+    job = sync_search_job()
+    if not hasattr(st.session_state, 'recommendations') or not st.session_state.get('search_completed'):
+        recommendations = load_recommendations(
+            get_data_version(),
+            origin='BOS',
+            destination='SFO',
+            departure_date=(datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d'),
+            max_miles=30000,
+            max_fees=20,
+            min_value=1.0,
+            include_layovers=True,
+            max_layover_hours=6
+        )
+        st.session_state.recommendations = recommendations
+        st.session_state.search_params = {
+            'origin': 'BOS',
+            'destination': 'SFO',
+            'departure_date': (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d'),
+            'return_date': None,
+            'trip_type': 'One Way',
+            'max_miles': 30000,
+            'max_fees': 20,
+            'min_value': 1.0,
+            'cabin_class': 'economy',
+            'include_layovers': True,
+            'preferred_airlines': [],
+            'point_currencies': [],
+            'max_layover_hours': 6,
+            'adults': 1
+        }
+        st.session_state.search_completed = True
+        st.info('No search performed yet. Showing results for BOS → SFO.')
+
+    show_results(st.session_state.recommendations, job)
+
+    # Poll until the background search has published its last stage
+    if job is not None and job.running:
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+
+
+def show_results(recommendations, job=None):
+    df = get_results_frame(recommendations)
+    st.markdown("## 📊 Redemption Analysis Results")
+    if job is not None:
+        _, completed = job.snapshot()
+        if job.running:
+            st.info(f"Searching... {len(completed)}/{len(job.stage_names)} stages done "
+                    f"({', '.join(completed) or 'waiting for first results'}). More options will appear automatically.")
+        elif job.status == "failed":
+            st.error(f"Search failed: {job.error}")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Options", len(df))
+    with col2:
+        if not df.empty:
+            st.metric("Avg Value (vpm)", f"{df['Value (cpm)'].mean():.2f}")
+    with col3:
+        if not df.empty:
+            st.metric("Best Value (vpm)", f"{df['Value (cpm)'].max():.2f}")
+    with col4:
+        if not df.empty:
+            st.metric("Total Savings", f"${df['Savings'].sum():.0f}")
+   
+    st.markdown("### 🎯 Recommended Redemptions")
+    if df.empty:
+        if job is None or not job.running:
+            st.warning('No data available to display. Please try searching again or reload the page.')
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        sort_by = st.selectbox("Sort by", SORTABLE_COLUMNS, index=SORTABLE_COLUMNS.index('Value (cpm)'))
+    with col2:
+        descending = st.checkbox("Descending", value=True)
+    with col3:
+        page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+    with col4:
+        page_count = max(1, -(-len(df) // page_size))
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1)
+
+    # Sort and slice here so only one page of rows is ever sent to the browser
+    ordered = df.sort_values(sort_by, ascending=not descending, kind='stable', na_position='last')
+    start = (page - 1) * page_size
+    st.dataframe(
+        ordered.iloc[start:start + page_size].drop(columns=['Savings']),
+        use_container_width=True,
+        hide_index=True,
+        column_config=RESULTS_COLUMN_CONFIG
+    )
+    st.caption(f"Showing {start + 1}-{min(start + page_size, len(df))} of {len(df)} options")
+
+    show_portfolio_planner(st.session_state.search_params)
+
+
+def show_portfolio_planner(search_params):
+    st.markdown("### 🧳 Miles Budget Planner")
+    st.markdown("List the trips you want to take and we'll pick which to book with miles and which with cash.")
+    default_trips = f"{search_params['origin']} {search_params['destination']} {search_params['departure_date']}"
+    with st.form("portfolio_form"):
+        trips_text = st.text_area("Trips (one per line: ORIGIN DESTINATION YYYY-MM-DD)", value=default_trips)
+        col1, col2 = st.columns(2)
+        with col1:
+            miles_budget = st.number_input("Miles Budget", min_value=0, value=int(search_params['max_miles']), step=5000)
+        with col2:
+            max_fees = st.number_input("Maximum Fees per Ticket ($)", value=int(search_params['max_fees']), step=5)
+        planned = st.form_submit_button("🧮 Optimize Trips")
+
+    if not planned:
+        return
+
+    trips = []
+    for line in trips_text.splitlines():
+        parts = line.split()
+        if len(parts) != 3:
+            continue
+        trips.append((parts[0].upper(), parts[1].upper(), parts[2]))
+    if not trips:
+        st.error("Please enter at least one trip as ORIGIN DESTINATION YYYY-MM-DD.")
+        return
+
+    result = optimize_portfolio(load_cached_trip_options(get_data_version(), tuple(trips)), miles_budget, max_fees=max_fees)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Savings", f"${result['total_savings']:.0f}")
+    with col2:
+        st.metric("Miles Used", f"{result['miles_spent']:,}")
+    with col3:
+        st.metric("Cash Spent", f"${result['cash_spent']:.0f}")
+    st.dataframe(pd.DataFrame([{
+        'Trip': f"{p['trip'][0]} → {p['trip'][1]}",
+        'Date': p['trip'][2],
+        'Pay With': p['pay_with'].title(),
+        'Cash Price': p['cash_price'],
+        'Miles': p['miles'],
+        'Fees': p['fees'],
+        'Savings': p['savings']
+    } for p in result['plan']]), use_container_width=True)
+
+
+def show_calendar_page():
+    st.markdown("## 📅 Price Calendar")
+    st.markdown("See which day of the month is cheapest or best value for a route.")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        origin = st.text_input("Origin Airport", value="BOS").upper()
+    with col2:
+        destination = st.text_input("Destination Airport", value="SFO").upper()
+    with col3:
+        month = st.text_input("Month (YYYY-MM)", value=(datetime.now() + timedelta(days=30)).strftime('%Y-%m'))
+    with col4:
+        metric = st.radio("Color by", ["Lowest Cash Price", "Best Value (cpm)"])
+
+    try:
+        month_start = datetime.strptime(month, '%Y-%m')
+    except ValueError:
+        st.error("Month must look like 2025-08.")
+        return
+
+    days = pd.DataFrame(load_calendar_month(get_data_version(), origin, destination, month),
+                        columns=['date', 'min_cash', 'best_vpm', 'offer_count'])
+    if days.empty:
+        st.warning(f"No stored offers for {origin} → {destination} in {month}.")
+        return
+
+    dates = pd.to_datetime(days['date'])
+    days['weekday'] = dates.dt.strftime('%a')
+    days['week'] = (dates.dt.day + month_start.weekday() - 1) // 7 + 1
+    days['day'] = dates.dt.day
+
+    field, title, scheme = (('min_cash', 'Lowest Cash ($)', 'redyellowgreen') if metric == "Lowest Cash Price"
+                            else ('best_vpm', 'Best Value (cpm)', 'greens'))
+    color = alt.Color(f'{field}:Q', title=title,
+                      scale=alt.Scale(scheme=scheme, reverse=field == 'min_cash'))
+    base = alt.Chart(days).encode(
+        x=alt.X('weekday:O', sort=['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'], title=None),
+        y=alt.Y('week:O', title=None, axis=None)
+    )
+    heatmap = base.mark_rect().encode(
+        color=color,
+        tooltip=['date', alt.Tooltip('min_cash:Q', format='$.0f'), alt.Tooltip('best_vpm:Q', format='.2f'), 'offer_count']
+    )
+    labels = base.mark_text(baseline='middle').encode(text='day:Q')
+    st.altair_chart((heatmap + labels).properties(height=320), use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        cheapest = days.loc[days['min_cash'].idxmin()] if days['min_cash'].notna().any() else None
+        if cheapest is not None:
+            st.metric("Cheapest Day", cheapest['date'], f"${cheapest['min_cash']:.0f}", delta_color="off")
+    with col2:
+        best = days.loc[days['best_vpm'].idxmax()] if days['best_vpm'].notna().any() else None
+        if best is not None:
+            st.metric("Best Value Day", best['date'], f"{best['best_vpm']:.2f} cpm", delta_color="off")
+
+    curve = load_booking_curve(get_data_version(), origin, destination).dropna(subset=['median'])
+    if not curve.empty:
+        st.markdown("### 📈 Booking Curve")
+        st.markdown("Lowest fare seen at each number of days before departure, across all crawled dates.")
+        x = alt.X('days_before:Q', title='Days before departure', scale=alt.Scale(reverse=True))
+        band = alt.Chart(curve).mark_area(opacity=0.25).encode(x=x, y=alt.Y('p25:Q', title='Lowest Cash ($)'), y2='p75:Q')
+        line = alt.Chart(curve).mark_line(point=True).encode(
+            x=x, y='median:Q',
+            tooltip=['days_before', alt.Tooltip('median:Q', format='$.0f'), alt.Tooltip('min:Q', format='$.0f'), 'observations']
+        )
+        st.altair_chart((band + line).properties(height=280), use_container_width=True)
+
+    st.markdown("### 🕒 Fare History")
+    departure = st.selectbox("Departure date", days['date'].tolist(),
+                             index=int(days['min_cash'].fillna(float('inf')).values.argmin()))
+    history = load_fare_history(get_data_version(), origin, destination, departure)
+    if history.empty:
+        st.info(f"No crawl snapshots stored for {departure}.")
+        return
+    st.markdown("Lowest fare at each crawl, with its 7-snapshot rolling minimum and median.")
+    prices = history.melt(id_vars=['observed_at', 'rolling_vpm'],
+                          value_vars=['min_price', 'rolling_min', 'rolling_median'],
+                          var_name='series', value_name='price')
+    trend = alt.Chart(prices).mark_line(point=True).encode(
+        x=alt.X('observed_at:T', title='Crawled'),
+        y=alt.Y('price:Q', title='Cash ($)'),
+        color=alt.Color('series:N', title=None),
+        tooltip=['observed_at', 'series', alt.Tooltip('price:Q', format='$.0f'),
+                 alt.Tooltip('rolling_vpm:Q', title='Rolling best VPM', format='.2f')]
+    )
+    st.altair_chart(trend.properties(height=280), use_container_width=True)
+
+
+def show_about_page():
+    st.markdown("## 📚 About Flight Redemption Optimizer")
+    st.markdown("""
+    ### 🎯 Our Mission
+    We help travelers maximize the value of their miles and points by providing expert-backed
+    recommendations and transparent analysis of redemption options.
+   
+    ### 🔧 How It Works
+    1. **Search:** Enter your travel details and constraints
+    2. **Analyze:** Our system searches for all available options (direct and layover)
+    3. **Calculate:** We compute value-per-mile using multiple methods
+    4. **Compare:** Results are compared to expert valuations
+    5. **Rank:** Options are ranked by value and savings
+   
+    ### 📊 Expert Sources
+    Our recommendations are benchmarked against:
+    - **Stored Flight Data:** Offers collected from the Amadeus API
+    - **Value Calculator:** Multiple calculation methods
+    - **Connection Search:** Direct and layover routes built from stored segments
+    - **Expert Comparison:** Published valuation integration
+    """)
+   
+    st.markdown("### 📈 Value Categories")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("""
+        **EXCELLENT (2.0+ cpm)**
+        - Rare and highly sought after
+        - Significantly above average
+        - Top 10% of redemptions
+       
+        **GOOD (1.5-2.0 cpm)**
+        - Solid value redemptions
+        - Above expert average
+        - Top 25% of redemptions
+        """)
+    with col2:
+        st.markdown("""
+        **FAIR (1.0-1.5 cpm)**
+        - Acceptable but not outstanding
+        - Near expert average
+        - Standard redemptions
+       
+        **POOR (<1.0 cpm)**
+        - Consider paying cash instead
+        - Below expert average
+        - Better to earn miles
+        """)
+
+
+if __name__ == "__main__":
+    main()
+
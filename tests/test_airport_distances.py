@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from rewards_optimizer.airport_distances import get_airport_index
+
+
+def test_batch_distances_match_single_lookups():
+    airports = get_airport_index()
+    origins = ["BOS", "jfk", "LHR", "BOS", "QQQ"]
+    destinations = ["SFO", "LAX", "JFK", "BOS", "SFO"]
+
+    miles = airports.distances_miles(origins, destinations)
+
+    for origin, destination, value in zip(origins[:-1], destinations[:-1], miles[:-1].tolist()):
+        assert value == pytest.approx(airports.distance_miles(origin, destination), rel=1e-9)
+    assert miles[0] == pytest.approx(2700, rel=0.01)
+    assert miles[3] == 0.0
+
+
+def test_unknown_airports_have_no_distance():
+    airports = get_airport_index()
+
+    assert np.isnan(airports.distances_km(["QQQ", "BOS"], ["SFO", None])).all()
+    assert airports.distance_km("QQQ", "SFO") is None
+    assert airports.distance_miles("BOS", None) is None
@@ -0,0 +1,38 @@
+import json
+
+from rewards_optimizer.award_charts import AwardChartEngine
+
+
+def write_charts(path):
+    path.write_text(json.dumps({
+        "cabin_multipliers": {"economy": 1.0, "business": 2.5},
+        "programs": {
+            "DEFAULT": {"type": "distance", "bands": [[1000, 10000], [3000, 20000], [None, 40000]]},
+            "ZZ": {"type": "zone", "zones": {"US-US": 12500, "US-EU": 30000},
+                   "cabin_multipliers": {"business": 2.2}}
+        }
+    }))
+    return str(path)
+
+
+def test_batch_prices_each_program_on_its_own_chart(tmp_path):
+    engine = AwardChartEngine(write_charts(tmp_path / "charts.json"))
+
+    miles = engine.price_batch(["ZZ", "ZZ", "ZZ", "XX", "XX"],
+                               ["BOS", "BOS", "BOS", "BOS", "BOS"],
+                               ["SFO", "LHR", "HNL", "ORD", "QQQ"])
+
+    # Zones missing from a chart, unknown programs and unknown airports fall back to the default chart
+    assert miles.tolist() == [12500, 30000, 40000, 10000, 10000]
+    assert miles.tolist() == [engine.price(p, o, d) for p, o, d in
+                              zip(["ZZ", "ZZ", "ZZ", "XX", "XX"], ["BOS"] * 5, ["SFO", "LHR", "HNL", "ORD", "QQQ"])]
+
+
+def test_cabin_multipliers_round_up_to_chart_steps(tmp_path):
+    engine = AwardChartEngine(write_charts(tmp_path / "charts.json"))
+
+    miles = engine.price_batch(["ZZ", "ZZ", "XX", "XX"], ["BOS"] * 4, ["SFO"] * 4,
+                               ["economy", "business", "business", "first"])
+
+    # ZZ overrides business; cabins with no multiplier price as economy
+    assert miles.tolist() == [12500, 27500, 50000, 20000]
@@ -0,0 +1,38 @@
+import sqlite3
+
+import numpy as np
+
+from rewards_optimizer.fare_history import FareHistory
+from rewards_optimizer.price_calendar import PriceCalendar
+
+OBSERVED_AT = "2025-07-01 12:00:00"
+ROUTES = (np.array(["BOS", "BOS", "BOS", "JFK", "BOS"]), np.array(["SFO", "SFO", "SFO", "LAX", "SFO"]),
+          np.array(["2025-08-01", "2025-08-01", "2025-08-01", "2025-08-01", "2025-08-02"]))
+CASH = np.array([300.0, 250.0, 410.0, 180.0, 0.0])
+VPM = np.array([np.nan, 1.8, 2.4, np.nan, np.nan])
+
+
+def tables(db_path):
+    conn = sqlite3.connect(db_path)
+    calendar = conn.execute("SELECT origin, destination, departure_date, min_cash, best_vpm, offer_count "
+                            "FROM price_calendar ORDER BY 1, 2, 3").fetchall()
+    history = conn.execute("SELECT * FROM fare_history ORDER BY 1, 2, 3").fetchall()
+    conn.close()
+    return calendar, history
+
+
+def test_batch_aggregates_match_row_by_row(tmp_path):
+    by_row, by_batch = str(tmp_path / "rows.db"), str(tmp_path / "batch.db")
+    calendar, history = PriceCalendar(by_row), FareHistory(by_row)
+    for origin, destination, date, cash, vpm in zip(*(column.tolist() for column in ROUTES), CASH.tolist(), VPM.tolist()):
+        vpm = None if vpm != vpm else vpm
+        calendar.observe(origin, destination, date, cash, vpm)
+        history.observe(origin, destination, date, cash, vpm)
+    calendar.save()
+    history.save(observed_at=OBSERVED_AT)
+
+    PriceCalendar(by_batch).observe_batch(*ROUTES, CASH, VPM)
+    FareHistory(by_batch).observe_batch(*ROUTES, CASH, VPM, observed_at=OBSERVED_AT)
+
+    assert tables(by_batch) == tables(by_row)
+    assert tables(by_batch)[0][0] == ("BOS", "SFO", "2025-08-01", 250.0, 2.4, 3)
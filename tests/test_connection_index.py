@@ -0,0 +1,101 @@
+import sqlite3
+
+from rewards_optimizer.connection_index import HubConnectionIndex
+
+
+def make_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE flights1 (id INTEGER PRIMARY KEY AUTOINCREMENT, reporting_price REAL);
+        CREATE TABLE flight_segments1 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, flight_id INTEGER, carrier_code TEXT, flight_number TEXT,
+            departure_iata TEXT, arrival_iata TEXT, departure_time TIMESTAMP, arrival_time TIMESTAMP,
+            segment_order INTEGER
+        );
+    ''')
+    conn.commit()
+    conn.close()
+    return HubConnectionIndex(path)
+
+
+def add_flight(conn, price, carrier, number, origin, destination, departure, arrival):
+    cursor = conn.execute("INSERT INTO flights1 (reporting_price) VALUES (?)", (price,))
+    conn.execute('''
+        INSERT INTO flight_segments1 (flight_id, carrier_code, flight_number, departure_iata, arrival_iata,
+                                      departure_time, arrival_time, segment_order)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+    ''', (cursor.lastrowid, carrier, number, origin, destination, departure, arrival))
+    conn.commit()
+
+
+def test_refresh_pairs_new_second_legs_with_indexed_first_legs(tmp_path):
+    index = make_db(str(tmp_path / "offers.db"))
+    conn = sqlite3.connect(index.db_path)
+    add_flight(conn, 200.0, "AA", "100", "BOS", "ORD", "2025-08-01T08:00:00", "2025-08-01T10:00:00")
+    index.refresh()
+
+    # The second leg lands in a later batch; only the b-side pass can find the pair
+    add_flight(conn, 150.0, "AA", "200", "ORD", "SFO", "2025-08-01T11:30:00", "2025-08-01T14:00:00")
+    add_flight(conn, 120.0, "AA", "300", "ORD", "SFO", "2025-08-01T10:15:00", "2025-08-01T13:00:00")
+    index.refresh()
+
+    legs = index.one_stop("BOS", "SFO", "2025-08-01")
+    assert [(first[1], second[1]) for first, second in legs] == [("100", "200")]
+    assert legs[0][0][6] == 200.0 and legs[0][1][6] == 150.0
+
+
+def test_refresh_range_scans_both_sides(tmp_path):
+    index = make_db(str(tmp_path / "offers.db"))
+    conn = sqlite3.connect(index.db_path)
+    add_flight(conn, 200.0, "AA", "100", "BOS", "ORD", "2025-08-01T08:00:00", "2025-08-01T10:00:00")
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    index.refresh(conn.cursor())
+    conn.set_trace_callback(None)
+
+    inserts = [sql for sql in statements if "INSERT INTO connection_index (" in sql]
+    assert len(inserts) == 2
+    plans = [[row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)] for sql in inserts]
+
+    # Each pass drives from the new id range and reaches the other leg through
+    # an (airport, time) range, never a scan of every segment at the hub
+    for plan, driver, other, index_name in ((plans[0], "a", "b", "idx_segments1_dep_airport"),
+                                            (plans[1], "b", "a", "idx_segments1_arr_airport")):
+        assert not any(step.startswith("SCAN") for step in plan), plan
+        assert f"SEARCH {driver} USING INTEGER PRIMARY KEY (rowid>? AND rowid<?)" in plan
+        assert any(step.startswith(f"SEARCH {other} USING INDEX {index_name}") and "_time>? AND" in step
+                   for step in plan), plan
+
+
+def test_reprice_follows_updated_quotes(tmp_path):
+    index = make_db(str(tmp_path / "offers.db"))
+    conn = sqlite3.connect(index.db_path)
+    add_flight(conn, 200.0, "AA", "100", "BOS", "ORD", "2025-08-01T08:00:00", "2025-08-01T10:00:00")
+    add_flight(conn, 150.0, "AA", "200", "ORD", "SFO", "2025-08-01T11:30:00", "2025-08-01T14:00:00")
+    index.refresh()
+
+    # A re-crawl raises the first leg's fare in place; the index must follow it up
+    conn.execute("UPDATE flights1 SET reporting_price = 260.0 WHERE id = 1")
+    conn.commit()
+    index.reprice([1])
+    first, second = index.one_stop("BOS", "SFO", "2025-08-01")[0]
+    assert first[6] == 260.0 and second[6] == 150.0
+
+    # With no cash quote left the last known price is kept rather than dropped
+    conn.execute("UPDATE flights1 SET reporting_price = 0.0 WHERE id = 1")
+    conn.commit()
+    index.reprice([1])
+    assert index.one_stop("BOS", "SFO", "2025-08-01")[0][0][6] == 260.0
+
+
+def test_index_is_built_for_existing_segments(tmp_path):
+    db_path = str(tmp_path / "offers.db")
+    make_db(db_path)
+    # Segments stored by a writer that never refreshed the index, like a bulk load
+    conn = sqlite3.connect(db_path)
+    add_flight(conn, 200.0, "AA", "100", "BOS", "ORD", "2025-08-01T08:00:00", "2025-08-01T10:00:00")
+    add_flight(conn, 150.0, "AA", "200", "ORD", "SFO", "2025-08-01T11:30:00", "2025-08-01T14:00:00")
+
+    index = HubConnectionIndex(db_path)
+    assert [(first[1], second[1]) for first, second in index.one_stop("BOS", "SFO", "2025-08-01")] == [("100", "200")]
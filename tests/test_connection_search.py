@@ -0,0 +1,44 @@
+from rewards_optimizer.award_charts import get_award_chart_engine
+from rewards_optimizer.connection_search import ConnectionSearch, drop_detours, make_connection
+from rewards_optimizer.fetch import FlightDatabase
+
+
+def hop(origin, destination, departure, arrival, price=100.0):
+    return make_connection("UA", "100", origin, destination, departure, arrival, price)
+
+
+def test_drop_detours_keeps_journeys_near_the_direct_distance():
+    direct = [hop("EWR", "ORD", "2025-08-01T08:00:00", "2025-08-01T10:00:00")]
+    via_cle = [hop("EWR", "CLE", "2025-08-01T08:00:00", "2025-08-01T09:30:00"),
+               hop("CLE", "ORD", "2025-08-01T10:30:00", "2025-08-01T11:30:00")]
+    # The fares of a trip to Maui would be compared with miles for EWR-ORD
+    via_ogg = [hop("EWR", "RDU", "2025-08-01T06:00:00", "2025-08-01T07:30:00"),
+               hop("RDU", "OGG", "2025-08-01T08:30:00", "2025-08-01T15:00:00"),
+               hop("OGG", "ORD", "2025-08-01T16:30:00", "2025-08-02T05:00:00")]
+    unknown = [hop("EWR", "ZZZ", "2025-08-01T08:00:00", "2025-08-01T09:30:00"),
+               hop("ZZZ", "ORD", "2025-08-01T10:30:00", "2025-08-01T11:30:00")]
+
+    kept = drop_detours([direct, via_cle, via_ogg, unknown], "EWR", "ORD")
+
+    assert kept == [direct, via_cle, unknown]
+
+
+def test_search_prices_awards_in_the_requested_cabin(tmp_path):
+    db_path = str(tmp_path / "offers.db")
+    segment = {"carrierCode": "UA", "number": "100",
+               "departure": {"iataCode": "EWR", "at": "2025-08-01T08:00:00"},
+               "arrival": {"iataCode": "ORD", "at": "2025-08-01T10:00:00"}}
+    offers = [{"id": str(i), "itineraries": [{"segments": [dict(segment, number=str(100 + i))]}],
+               "price": {"total": "400.00", "currency": "USD"}} for i in range(3)]
+    FlightDatabase(db_path).store_flight_offers(offers, {"search_type": "direct"})
+    searcher = ConnectionSearch(db_path)
+
+    economy, business = (
+        searcher.search("EWR", "ORD", "2025-08-01", max_miles=10 ** 6, max_fees=100, min_value=0, cabin=cabin)
+        for cabin in ("economy", "business")
+    )
+
+    engine = get_award_chart_engine()
+    assert {r.miles_used for r in economy} == {engine.price("UA", "EWR", "ORD")}
+    assert {r.miles_used for r in business} == {engine.price("UA", "EWR", "ORD", "business")}
+    assert business[0].value_per_mile < economy[0].value_per_mile
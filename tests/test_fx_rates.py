@@ -0,0 +1,71 @@
+import math
+import sqlite3
+
+from rewards_optimizer.fetch import FlightDatabase
+from rewards_optimizer.fx_rates import FXRates, ensure_reporting_prices
+from rewards_optimizer.portfolio_optimizer import load_trip_options
+
+
+def eur_offer(offer_id, price):
+    segment = {"carrierCode": "AF", "number": "334",
+               "departure": {"iataCode": "BOS", "at": "2025-08-01T18:00:00"},
+               "arrival": {"iataCode": "CDG", "at": "2025-08-02T07:00:00"}}
+    return {"id": offer_id, "itineraries": [{"segments": [segment]}],
+            "price": {"total": f"{price:.2f}", "currency": "EUR"}}
+
+
+def test_convert_batch_leaves_unknown_currencies_unconverted(tmp_path):
+    rates = FXRates(str(tmp_path / "offers.db"))
+
+    converted = rates.convert_batch([100.0, 100.0, 100.0], ["USD", "EUR", "XYZ"], "2025-08-01")
+
+    assert converted[0] == 100.0
+    assert converted[1] > 100.0
+    assert math.isnan(converted[2])
+    assert rates.convert(100.0, "XYZ", "2025-08-01") is None
+
+
+def test_ingest_stores_award_fees_in_reporting_currency(tmp_path):
+    db_path = str(tmp_path / "offers.db")
+    db = FlightDatabase(db_path)
+    # The first offer of a batch is stored as a simulated award
+    db.store_flight_offers([eur_offer("1", 500.0)], {"search_type": "direct"})
+
+    conn = sqlite3.connect(db_path)
+    fees, reporting_fees = conn.execute("SELECT fees, reporting_fees FROM flights1").fetchone()
+    conn.close()
+    usd = FXRates(db_path).convert(500.0, "EUR")
+
+    assert fees == 50.0
+    assert reporting_fees == round(usd * 0.1, 2)
+    [trip] = load_trip_options([("BOS", "CDG", "2025-08-01")], db_path)
+    assert trip['options'][0]['fees'] == reporting_fees
+
+
+def test_migration_converts_fees_and_rounds_prices(tmp_path):
+    db_path = str(tmp_path / "offers.db")
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    # Schema of databases written before reporting-currency columns existed
+    cursor.execute('''
+        CREATE TABLE flights1 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, search_id TEXT, offer_id TEXT, origin TEXT,
+            destination TEXT, departure_date DATE, total_price REAL, currency TEXT,
+            miles_used INTEGER, fees REAL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.executemany('''
+        INSERT INTO flights1 (total_price, currency, miles_used, fees, created_at) VALUES (?, ?, ?, ?, ?)
+    ''', [(333.33, "EUR", 0, 0.0, "2025-08-01"), (0.0, "EUR", 25000, 45.0, "2025-08-01"),
+          (0.0, "XYZ", 25000, 45.0, "2025-08-01")])
+    conn.commit()
+
+    ensure_reporting_prices(cursor, db_path)
+    rows = cursor.execute("SELECT reporting_price, reporting_fees FROM flights1 ORDER BY id").fetchall()
+    conn.close()
+    rates = FXRates(db_path)
+
+    assert rows[0][0] == round(rates.convert(333.33, "EUR", "2025-08-01"), 2)
+    assert rows[1][1] == round(rates.convert(45.0, "EUR", "2025-08-01"), 2)
+    assert rows[1][1] != 45.0
+    assert rows[2] == (None, None)
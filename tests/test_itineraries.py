@@ -0,0 +1,47 @@
+import sqlite3
+
+from rewards_optimizer.calculator import SessionIndex, ValueCalculator
+from rewards_optimizer.fetch import FlightDatabase
+
+
+def offer(offer_id, price, number="100"):
+    segment = {"carrierCode": "AA", "number": number,
+               "departure": {"iataCode": "BOS", "at": "2025-08-01T08:00:00"},
+               "arrival": {"iataCode": "SFO", "at": "2025-08-01T14:00:00"}}
+    return {"id": offer_id, "itineraries": [{"segments": [segment]}],
+            "price": {"total": f"{price:.2f}", "currency": "USD"}}
+
+
+def test_fare_families_in_one_crawl_are_one_sighting(tmp_path):
+    db_path = str(tmp_path / "offers.db")
+    db = FlightDatabase(db_path)
+    # A cash offer first, then three fare families of one itinerary
+    crawl = [offer("1", 150.0, "900"), offer("2", 420.0), offer("3", 310.0), offer("4", 990.0)]
+    db.store_flight_offers(crawl, {"search_type": "direct"})
+    db.store_flight_offers([offer("1", 150.0, "900"), offer("2", 330.0)], {"search_type": "direct"})
+
+    conn = sqlite3.connect(db_path)
+    flight = conn.execute("SELECT id, reporting_price, times_seen FROM flights1 WHERE offer_id = '2'").fetchone()
+    observations = conn.execute("SELECT reporting_price FROM offer_observations WHERE flight_id = ? ORDER BY id",
+                                (flight[0],)).fetchall()
+    segments = conn.execute("SELECT COUNT(*) FROM flight_segments1").fetchone()[0]
+    conn.close()
+
+    assert flight[1:] == (330.0, 2)
+    assert observations == [(310.0,), (330.0,)]
+    assert segments == 2
+
+
+def test_session_index_follows_requoted_itineraries(tmp_path):
+    db_path = str(tmp_path / "offers.db")
+    db = FlightDatabase(db_path)
+    db.store_flight_offers([offer("1", 150.0, "900"), offer("2", 420.0)], {"search_type": "direct"})
+    index = SessionIndex(ValueCalculator(db_path), "BOS", "SFO")
+
+    # A later crawl re-quotes the same itinerary in place rather than adding a row
+    db.store_flight_offers([offer("1", 150.0, "900"), offer("2", 120.0)], {"search_type": "direct"})
+    index.refresh()
+
+    assert len(index) == 2
+    assert {row[0]: row[3] for row in index.all_rows()} == {1: 0.0, 2: 120.0}
+    assert [row[0] for row in index.cheapest()] == [1, 2]
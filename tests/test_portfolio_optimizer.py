@@ -0,0 +1,44 @@
+from itertools import product
+
+from rewards_optimizer.portfolio_optimizer import optimize_portfolio
+
+
+def trip(name, cash_price, *options):
+    return {'trip': name, 'cash_price': cash_price,
+            'options': [{'flight_id': f"{name}-{i}", 'miles': miles, 'fees': fees}
+                        for i, (miles, fees) in enumerate(options)]}
+
+
+TRIPS = [
+    trip("BOS-SFO", 420.0, (25000, 5.6), (12500, 80.0)),
+    trip("SFO-HNL", 380.0, (22500, 5.6), (40000, 5.6)),
+    trip("BOS-ORD", 190.0, (10000, 5.6), (7500, 50.0)),
+]
+
+
+def brute_force(trips, budget):
+    best = 0.0
+    for picks in product(*[[None] + t['options'] for t in trips]):
+        miles = sum(p['miles'] for p in picks if p)
+        if miles <= budget:
+            best = max(best, sum(t['cash_price'] - p['fees'] for t, p in zip(trips, picks) if p))
+    return round(best, 2)
+
+
+def test_plan_matches_exhaustive_search():
+    for budget in (0, 7500, 20000, 35000, 47500, 60000, 100000):
+        result = optimize_portfolio(TRIPS, budget)
+
+        assert result['total_savings'] == brute_force(TRIPS, budget)
+        assert result['miles_spent'] <= budget
+        assert round(sum(p['savings'] for p in result['plan']), 2) == result['total_savings']
+
+
+def test_fee_cap_and_negative_budget():
+    capped = optimize_portfolio(TRIPS, 12500, max_fees=20)
+    assert [p['pay_with'] for p in capped['plan']] == ['cash', 'cash', 'miles']
+
+    result = optimize_portfolio(TRIPS, -5000)
+    assert result['total_savings'] == 0.0
+    assert result['miles_left'] == 0
+    assert all(p['pay_with'] == 'cash' for p in result['plan'])
@@ -0,0 +1,19 @@
+from rewards_optimizer.records import Recommendation
+from rewards_optimizer.round_trip import combine_round_trip, top_k_round_trips
+
+
+def leg(cash_price, miles_used, fees=10.0):
+    return Recommendation(origin="BOS", destination="SFO", type="direct", cash_price=cash_price, miles_used=miles_used,
+                          fees=fees, value_per_mile=0.0, category="FAIR", airline="AA", flight_number="AA100",
+                          departure_time="2025-08-01T08:00:00", arrival_time="2025-08-01T11:00:00", duration="3h 0m")
+
+
+def test_min_value_applies_before_top_k():
+    # The best-saving pairs are poor value per mile; the floor must not leave the top k short
+    outbound = [leg(900.0, 90000), leg(300.0, 10000), leg(280.0, 9000)]
+    inbound = [leg(850.0, 90000), leg(310.0, 10000), leg(290.0, 9000)]
+
+    pairs = top_k_round_trips(outbound, inbound, k=2, min_value=2.0)
+
+    assert len(pairs) == 2
+    assert all(combine_round_trip(out_leg, in_leg).value_per_mile >= 2.0 for out_leg, in_leg in pairs)
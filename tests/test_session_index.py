@@ -0,0 +1,28 @@
+from rewards_optimizer.calculator import SessionIndex, ValueCalculator
+from rewards_optimizer.fetch import FlightDatabase
+
+
+def offers(prices, first_number=100):
+    return [{"id": str(i + 1),
+             "itineraries": [{"segments": [{"carrierCode": "AA", "number": str(first_number + i),
+                                            "departure": {"iataCode": "BOS", "at": "2025-08-01T08:00:00"},
+                                            "arrival": {"iataCode": "SFO", "at": "2025-08-01T14:00:00"}}]}],
+             "price": {"total": f"{price:.2f}", "currency": "USD"}} for i, price in enumerate(prices)]
+
+
+def test_incremental_refresh_answers_like_sql(tmp_path):
+    db_path = str(tmp_path / "offers.db")
+    db = FlightDatabase(db_path)
+    calculator = ValueCalculator(db_path)
+    db.store_flight_offers(offers([420.0, 310.0, 515.0, 280.0, 390.0, 610.0]), {"search_type": "direct"})
+    index = SessionIndex(calculator)
+
+    # New itineraries and chart-priced samples arrive after the index was built
+    db.store_flight_offers(offers([350.0, 205.0, 470.0], first_number=200), {"search_type": "direct"})
+    calculator.add_sample_redemption_data("BOS", "SFO")
+    assert index.refresh() == 9
+
+    # Ties (every award row is priced 0) may come back in any order
+    assert [row[3] for row in index.cheapest(limit=20)] == [row[3] for row in calculator.get_cheapest_flights(limit=20)]
+    assert sorted(row[0] for row in index.cheapest(limit=20)) == sorted(row[0] for row in index.all_rows())
+    assert index.best_redemptions(limit=20, min_value=0.5) == calculator.get_best_redemptions(limit=20, min_value=0.5)
@@ -0,0 +1,43 @@
+import sqlite3
+
+from rewards_optimizer.sweet_spot_detector import SweetSpotDetector
+
+
+def stored_stats(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT route, metric, count FROM route_ewma_stats ORDER BY route, metric").fetchall()
+    conn.close()
+    return rows
+
+
+def test_save_merges_concurrent_writers(tmp_path):
+    db_path = str(tmp_path / "offers.db")
+    first = SweetSpotDetector(db_path)
+    second = SweetSpotDetector(db_path)
+
+    # Both processes loaded the same empty state; neither save may drop the other's offers
+    for price in (300.0, 320.0, 310.0):
+        first.observe("s1", "1", "BOS", "SFO", "2025-08-01", price)
+    for price in (290.0, 305.0):
+        second.observe("s2", "1", "BOS", "SFO", "2025-08-01", price)
+    first.save()
+    second.save()
+
+    assert stored_stats(db_path) == [("BOS-SFO", "cash_price", 5)]
+
+
+def test_save_writes_only_touched_routes(tmp_path):
+    db_path = str(tmp_path / "offers.db")
+    detector = SweetSpotDetector(db_path)
+    detector.observe("s1", "1", "BOS", "SFO", "2025-08-01", 300.0)
+    detector.observe("s1", "2", "JFK", "LAX", "2025-08-01", 250.0)
+    detector.save()
+
+    # Another process moves JFK-LAX on; this one's next batch only touches BOS-SFO
+    other = SweetSpotDetector(db_path)
+    other.observe("s2", "1", "JFK", "LAX", "2025-08-01", 260.0)
+    other.save()
+    detector.observe("s3", "1", "BOS", "SFO", "2025-08-01", 310.0)
+    detector.save()
+
+    assert stored_stats(db_path) == [("BOS-SFO", "cash_price", 2), ("JFK-LAX", "cash_price", 2)]
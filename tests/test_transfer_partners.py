@@ -0,0 +1,38 @@
+import pytest
+
+from rewards_optimizer.transfer_partners import TransferPartnerGraph
+
+
+def write_partners(path, rows):
+    path.write_text("from_currency,to_program,ratio,minimum_transfer\n"
+                    + "".join(f"{a},{b},{ratio},{minimum}\n" for a, b, ratio, minimum in rows))
+    return str(path)
+
+
+def test_multi_hop_transfer_uses_cheapest_chain(tmp_path):
+    csv_path = write_partners(tmp_path / "partners.csv", [
+        ("BANK", "HOTEL", 1.0, 1000),
+        ("HOTEL", "AA", 0.5, 3000),
+        ("BANK", "UA", 0.25, 1000),
+    ])
+    graph = TransferPartnerGraph(str(tmp_path / "offers.db"), csv_path)
+
+    [aa, ua, dl] = graph.price_redemptions(["AA", "UA", "DL"], [25000, 25000, 25000],
+                                           [400.0, 400.0, 400.0], [5.6, 5.6, 5.6], ["BANK"])
+
+    assert aa['path'] == ["BANK", "HOTEL", "AA"]
+    assert aa['source_points'] == 50000
+    assert aa['minimum_transfer'] == 3000
+    assert aa['source_value_per_mile'] == pytest.approx(round((400.0 - 5.6) * 100 / 50000, 3))
+    assert ua['source_points'] == 100000
+    assert dl['currency'] is None
+
+
+def test_small_redemptions_spend_the_transfer_minimum(tmp_path):
+    csv_path = write_partners(tmp_path / "partners.csv", [("BANK", "AA", 1.0, 1000), ("AA", "BA", 1.0, 5000)])
+    graph = TransferPartnerGraph(str(tmp_path / "offers.db"), csv_path)
+
+    [aa, ba] = graph.price_redemptions(["AA", "BA"], [600, 4500], [90.0, 150.0], [5.6, 5.6], ["BANK"])
+
+    assert aa['source_points'] == 1000
+    assert ba['source_points'] == 5000
@@ -0,0 +1,36 @@
+import sqlite3
+
+from rewards_optimizer.vpm_sketch import GLOBAL_ROUTE, VPMSketchStore
+
+
+def test_update_merges_concurrent_writers(tmp_path):
+    db_path = str(tmp_path / "offers.db")
+    first = VPMSketchStore(db_path)
+    second = VPMSketchStore(db_path)
+
+    first.update([("BOS", "SFO", 1.2), ("BOS", "SFO", 1.8)])
+    second.update([("BOS", "SFO", 2.4), ("JFK", "LAX", 1.0)])
+
+    reloaded = VPMSketchStore(db_path)
+    assert reloaded.sketches["BOS-SFO"].total == 3
+    assert reloaded.sketches["JFK-LAX"].total == 1
+    assert reloaded.sketches[GLOBAL_ROUTE].total == 4
+
+
+def test_empty_store_backfills_from_observations(tmp_path):
+    db_path = str(tmp_path / "offers.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+        CREATE TABLE flights1 (id INTEGER PRIMARY KEY, origin TEXT, destination TEXT);
+        CREATE TABLE offer_observations (id INTEGER PRIMARY KEY, flight_id INTEGER, value_per_mile REAL);
+        INSERT INTO flights1 VALUES (1, 'BOS', 'SFO'), (2, 'BOS', 'SFO');
+        INSERT INTO offer_observations (flight_id, value_per_mile) VALUES (1, 1.0), (1, 2.0), (2, 3.0), (2, NULL);
+    ''')
+    conn.commit()
+    conn.close()
+
+    store = VPMSketchStore(db_path)
+    assert store.sketches["BOS-SFO"].total == 3
+    assert store.percentile(2.5, "BOS", "SFO") == 66.67
+    # Once filled, opening the store again does not count the history twice
+    assert VPMSketchStore(db_path).sketches[GLOBAL_ROUTE].total == 3